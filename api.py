@@ -4,13 +4,17 @@ FastAPI web service for document extraction.
 Can be deployed to Cloudflare Workers with Python Workers.
 """
 
-from fastapi import FastAPI, File, UploadFile, HTTPException, Form
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi import FastAPI, File, UploadFile, HTTPException, Form, Request
+from fastapi.responses import JSONResponse, FileResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional, Dict, Any, List
-import tempfile
+import asyncio
+import hashlib
+import json
+import uuid
+import time
 import os
 from pathlib import Path
 import sys
@@ -20,9 +24,12 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from src.core.extraction_engine import ExtractionEngine
 from src.core.llm_provider import create_llm_client, LLMProvider
-from src.strategies.strategy_registry import get_all_strategies
+from src.core.scheduler import ExtractionScheduler, Priority, DeadlineExceeded
+from src.core.events import EventBus, EventMetrics, EventType, ExtractionEvent, event_context
+from src.strategies.strategy_registry import get_all_strategies, get_strategy_by_id, registry
 from src.core.validator import ResultValidator
 from src.utils.document_loader import DocumentLoader
+from src.utils.compactor import CompactionConfig
 
 app = FastAPI(
     title="AI Prompt Generator API",
@@ -33,6 +40,28 @@ app = FastAPI(
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
+# Shared scheduler so interactive requests overtake queued batch work
+scheduler = ExtractionScheduler(
+    max_concurrent=int(os.getenv("MAX_CONCURRENT_REQUESTS", "5"))
+)
+
+# Parsed text of uploads, so repeat and duplicate uploads skip PDF parsing/OCR
+if os.getenv("DOCUMENT_CACHE_DIR"):
+    DocumentLoader.configure_cache(
+        os.getenv("DOCUMENT_CACHE_DIR"),
+        max_bytes=int(os.getenv("DOCUMENT_CACHE_MAX_MB", "512")) * 1024 * 1024
+    )
+
+# Large PDFs are split across this many processes
+DocumentLoader.pdf_workers = int(os.getenv("PDF_WORKERS", "1"))
+# Column-aligned PDF tables become compact CSV (slower, layout-mode extraction)
+DocumentLoader.extract_tables = os.getenv("PDF_TABLES", "").lower() in ("1", "true", "yes")
+
+# Progress events from all requests; metrics and streaming endpoints subscribe
+event_bus = EventBus()
+metrics = EventMetrics()
+event_bus.subscribe(metrics)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -43,6 +72,105 @@ app.add_middleware(
 )
 
 
+# How often to check whether the HTTP client is still connected (seconds)
+DISCONNECT_POLL_INTERVAL = 1.0
+
+# Largest accepted upload; uploads are read in chunks and rejected past it
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_MB", "25")) * 1024 * 1024
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    """Reject oversized uploads from Content-Length before the body is parsed."""
+    content_length = request.headers.get("content-length")
+    # Allow some slack for the multipart form fields around the file
+    if content_length and content_length.isdigit() and int(content_length) > MAX_UPLOAD_BYTES + 64 * 1024:
+        return JSONResponse(
+            status_code=413,
+            content={"detail": f"Upload exceeds {MAX_UPLOAD_BYTES // (1024 * 1024)} MB limit"}
+        )
+    return await call_next(request)
+
+
+async def read_upload(file: UploadFile) -> bytes:
+    """Read an upload into memory in chunks, enforcing MAX_UPLOAD_BYTES (413)."""
+    content = bytearray()
+    while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+        content += chunk
+        if len(content) > MAX_UPLOAD_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Upload exceeds {MAX_UPLOAD_BYTES // (1024 * 1024)} MB limit"
+            )
+    return bytes(content)
+
+
+class ClientDisconnected(Exception):
+    """Raised when the HTTP client went away before extraction finished."""
+
+
+async def run_until_disconnected(request: Request, coro):
+    """
+    Run a coroutine, cancelling it if the HTTP client disconnects.
+
+    Cancellation propagates into the provider calls, so abandoned requests
+    stop consuming quota.
+    """
+    task = asyncio.ensure_future(coro)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                task.cancel()
+                raise ClientDisconnected("Client disconnected, extraction cancelled")
+    finally:
+        task.cancel()
+
+
+def build_report(engine: ExtractionEngine, document_name: str, results, ground_truth_dict):
+    """Validate results and build the comparison report returned to clients."""
+    # Validate results with ground truth
+    validation_metrics = ResultValidator.compare_results(results, ground_truth_dict)
+
+    # Create report
+    report = engine.create_comparison_report(
+        document_name=document_name,
+        results=results,
+        ground_truth=ground_truth_dict
+    )
+    report.validation_metrics = validation_metrics
+
+    # Find best strategy
+    best_strategy_id = ResultValidator.find_best_strategy(
+        results,
+        validation_metrics,
+        optimize_for="cost"
+    )
+
+    if best_strategy_id:
+        best = next(r for r in results if r.strategy_id == best_strategy_id)
+        report.best_strategy = best.strategy_name
+
+    return report
+
+
+def event_payload(event: ExtractionEvent) -> Dict[str, Any]:
+    """JSON-serializable form of an engine event."""
+    data = dict(event.data)
+    if "result" in data:
+        data["result"] = data["result"].model_dump(mode='json')
+    return {
+        "type": event.type.value,
+        "run_id": event.run_id,
+        "strategy_id": event.strategy_id,
+        "timestamp": event.timestamp,
+        **data
+    }
+
+
 class ExtractionRequest(BaseModel):
     provider: str = "gemini"  # "gemini" or "anthropic"
     max_concurrent: int = 5
@@ -70,7 +198,9 @@ async def api_info():
         "version": "1.0.0",
         "endpoints": {
             "/extract": "POST - Extract data from document",
+            "/extract/stream": "POST - Extract data, streaming progress events as NDJSON",
             "/strategies": "GET - List all strategies",
+            "/metrics": "GET - Extraction and scheduler metrics",
             "/health": "GET - Health check"
         }
     }
@@ -78,67 +208,91 @@ async def api_info():
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy"}
+    cache = DocumentLoader.cache
+    return {
+        "status": "healthy",
+        "scheduler": scheduler.snapshot(),
+        "document_cache": cache.snapshot() if cache else None
+    }
 
 
-@app.get("/strategies", response_model=List[StrategyInfo])
-async def list_strategies():
-    """List all available extraction strategies."""
-    try:
-        # Create dummy client for metadata
-        client = create_llm_client(LLMProvider.GEMINI)
-        strategies = get_all_strategies(client)
+@app.get("/metrics")
+async def get_metrics():
+    """Aggregated extraction events and scheduler state."""
+    return {**metrics.snapshot(), "scheduler": scheduler.snapshot()}
 
-        return [
-            StrategyInfo(
-                id=s.metadata.id,
-                name=s.metadata.name,
-                description=s.metadata.description,
-                category=s.metadata.category,
-                expected_cost=s.metadata.expected_cost_per_call
-            )
-            for s in strategies
-        ]
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
 
+def cached_json(request: Request, content: Any) -> Response:
+    """
+    JSON response with an ETag of its content.
+
+    Answers 304 Not Modified when the client already holds this content
+    (If-None-Match), so unchanged metadata is not sent again.
+    """
+    body = json.dumps(content, sort_keys=True).encode()
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=3600"}
+    known = [tag.strip().removeprefix("W/") for tag in request.headers.get("if-none-match", "").split(",")]
+    if etag in known or "*" in known:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
 
-@app.get("/strategy/{strategy_id}/prompt")
-async def get_strategy_prompt(strategy_id: str):
-    """Get the prompt template for a specific strategy."""
-    try:
-        from src.strategies.strategy_registry import get_strategy_by_id
 
-        # Create dummy client
-        client = create_llm_client(LLMProvider.GEMINI)
-        strategy = get_strategy_by_id(strategy_id, client)
+@app.get("/strategies", response_model=List[StrategyInfo])
+async def list_strategies(request: Request):
+    """List all available extraction strategies (metadata only; no client is created)."""
+    return cached_json(request, [
+        StrategyInfo(
+            id=meta.id,
+            name=meta.name,
+            description=meta.description,
+            category=meta.category,
+            expected_cost=meta.expected_cost_per_call
+        ).model_dump()
+        for meta in registry.all_metadata()
+    ])
 
-        # Get sample prompt
-        sample_text = "[Document content will be inserted here]"
-        prompt_template = strategy.build_prompt(sample_text, schema=None)
 
-        return {
-            "id": strategy.metadata.id,
-            "name": strategy.metadata.name,
-            "description": strategy.metadata.description,
-            "category": strategy.metadata.category,
-            "prompt_template": prompt_template
-        }
+@app.get("/strategy/{strategy_id}/prompt")
+async def get_strategy_prompt(strategy_id: str, request: Request):
+    """Get the prompt template for a specific strategy."""
+    try:
+        # Building a prompt needs no client
+        strategy = get_strategy_by_id(strategy_id)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+
+    # Get sample prompt
+    sample_text = "[Document content will be inserted here]"
+    prompt_template = strategy.build_prompt(sample_text, schema=None)
+
+    return cached_json(request, {
+        "id": strategy.metadata.id,
+        "name": strategy.metadata.name,
+        "description": strategy.metadata.description,
+        "category": strategy.metadata.category,
+        "prompt_template": prompt_template
+    })
 
 
 @app.post("/extract")
 async def extract_document(
+    request: Request,
     file: UploadFile = File(...),
     provider: str = Form("openrouter"),
     model: str = Form("google/gemini-2.5-flash"),
     max_concurrent: int = Form(5),
     api_key: Optional[str] = Form(None),
     schema: Optional[str] = Form(None),
-    ground_truth: Optional[str] = Form(None)
+    ground_truth: Optional[str] = Form(None),
+    deadline: Optional[float] = Form(None),
+    strategy_timeout: Optional[float] = Form(None),
+    chunk_size: Optional[int] = Form(None),
+    prune_to_schema: bool = Form(False),
+    compact: bool = Form(False),
+    stop_when_agreed: Optional[int] = Form(None),
+    stream_fields: bool = Form(False),
+    repair: bool = Form(False)
 ):
     """
     Extract data from document using all strategies.
@@ -151,11 +305,21 @@ async def extract_document(
         api_key: Optional API key (otherwise from env)
         schema: JSON string of fields to extract (e.g., '{"company_name": "string"}')
         ground_truth: JSON string of expected values (e.g., '{"company_name": "Acme Corp"}')
+        deadline: Optional seconds within which strategies must finish
+        strategy_timeout: Optional per-strategy timeout in seconds
+        chunk_size: Optional chunk size in characters for long documents
+        prune_to_schema: Send strategies only the sections relevant to the schema fields
+        compact: Compact document text to save input tokens
+        stop_when_agreed: Optional number of agreeing strategies after which
+            the remaining ones are cancelled
+        stream_fields: Stream model responses and, with a schema, stop
+            generating once every schema field is complete
+        repair: Follow a response that fails to parse or misses schema
+            fields with one targeted repair call instead of a full re-run
 
     Returns:
         Extraction results from all strategies
     """
-    temp_file = None
     try:
         # Validate provider
         if provider not in ["openrouter"]:
@@ -164,15 +328,10 @@ async def extract_document(
                 detail=f"Invalid provider: {provider}. Currently only 'openrouter' is supported"
             )
 
-        # Save uploaded file temporarily
-        suffix = Path(file.filename).suffix
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp:
-            content = await file.read()
-            temp.write(content)
-            temp_file = temp.name
+        # Documents are parsed from memory; nothing is written to disk
+        content = await read_upload(file)
 
         # Parse schema and ground truth
-        import json
         schema_dict = None
         ground_truth_dict = None
 
@@ -200,52 +359,142 @@ async def extract_document(
             strategies=strategies,
             llm_client=client,
             max_concurrent=max_concurrent,
-            request_delay=0.5
+            request_delay=0.5,
+            scheduler=scheduler,
+            events=event_bus
         )
 
         # Run extraction with schema
-        results = await engine.extract_with_all_strategies(temp_file, schema=schema_dict)
-
-        # Validate results with ground truth
-        validation_metrics = ResultValidator.compare_results(results, ground_truth_dict)
-
-        # Create report
-        report = engine.create_comparison_report(
-            document_name=file.filename,
-            results=results,
-            ground_truth=ground_truth_dict
-        )
-        report.validation_metrics = validation_metrics
-
-        # Find best strategy
-        best_strategy_id = ResultValidator.find_best_strategy(
-            results,
-            validation_metrics,
-            optimize_for="cost"
+        results = await run_until_disconnected(
+            request,
+            engine.extract_with_all_strategies(
+                content,
+                schema=schema_dict,
+                priority=Priority.BATCH,
+                deadline=deadline,
+                strategy_timeout=strategy_timeout,
+                chunk_size=chunk_size,
+                prune_to_schema=prune_to_schema,
+                compaction=CompactionConfig() if compact else None,
+                stop_when_agreed=stop_when_agreed,
+                document_name=file.filename,
+                stream_fields=stream_fields,
+                repair=repair
+            )
         )
 
-        if best_strategy_id:
-            best = next(r for r in results if r.strategy_id == best_strategy_id)
-            report.best_strategy = best.strategy_name
-
+        report = build_report(engine, file.filename, results, ground_truth_dict)
         return JSONResponse(content=report.model_dump(mode='json'))
 
+    except ClientDisconnected as e:
+        # 499: client closed request (nobody is listening for the body)
+        raise HTTPException(status_code=499, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-    finally:
-        # Cleanup temp file
-        if temp_file and os.path.exists(temp_file):
-            os.unlink(temp_file)
+
+@app.post("/extract/stream")
+async def extract_document_stream(
+    file: UploadFile = File(...),
+    provider: str = Form("openrouter"),
+    model: str = Form("google/gemini-2.5-flash"),
+    max_concurrent: int = Form(5),
+    api_key: Optional[str] = Form(None),
+    schema: Optional[str] = Form(None),
+    ground_truth: Optional[str] = Form(None),
+    deadline: Optional[float] = Form(None),
+    strategy_timeout: Optional[float] = Form(None),
+    chunk_size: Optional[int] = Form(None),
+    prune_to_schema: bool = Form(False),
+    compact: bool = Form(False),
+    stop_when_agreed: Optional[int] = Form(None),
+    stream_fields: bool = Form(False),
+    repair: bool = Form(False)
+):
+    """
+    Extract data using all strategies, streaming progress as NDJSON.
+
+    Each line is one event (run_started, started, retried, completed, failed,
+    run_completed); the final line has type "report" and carries the same
+    report /extract returns. Closing the connection cancels the extraction.
+    With stream_fields, "field" events carry each top-level field of a
+    strategy's answer as soon as it is complete.
+    With repair, "repaired" events report targeted repair calls.
+    """
+    try:
+        schema_dict = json.loads(schema) if schema else None
+        ground_truth_dict = json.loads(ground_truth) if ground_truth else None
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Invalid schema or ground_truth JSON format")
+
+    try:
+        client = create_llm_client(LLMProvider(provider), api_key=api_key, model=model)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    content = await read_upload(file)
+
+    engine = ExtractionEngine(
+        strategies=get_all_strategies(client),
+        llm_client=client,
+        max_concurrent=max_concurrent,
+        request_delay=0.5,
+        scheduler=scheduler,
+        events=event_bus
+    )
+    run_id = uuid.uuid4().hex[:12]
+    queue: asyncio.Queue = asyncio.Queue()
+
+    def forward(event: ExtractionEvent) -> None:
+        if event.run_id == run_id:
+            queue.put_nowait(event)
+
+    async def stream():
+        unsubscribe = event_bus.subscribe(forward)
+        task = asyncio.ensure_future(engine.extract_with_all_strategies(
+            content,
+            schema=schema_dict,
+            priority=Priority.BATCH,
+            deadline=deadline,
+            strategy_timeout=strategy_timeout,
+            run_id=run_id,
+            chunk_size=chunk_size,
+            prune_to_schema=prune_to_schema,
+            compaction=CompactionConfig() if compact else None,
+            stop_when_agreed=stop_when_agreed,
+            document_name=file.filename,
+            stream_fields=stream_fields,
+            repair=repair
+        ))
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+        try:
+            while (event := await queue.get()) is not None:
+                yield json.dumps(event_payload(event)) + "\n"
+
+            if task.exception():
+                yield json.dumps({"type": "error", "run_id": run_id, "error": str(task.exception())}) + "\n"
+            else:
+                report = build_report(engine, file.filename, task.result(), ground_truth_dict)
+                yield json.dumps({"type": "report", "run_id": run_id, "report": report.model_dump(mode='json')}) + "\n"
+        finally:
+            # Runs on client disconnect too, cancelling in-flight provider calls
+            task.cancel()
+            unsubscribe()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
 
 
 @app.post("/extract-single")
 async def extract_single_strategy(
+    request: Request,
     file: UploadFile = File(...),
     strategy_id: str = Form("strategy_01"),
     provider: str = Form("openrouter"),
     model: Optional[str] = Form(None),
-    api_key: Optional[str] = Form(None)
+    api_key: Optional[str] = Form(None),
+    deadline: Optional[float] = Form(None)
 ):
     """
     Extract data using a single strategy.
@@ -256,42 +505,63 @@ async def extract_single_strategy(
         provider: LLM provider
         model: Optional model name
         api_key: Optional API key
+        deadline: Optional seconds within which the extraction must start and finish
 
     Returns:
         Extraction result
     """
-    temp_file = None
+    # The deadline covers the whole request, document loading included
+    run_deadline = time.monotonic() + deadline if deadline is not None else None
     try:
-        # Save uploaded file
-        suffix = Path(file.filename).suffix
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp:
-            content = await file.read()
-            temp.write(content)
-            temp_file = temp.name
-
-        # Load document
-        text, doc_type = DocumentLoader.load(temp_file)
+        # Load document from memory
+        content = await read_upload(file)
+        text, doc_type = DocumentLoader.load(content, filename=file.filename)
         text = DocumentLoader.preprocess_text(text)
 
         # Create client and strategy
         llm_provider = LLMProvider(provider)
         client = create_llm_client(llm_provider, api_key=api_key, model=model)
 
-        from src.strategies.strategy_registry import get_strategy_by_id
         strategy = get_strategy_by_id(strategy_id, client)
 
-        # Run extraction
-        result = await strategy.extract(text)
+        # Run extraction ahead of queued batch work
+        run_id = uuid.uuid4().hex[:12]
+        event_bus.emit(EventType.STARTED, run_id, strategy.metadata.id,
+                       strategy_name=strategy.metadata.name)
+        with event_context(event_bus, run_id, strategy.metadata.id):
+            result = await run_until_disconnected(
+                request,
+                scheduler.run(
+                    # Whatever is left of the deadline once a slot is free
+                    lambda: strategy.extract(
+                        text,
+                        timeout=max(0.0, run_deadline - time.monotonic()) if run_deadline else None
+                    ),
+                    priority=Priority.INTERACTIVE,
+                    deadline=run_deadline
+                )
+            )
+        event_bus.emit(
+            EventType.FAILED if result.error else EventType.COMPLETED,
+            run_id,
+            result.strategy_id,
+            execution_time=result.execution_time,
+            cost=result.cost,
+            error=result.error,
+            result=result
+        )
 
         return JSONResponse(content=result.model_dump(mode='json'))
 
+    except DeadlineExceeded as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ClientDisconnected as e:
+        raise HTTPException(status_code=499, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-    finally:
-        if temp_file and os.path.exists(temp_file):
-            os.unlink(temp_file)
-
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,78 @@
+"""
+Measure cold import time of the CLI and API entry points.
+
+Usage:
+    python benchmarks/import_time.py              # report, fail over budget
+    python benchmarks/import_time.py --budget-ms 400
+
+Each module is imported in a fresh interpreter with -X importtime. The run
+fails if an entry point exceeds the budget or imports one of the heavy
+backends (PDF/OCR/DOCX parsers, provider SDKs) that must load lazily.
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).parent.parent
+
+ENTRY_POINTS = ["main", "api"]
+
+# Cold import budget per entry point; generous so slow CI machines pass, but
+# an eagerly imported SDK or parser (hundreds of ms each) does not
+BUDGET_MS = 1000.0
+
+# Imported on first use only; importing an entry point must not pull these in
+LAZY_MODULES = [
+    "pypdf", "PIL", "pytesseract", "docx", "pypdfium2",
+    "google.generativeai", "anthropic", "numpy",
+]
+
+
+def import_times(module: str) -> List[Tuple[str, int, int]]:
+    """(module, self_us, cumulative_us) for every module imported by `import module`."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def check(module: str) -> Dict[str, object]:
+    """Total import time in ms and the lazy modules that were imported eagerly."""
+    rows = import_times(module)
+    imported = {name for name, _, _ in rows}
+    total_ms = next(cumulative for name, _, cumulative in rows if name == module) / 1000
+    eager = [name for name in LAZY_MODULES if name in imported]
+    slowest = sorted(rows, key=lambda row: row[1], reverse=True)[:8]
+    return {"total_ms": total_ms, "eager": eager, "slowest": slowest}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    args = parser.parse_args()
+
+    failed = False
+    for module in ENTRY_POINTS:
+        result = check(module)
+        print(f"{module}: {result['total_ms']:.0f} ms (budget {args.budget_ms:.0f} ms)")
+        for name, self_us, _ in result["slowest"]:
+            print(f"    {self_us / 1000:7.1f} ms  {name}")
+        if result["eager"]:
+            print(f"  imported eagerly: {', '.join(result['eager'])}")
+            failed = True
+        if result["total_ms"] > args.budget_ms:
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark LLM response parsing: the old find/rfind + json.loads parser
+versus json_parser.extract_json.
+
+Usage:
+    python benchmarks/json_parser.py [--responses 2000]
+
+Builds responses the way models write them (bare JSON, fenced, wrapped in
+prose, with syntax defects, truncated) and reports throughput per parser
+and how many responses each recovers as an object.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core import json_parser
+
+KINDS = ["bare", "fenced", "prose", "defects", "truncated"]
+
+
+def make_response(kind: str, rng: random.Random) -> str:
+    items = [
+        {"description": f"Service item {i}", "quantity": rng.randint(1, 9), "amount": round(rng.uniform(1, 900), 2)}
+        for i in range(rng.randint(1, 30))
+    ]
+    data = {
+        "invoice_number": f"INV-{rng.randint(1, 99999)}",
+        "vendor": {"name": "Acme Corporation", "address": "123 Business St, Suite {100}"},
+        "line_items": items,
+        "total": round(sum(item["amount"] for item in items), 2),
+        "notes": "Payment due in 30 days.",
+    }
+    body = json.dumps(data, indent=2)
+    if kind == "fenced":
+        return f"```json\n{body}\n```"
+    if kind == "prose":
+        return f"Here is the extracted data:\n\n{body}\n\nLet me know if you need anything else (e.g. {{tax}})."
+    if kind == "defects":
+        return body.replace('"total"', "// computed\n  total").replace("]", ",]").replace("true", "True")
+    if kind == "truncated":
+        return body[:rng.randrange(len(body) // 2, len(body))]
+    return body
+
+
+def old_parse(response_text: str):
+    try:
+        if "```json" in response_text:
+            start = response_text.find("```json") + 7
+            end = response_text.find("```", start)
+            json_str = response_text[start:end].strip()
+        elif "{" in response_text and "}" in response_text:
+            start = response_text.find("{")
+            end = response_text.rfind("}") + 1
+            json_str = response_text[start:end]
+        else:
+            json_str = response_text
+        return json.loads(json_str)
+    except json.JSONDecodeError:
+        return {"raw_response": response_text}
+
+
+def run(name, parse, responses, kinds):
+    start = time.perf_counter()
+    parsed = [parse(text) for text in responses]
+    elapsed = time.perf_counter() - start
+    megabytes = sum(len(text) for text in responses) / 1e6
+    recovered = {kind: 0 for kind in KINDS}
+    for kind, value in zip(kinds, parsed):
+        recovered[kind] += isinstance(value, dict) and "raw_response" not in value
+    per_kind = "".join(f"{recovered[kind] / kinds.count(kind):>11.0%}" for kind in KINDS)
+    print(f"{name:<26}{megabytes / elapsed:>8.1f} MB/s{per_kind}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--responses", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    kinds = [KINDS[i % len(KINDS)] for i in range(args.responses)]
+    responses = [make_response(kind, rng) for kind in kinds]
+    print(f"{args.responses} responses, {sum(map(len, responses)) / 1e6:.1f} MB")
+    print(f"{'parser':<26}{'throughput':>13}" + "".join(f"{kind:>11}" for kind in KINDS))
+
+    run("find/rfind + json.loads", old_parse, responses, kinds)
+    orjson = json_parser.ORJSON_AVAILABLE
+    json_parser.ORJSON_AVAILABLE = False
+    run("extract_json (json)", json_parser.extract_json, responses, kinds)
+    json_parser.ORJSON_AVAILABLE = orjson
+    if orjson:
+        run("extract_json (orjson)", json_parser.extract_json, responses, kinds)
+    else:
+        print("orjson not installed (pip install orjson)")
+
+
+if __name__ == "__main__":
+    main()
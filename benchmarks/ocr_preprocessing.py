@@ -0,0 +1,96 @@
+"""
+Benchmark OCR time and accuracy per preprocessing setting.
+
+Usage:
+    python benchmarks/ocr_preprocessing.py                 # synthetic 600 dpi, skewed scan
+    python benchmarks/ocr_preprocessing.py scan.png --truth scan.txt
+
+Requires the Tesseract binary. Accuracy is the character similarity of the
+OCR output to the known text.
+"""
+import argparse
+import sys
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytesseract
+from PIL import Image, ImageDraw, ImageFont
+from src.utils.ocr_preprocessing import OCRPreprocessConfig, preprocess_image
+
+SAMPLE_LINES = [
+    "INVOICE INV-2024-001",
+    "Date: March 15, 2024   Due: April 14, 2024",
+    "Bill To: Acme Corporation, 123 Business Street",
+    "Professional Services   40 hrs   $150.00   $6,000.00",
+    "Software License         1       $2,500.00 $2,500.00",
+    "Subtotal: $8,500.00   Tax (8%): $680.00   Total: $9,180.00",
+    "Payment Terms: Net 30",
+]
+
+SETTINGS = {
+    "raw": None,
+    "downscale": OCRPreprocessConfig(grayscale=False, binarize=False, deskew=False),
+    "downscale+gray": OCRPreprocessConfig(binarize=False, deskew=False),
+    "downscale+gray+binarize": OCRPreprocessConfig(deskew=False),
+    "full (with deskew)": OCRPreprocessConfig(),
+}
+
+
+def synthetic_scan(dpi: int = 600, skew: float = 2.0) -> Image.Image:
+    """A letter-size page of SAMPLE_LINES rendered at dpi and rotated by skew degrees."""
+    scale = dpi / 100
+    page = Image.new("RGB", (int(850 * scale), int(1100 * scale)), (235, 232, 225))
+    draw = ImageDraw.Draw(page)
+    font = ImageFont.load_default(size=int(16 * scale))
+    for i, line in enumerate(SAMPLE_LINES):
+        draw.text((int(80 * scale), int((100 + 40 * i) * scale)), line, fill=(40, 40, 40), font=font)
+    page = page.rotate(skew, resample=Image.BICUBIC, fillcolor=(235, 232, 225))
+    page.info["dpi"] = (dpi, dpi)
+    return page
+
+
+def run(image: Image.Image, truth: str, repeats: int) -> None:
+    print(f"Image: {image.size[0]}x{image.size[1]} px, dpi={image.info.get('dpi')}")
+    print(f"{'setting':<26}{'preprocess':>12}{'ocr':>10}{'total':>10}{'accuracy':>10}")
+    for name, config in SETTINGS.items():
+        preprocess_time = ocr_time = 0.0
+        text = ""
+        for _ in range(repeats):
+            start = time.perf_counter()
+            prepared = preprocess_image(image, config) if config else image
+            middle = time.perf_counter()
+            text = pytesseract.image_to_string(prepared)
+            end = time.perf_counter()
+            preprocess_time += middle - start
+            ocr_time += end - middle
+        accuracy = SequenceMatcher(None, " ".join(truth.split()), " ".join(text.split())).ratio() if truth else float("nan")
+        print(f"{name:<26}{preprocess_time / repeats:>11.2f}s{ocr_time / repeats:>9.2f}s"
+              f"{(preprocess_time + ocr_time) / repeats:>9.2f}s{accuracy:>10.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("image", nargs="?", help="Image to OCR (default: synthetic scan)")
+    parser.add_argument("--truth", help="Text file with the image's expected text")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    try:
+        pytesseract.get_tesseract_version()
+    except pytesseract.TesseractNotFoundError:
+        sys.exit("Tesseract is not installed; see https://tesseract-ocr.github.io/tessdoc/Installation.html")
+
+    if args.image:
+        image = Image.open(args.image)
+        truth = Path(args.truth).read_text() if args.truth else ""
+    else:
+        image = synthetic_scan()
+        truth = "\n".join(SAMPLE_LINES)
+    run(image, truth, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark field similarity scoring: one difflib matcher per value versus batch_ratio.
+
+Usage:
+    python benchmarks/similarity.py [--fields 2000] [--strategies 20]
+
+Scores --strategies noisy variants of --fields truth values, the way
+ResultValidator.compare_results does for one corpus, and reports time per
+method plus how often its score equals difflib's.
+"""
+import argparse
+import random
+import string
+import sys
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core import similarity
+
+
+def noisy(value: str, rng: random.Random) -> str:
+    """A strategy's take on a value: usually close, sometimes edited or wrong."""
+    roll = rng.random()
+    if roll < 0.4:
+        return value
+    if roll < 0.9:
+        chars = list(value)
+        for _ in range(rng.randint(1, max(1, len(chars) // 6))):
+            position = rng.randrange(len(chars) + 1)
+            action = rng.choice("ids")
+            if action == "i":
+                chars.insert(position, rng.choice(string.ascii_letters))
+            elif chars and position < len(chars):
+                if action == "d":
+                    del chars[position]
+                else:
+                    chars[position] = rng.choice(string.ascii_letters)
+        return "".join(chars)
+    return "".join(rng.choice(string.ascii_letters + " ") for _ in range(len(value)))
+
+
+def make_workload(fields: int, strategies: int, seed: int = 0):
+    rng = random.Random(seed)
+    words = ["acme", "corporation", "invoice", "street", "services", "license", "payment", "net", "due", "total"]
+    workload = []
+    for _ in range(fields):
+        truth = " ".join(rng.choice(words) for _ in range(rng.randint(1, 5))) + f" {rng.randint(1, 9999)}"
+        workload.append((truth, [noisy(truth, rng) for _ in range(strategies)]))
+    return workload
+
+
+def run(name, score_field, workload, reference=None):
+    start = time.perf_counter()
+    scores = [score_field(truth.lower(), [value.lower() for value in values]) for truth, values in workload]
+    elapsed = time.perf_counter() - start
+    agreement = ""
+    if reference is not None:
+        pairs = [(a, b) for ours, ref in zip(scores, reference) for a, b in zip(ours, ref)]
+        agreement = f"{sum(a == b for a, b in pairs) / len(pairs):.2%}"
+    print(f"{name:<28}{elapsed:>9.3f}s{agreement:>12}")
+    return scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fields", type=int, default=2000)
+    parser.add_argument("--strategies", type=int, default=20)
+    args = parser.parse_args()
+
+    workload = make_workload(args.fields, args.strategies)
+    print(f"{args.fields} fields x {args.strategies} strategies")
+    print(f"{'method':<28}{'time':>10}{'identical':>12}")
+
+    reference = run("difflib.SequenceMatcher",
+                    lambda truth, values: [SequenceMatcher(None, truth, v).ratio() for v in values], workload)
+
+    run("similarity.batch_ratio", similarity.batch_ratio, workload, reference)
+
+if __name__ == "__main__":
+    main()
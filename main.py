@@ -16,10 +16,52 @@ from dotenv import load_dotenv
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.core.extraction_engine import ExtractionEngine
-from src.strategies.strategy_registry import get_all_strategies, list_strategies
+from src.strategies.strategy_registry import get_all_strategies, list_strategies, registry
 from src.core.validator import ResultValidator
 from src.utils.reporter import ResultReporter
 from src.core.llm_provider import create_llm_client, LLMProvider
+from src.utils.compactor import CompactionConfig
+
+
+def report_and_save(engine, document_name, results, ground_truth, output_dir):
+    """Validate results, print the comparison report and save output files."""
+    # Validate results
+    print("\n📊 Validating results...")
+    validation_metrics = ResultValidator.compare_results(results, ground_truth)
+
+    # Find best strategy
+    best_strategy_id = ResultValidator.find_best_strategy(
+        results,
+        validation_metrics,
+        optimize_for="accuracy" if ground_truth else "cost"
+    )
+
+    # Create report
+    report = engine.create_comparison_report(
+        document_name=document_name,
+        results=results,
+        ground_truth=ground_truth
+    )
+    report.validation_metrics = validation_metrics
+    if best_strategy_id:
+        best = next(r for r in results if r.strategy_id == best_strategy_id)
+        report.best_strategy = best.strategy_name
+
+    # Display results
+    ResultReporter.print_summary(report)
+
+    # Save results
+    output_dir = Path(output_dir)
+    print(f"\n💾 Saving results to {output_dir}...")
+
+    json_path = ResultReporter.save_json_report(report, output_dir)
+    print(f"   ✓ JSON report: {json_path}")
+
+    csv_path = ResultReporter.save_csv_summary(report, output_dir)
+    print(f"   ✓ CSV summary: {csv_path}")
+
+    data_files = ResultReporter.save_extracted_data(results, output_dir / "extracted_data")
+    print(f"   ✓ Extracted data: {len(data_files)} files")
 
 
 def main():
@@ -53,9 +95,94 @@ def main():
         default=0.5,
         help="Delay between requests in seconds (default: 0.5)"
     )
+    parser.add_argument(
+        "--strategy-timeout",
+        type=float,
+        help="Per-strategy timeout in seconds"
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        help="Whole-run deadline in seconds; unfinished strategies are reported as timed out"
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        help="Split documents longer than this many characters into chunks extracted concurrently"
+    )
+    parser.add_argument(
+        "--corpus",
+        help="Directory of documents to process instead of a single document"
+    )
+    parser.add_argument(
+        "--pack-budget",
+        type=int,
+        help="With --corpus, pack small documents into one request per strategy up to this many tokens"
+    )
+    parser.add_argument(
+        "--settle-confidence",
+        type=float,
+        help="With --corpus and --ground-truth, evaluate documents one at a time and stop "
+             "evaluating each strategy once its comparison is settled at this confidence (e.g. 0.95)"
+    )
+    parser.add_argument(
+        "--tie-margin",
+        type=float,
+        default=0.0,
+        help="With --settle-confidence, accuracy difference below which two strategies count as tied"
+    )
+    parser.add_argument(
+        "--schema",
+        help="Path to JSON file describing the fields to extract"
+    )
+    parser.add_argument(
+        "--prune",
+        action="store_true",
+        help="With --schema, send strategies only the document sections relevant to its fields"
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Compact document text (repeated headers/footers, table whitespace, boilerplate) to save tokens"
+    )
+    parser.add_argument(
+        "--stop-when-agreed",
+        type=int,
+        help="Cancel the remaining strategies once this many agree on every field"
+    )
+    parser.add_argument(
+        "--stream-fields",
+        action="store_true",
+        help="Stream model responses; with --schema, stop generating once every schema field is complete"
+    )
+    parser.add_argument(
+        "--repair",
+        action="store_true",
+        help="Fix unparsable responses or missing schema fields with a small targeted call"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Cache parsed document text in this directory so repeat runs skip PDF parsing/OCR"
+    )
+    parser.add_argument(
+        "--pdf-workers",
+        type=int,
+        default=1,
+        help="Processes for extracting text from large PDFs (default: 1)"
+    )
+    parser.add_argument(
+        "--pdf-tables",
+        action="store_true",
+        help="Rewrite column-aligned PDF tables as compact CSV (slower: pages are extracted in layout mode)"
+    )
+    parser.add_argument(
+        "--no-ocr",
+        action="store_true",
+        help="Do not OCR PDF pages that have no text layer"
+    )
     parser.add_argument(
         "--ground-truth",
-        help="Path to ground truth JSON file for validation"
+        help="Path to ground truth JSON file for validation (with --corpus, may map document file names to their ground truth)"
     )
     parser.add_argument(
         "--provider",
@@ -71,6 +198,31 @@ def main():
         "--api-key",
         help="API key (otherwise from .env file)"
     )
+    parser.add_argument(
+        "--queue",
+        help="SQLite work queue file. With a document: enqueue its strategy tasks and exit"
+    )
+    parser.add_argument(
+        "--worker",
+        action="store_true",
+        help="Run queue workers until the queue is drained (requires --queue)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes for --worker (default: 1)"
+    )
+    parser.add_argument(
+        "--collect",
+        action="store_true",
+        help="Build reports for all documents in the queue (requires --queue)"
+    )
+    parser.add_argument(
+        "--no-wal",
+        action="store_true",
+        help="Use rollback journaling for the queue file; needed when it is on a network filesystem shared between hosts"
+    )
 
     args = parser.parse_args()
 
@@ -79,14 +231,73 @@ def main():
         list_strategies()
         return
 
+    if (args.worker or args.collect) and not args.queue:
+        parser.error("--worker and --collect require --queue")
+
+    # Collect mode: report on results written back by queue workers
+    if args.collect:
+        from src.core.work_queue import WorkQueue
+        queue = WorkQueue(args.queue, wal=not args.no_wal)
+        engine = ExtractionEngine(strategies=[])
+        for document in queue.documents():
+            results = queue.results(document["id"])
+            output_dir = Path(args.output_dir) / f"document_{document['id']}"
+            report_and_save(engine, document["name"], results, None, output_dir)
+        print(f"\nQueue status: {queue.counts()}")
+        queue.close()
+        return
+
     # Validate document path
-    if not args.document:
+    if not args.document and not args.worker and not args.corpus:
         parser.error("document path is required (or use --list-strategies)")
 
-    document_path = Path(args.document)
-    if not document_path.exists():
-        print(f"Error: Document not found: {document_path}")
-        sys.exit(1)
+    if args.document:
+        document_path = Path(args.document)
+        if not document_path.exists():
+            print(f"Error: Document not found: {document_path}")
+            sys.exit(1)
+
+    from src.utils.document_loader import DocumentLoader
+    DocumentLoader.pdf_workers = args.pdf_workers
+    DocumentLoader.ocr_pdfs = not args.no_ocr
+    DocumentLoader.extract_tables = args.pdf_tables
+    if args.cache_dir:
+        DocumentLoader.configure_cache(args.cache_dir)
+
+    if args.corpus:
+        corpus_paths = []
+        for path in sorted(Path(args.corpus).iterdir()):
+            try:
+                DocumentLoader.detect_document_type(path)
+                corpus_paths.append(path)
+            except ValueError:
+                continue
+        if not corpus_paths:
+            print(f"Error: No supported documents in {args.corpus}")
+            sys.exit(1)
+
+    # Load schema if provided
+    schema = None
+    if args.schema:
+        import json
+        with open(args.schema, 'r') as f:
+            schema = json.load(f)
+
+    # Enqueue mode: producer stores the loaded document and one task per strategy
+    if args.queue and not args.worker:
+        from src.core.work_queue import WorkQueue
+        from src.utils.document_loader import DocumentLoader
+        strategy_ids = registry.ids()
+        queue = WorkQueue(args.queue, wal=not args.no_wal)
+        for path in (corpus_paths if args.corpus else [document_path]):
+            text, _ = DocumentLoader.load(path)
+            document_id = queue.enqueue_document(
+                path.name, DocumentLoader.preprocess_text(text), strategy_ids, schema
+            )
+            print(f"Enqueued document {document_id} ({path.name}) with {len(strategy_ids)} tasks")
+        print(f"Queue status: {queue.counts()}")
+        queue.close()
+        return
 
     # Load environment
     load_dotenv()
@@ -122,7 +333,6 @@ def main():
             ground_truth = json.load(f)
 
     # Initialize
-    import sys
     # Handle Windows console encoding
     if sys.platform == 'win32':
         import io
@@ -132,6 +342,23 @@ def main():
     print("\n🚀 AI Prompt Generator - Document Extraction")
     print("=" * 80)
 
+    # Worker mode: lease tasks from the queue in one or more processes
+    if args.worker:
+        from src.core.worker import start_workers
+        print(f"\nStarting {args.workers} worker(s) on queue {args.queue}")
+        start_workers(
+            args.workers,
+            args.queue,
+            provider=args.provider,
+            api_key=api_key,
+            model=args.model,
+            concurrency=args.max_concurrent,
+            strategy_timeout=args.strategy_timeout,
+            wal=not args.no_wal
+        )
+        print("\n✅ Queue drained!")
+        return
+
     # Create LLM client
     llm_provider = LLMProvider(args.provider)
     client = create_llm_client(llm_provider, api_key=api_key, model=args.model)
@@ -140,7 +367,10 @@ def main():
 
     print(f"\nProvider: {args.provider.upper()}")
     print(f"Loaded {len(strategies)} extraction strategies")
-    print(f"Document: {document_path.name}")
+    if args.corpus:
+        print(f"Corpus: {args.corpus} ({len(corpus_paths)} documents)")
+    else:
+        print(f"Document: {document_path.name}")
     print(f"Output directory: {args.output_dir}")
 
     # Create engine
@@ -150,48 +380,79 @@ def main():
         max_concurrent=args.max_concurrent,
         request_delay=args.delay
     )
+    engine.events.subscribe(ResultReporter.print_event)
+
+    # Corpus mode: all documents, optionally packed into shared requests
+    if args.corpus:
+        # Ground truth may map document file names to their own truth;
+        # otherwise the same truth applies to every document
+        names = {Path(path).name for path in corpus_paths}
+        per_document = isinstance(ground_truth, dict) and bool(names & set(ground_truth))
+        ground_truths = {
+            str(path): ground_truth.get(Path(path).name) if per_document else ground_truth
+            for path in corpus_paths
+        }
+
+        # Sequential mode: evaluate document by document, dropping strategies
+        # as soon as their comparison is statistically settled
+        if args.settle_confidence and ground_truth:
+            from src.core.sequential_evaluation import evaluate_sequentially
+            corpus_results, comparison = asyncio.run(evaluate_sequentially(
+                engine,
+                corpus_paths,
+                ground_truths,
+                confidence=args.settle_confidence,
+                margin=args.tie_margin,
+                schema=schema,
+                strategy_timeout=args.strategy_timeout,
+                repair=args.repair
+            ))
+            for path, results in corpus_results.items():
+                output_dir = Path(args.output_dir) / Path(path).stem
+                report_and_save(engine, Path(path).name, results, ground_truths[path], output_dir)
+            summary = comparison.summary()
+            ResultReporter.print_sequential_summary(summary)
+            summary_path = ResultReporter.save_corpus_summary(summary, args.output_dir)
+            print(f"   ✓ Corpus summary: {summary_path}")
+            print("\n✅ Extraction complete!")
+            return
+
+        corpus_results = asyncio.run(engine.extract_corpus(
+            corpus_paths,
+            schema=schema,
+            strategy_timeout=args.strategy_timeout,
+            pack_token_budget=args.pack_budget,
+            repair=args.repair
+        ))
+        for path in corpus_paths:
+            output_dir = Path(args.output_dir) / Path(path).stem
+            report_and_save(engine, Path(path).name, corpus_results[str(path)], ground_truths[str(path)], output_dir)
+
+        if ground_truth:
+            from src.core.corpus_evaluation import CorpusEvaluation
+            summary = CorpusEvaluation.from_results(corpus_results, ground_truths).summary()
+            ResultReporter.print_corpus_summary(summary)
+            summary_path = ResultReporter.save_corpus_summary(summary, args.output_dir)
+            print(f"   ✓ Corpus summary: {summary_path}")
+        print("\n✅ Extraction complete!")
+        return
 
     # Run extraction
     async def run_extraction():
-        results = await engine.extract_with_all_strategies(document_path)
-
-        # Validate results
-        print("\n📊 Validating results...")
-        validation_metrics = ResultValidator.compare_results(results, ground_truth)
-
-        # Find best strategy
-        best_strategy_id = ResultValidator.find_best_strategy(
-            results,
-            validation_metrics,
-            optimize_for="accuracy" if ground_truth else "cost"
+        results = await engine.extract_with_all_strategies(
+            document_path,
+            schema=schema,
+            deadline=args.deadline,
+            strategy_timeout=args.strategy_timeout,
+            chunk_size=args.chunk_size,
+            prune_to_schema=args.prune,
+            compaction=CompactionConfig() if args.compact else None,
+            stop_when_agreed=args.stop_when_agreed,
+            stream_fields=args.stream_fields,
+            repair=args.repair
         )
 
-        # Create report
-        report = engine.create_comparison_report(
-            document_name=document_path.name,
-            results=results,
-            ground_truth=ground_truth
-        )
-        report.validation_metrics = validation_metrics
-        if best_strategy_id:
-            best = next(r for r in results if r.strategy_id == best_strategy_id)
-            report.best_strategy = best.strategy_name
-
-        # Display results
-        ResultReporter.print_summary(report)
-
-        # Save results
-        output_dir = Path(args.output_dir)
-        print(f"\n💾 Saving results to {output_dir}...")
-
-        json_path = ResultReporter.save_json_report(report, output_dir)
-        print(f"   ✓ JSON report: {json_path}")
-
-        csv_path = ResultReporter.save_csv_summary(report, output_dir)
-        print(f"   ✓ CSV summary: {csv_path}")
-
-        data_files = ResultReporter.save_extracted_data(results, output_dir / "extracted_data")
-        print(f"   ✓ Extracted data: {len(data_files)} files")
+        report_and_save(engine, document_path.name, results, ground_truth, args.output_dir)
 
         print("\n✅ Extraction complete!")
 
@@ -1,8 +1,15 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+import asyncio
 import time
 from .models import ExtractionResult, StrategyMetadata
 from .llm_provider import BaseLLMClient
+from .json_parser import IncrementalJSONParser, extract_json_object
+from .schema_validator import compile_schema, validate_result
+from .repair import build_repair_prompt, merge_repair, missing_fields, needs_repair, unparsed
+from .events import EventType, emit
+from ..utils.fields import normalize_key
+from ..utils.tokens import estimate_tokens
 
 
 class BaseExtractionStrategy(ABC):
@@ -24,49 +31,61 @@ class BaseExtractionStrategy(ABC):
         pass
 
     def parse_response(self, response_text: str) -> Dict[str, Any]:
-        """Parse the AI response into structured data. Override if needed."""
-        import json
-        try:
-            # Try to extract JSON from response
-            if "```json" in response_text:
-                start = response_text.find("```json") + 7
-                end = response_text.find("```", start)
-                json_str = response_text[start:end].strip()
-            elif "{" in response_text and "}" in response_text:
-                start = response_text.find("{")
-                end = response_text.rfind("}") + 1
-                json_str = response_text[start:end]
-            else:
-                json_str = response_text
+        """
+        Parse the AI response into structured data. Override if needed.
 
-            return json.loads(json_str)
-        except json.JSONDecodeError:
+        Tolerates prose and code fences around the JSON, common syntax
+        defects and truncated output (see json_parser.extract_json_object).
+        """
+        data = extract_json_object(response_text)
+        if data is None:
             return {"raw_response": response_text}
+        return data
 
     async def extract(
         self,
         document_text: str,
         schema: Optional[Dict[str, Any]] = None,
         max_tokens: int = 4096,
-        temperature: float = 0.0
+        temperature: float = 0.0,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+        repair: bool = False
     ) -> ExtractionResult:
-        """Execute the extraction strategy."""
+        """
+        Execute the extraction strategy.
+
+        A timeout cancels the provider call and returns a result marked
+        timed_out instead of raising. With stream, the response is parsed
+        as it arrives (see generate_streaming). With a schema, the data is
+        coerced to it and the result carries a schema_check. With repair, a
+        response that fails to parse or misses schema fields gets one
+        targeted repair call (see repair).
+        """
         start_time = time.time()
 
         try:
             prompt = self.build_prompt(document_text, schema)
 
             # Use provider-agnostic client
-            response = await self.client.generate(
-                prompt=prompt,
-                max_tokens=max_tokens,
-                temperature=temperature
-            )
+            if stream:
+                required_fields = compile_schema(schema).fields if schema else None
+                call = self.generate_streaming(prompt, max_tokens, temperature, required_fields)
+            else:
+                call = self.client.generate(
+                    prompt=prompt,
+                    max_tokens=max_tokens,
+                    temperature=temperature
+                )
+            response = await asyncio.wait_for(call, timeout)
 
             execution_time = time.time() - start_time
 
-            # Parse response
-            extracted_data = self.parse_response(response["text"])
+            # Parse response; a stream stopped early holds only complete fields
+            if response.get("stopped_early"):
+                extracted_data = response["fields"]
+            else:
+                extracted_data = self.parse_response(response["text"])
 
             # Calculate cost using provider-specific pricing
             input_tokens = response["input_tokens"]
@@ -74,15 +93,26 @@ class BaseExtractionStrategy(ABC):
             total_tokens = response["total_tokens"]
             cost = self.client.calculate_cost(input_tokens, output_tokens)
 
-            return ExtractionResult(
+            result = ExtractionResult(
                 strategy_name=self.metadata.name,
                 strategy_id=self.metadata.id,
                 extracted_data=extracted_data,
                 execution_time=execution_time,
                 token_count=total_tokens,
                 cost=cost,
-                error=None
+                error=None,
+                stopped_early=response.get("stopped_early", False)
             )
+            # Coerce types and record missing / extra fields against the schema
+            result = validate_result(result, schema)
+            if repair and needs_repair(result):
+                remaining = timeout - (time.time() - start_time) if timeout is not None else None
+                if remaining is None or remaining > 0:
+                    result = await self.repair(result, document_text, schema, max_tokens, temperature, remaining)
+            return result
+
+        except asyncio.TimeoutError:
+            return self.timed_out_result(time.time() - start_time)
 
         except Exception as e:
             execution_time = time.time() - start_time
@@ -95,3 +125,122 @@ class BaseExtractionStrategy(ABC):
                 cost=0.0,
                 error=str(e)
             )
+
+    async def repair(
+        self,
+        result: ExtractionResult,
+        document_text: str,
+        schema: Optional[Dict[str, Any]] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.0,
+        timeout: Optional[float] = None
+    ) -> ExtractionResult:
+        """
+        Fix a result with one small call instead of re-running the extraction.
+
+        Sends back only the unparsable output, or only the missing fields'
+        names with the document sections relevant to them, and merges the
+        answer into the original data. The repair's cost, tokens and time are
+        added to the result's totals and also recorded on their own. If the
+        repair call fails, the original result is returned unchanged.
+        """
+        start_time = time.time()
+        wanted = missing_fields(result)
+        try:
+            response = await asyncio.wait_for(
+                self.client.generate(
+                    prompt=build_repair_prompt(result, document_text, schema),
+                    max_tokens=max_tokens,
+                    temperature=temperature
+                ),
+                timeout
+            )
+        except Exception:
+            return result
+        repair_time = time.time() - start_time
+        repair_cost = self.client.calculate_cost(response["input_tokens"], response["output_tokens"])
+
+        repaired = extract_json_object(response["text"])
+        if isinstance(repaired, dict) and schema:
+            repaired = compile_schema(schema).validate(repaired)[0]
+        if not isinstance(repaired, dict):
+            data = result.extracted_data
+        elif unparsed(result):
+            data = repaired
+        else:
+            data = merge_repair(result.extracted_data, {k: v for k, v in repaired.items() if k in wanted})
+
+        emit(EventType.REPAIRED, fields=wanted, cost=repair_cost, execution_time=repair_time)
+        return validate_result(result.model_copy(update={
+            "extracted_data": data,
+            "execution_time": result.execution_time + repair_time,
+            "token_count": result.token_count + response["total_tokens"],
+            "cost": result.cost + repair_cost,
+            "repaired": True,
+            "repair_time": repair_time,
+            "repair_tokens": response["total_tokens"],
+            "repair_cost": repair_cost,
+        }), schema)
+
+    async def generate_streaming(
+        self,
+        prompt: str,
+        max_tokens: int = 4096,
+        temperature: float = 0.0,
+        required_fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Stream a response, emitting a FIELD event as each top-level field completes.
+
+        Generation stops as soon as every required field is complete, which
+        saves the output tokens (and time) of whatever the model would have
+        written after them.
+
+        Returns:
+            Response dict as from client.generate, plus "fields" (the
+            completed fields) and "stopped_early"
+        """
+        parser = IncrementalJSONParser()
+        required = {normalize_key(field) for field in required_fields or []}
+        seen = set()
+        usage: Dict[str, int] = {}
+        stopped_early = False
+
+        chunks = self.client.stream(prompt=prompt, max_tokens=max_tokens, temperature=temperature)
+        try:
+            async for chunk in chunks:
+                usage.update({k: v for k, v in chunk.items() if k.endswith("_tokens")})
+                for field, value in parser.feed(chunk["text"]).items():
+                    seen.add(normalize_key(field))
+                    emit(EventType.FIELD, field=field, value=value)
+                if required and required <= seen and not parser.complete:
+                    stopped_early = True
+                    break
+        finally:
+            # Aborts the provider request when stopping early
+            await chunks.aclose()
+
+        # A stream cut short never reports usage; estimate it
+        input_tokens = usage.get("input_tokens") or estimate_tokens(prompt)
+        output_tokens = usage.get("output_tokens") or estimate_tokens(parser.text)
+        return {
+            "text": parser.text,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+            "fields": parser.fields,
+            "stopped_early": stopped_early
+        }
+
+    def timed_out_result(self, execution_time: float) -> ExtractionResult:
+        """Build the result recorded for a strategy cut off by a timeout."""
+        return ExtractionResult(
+            strategy_name=self.metadata.name,
+            strategy_id=self.metadata.id,
+            extracted_data={},
+            execution_time=execution_time,
+            token_count=0,
+            cost=0.0,
+            error=f"Timed out after {execution_time:.1f}s",
+            timed_out=True
+        )
@@ -0,0 +1,113 @@
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+from .models import ExtractionResult
+from ..utils.fields import flatten_fields, normalize_key, normalize_value
+
+
+class ConsensusEngine:
+    """
+    Cross-strategy consensus built incrementally as results arrive.
+
+    Each successful result's data is flattened into path-addressed fields
+    and normalized; per-field vote tallies are updated in O(fields) per
+    result, so the consensus can be checked after every completion.
+    """
+
+    def __init__(self):
+        self.tallies: Dict[str, Counter] = {}
+        # First original value seen for each normalized value, used in the record
+        self.originals: Dict[str, Dict[str, Any]] = {}
+        self.strategy_values: Dict[str, Dict[str, str]] = {}
+
+    @property
+    def num_results(self) -> int:
+        return len(self.strategy_values)
+
+    def add(self, result: ExtractionResult) -> None:
+        """Count one strategy's result. Failed results are ignored."""
+        if result.error or not isinstance(result.extracted_data, dict):
+            return
+        values = {}
+        for field, value in flatten_fields(result.extracted_data).items():
+            normalized = normalize_value(value)
+            if not normalized:
+                continue
+            values[field] = normalized
+            self.tallies.setdefault(field, Counter())[normalized] += 1
+            self.originals.setdefault(field, {}).setdefault(normalized, value)
+        self.strategy_values[result.strategy_id] = values
+
+    def top(self, field: str) -> Optional[tuple]:
+        """(normalized value, votes) with the most votes for a field."""
+        tally = self.tallies.get(field)
+        if not tally:
+            return None
+        return tally.most_common(1)[0]
+
+    def majority_fields(self) -> List[str]:
+        """Fields reported by more than half of the counted results."""
+        return [
+            field for field, tally in self.tallies.items()
+            if sum(tally.values()) * 2 > self.num_results
+        ]
+
+    def consensus_record(self, min_agreement: float = 0.5) -> Dict[str, Any]:
+        """
+        Consensus value per field, for fields whose top value is backed by
+        more than min_agreement of the counted results.
+        """
+        record = {}
+        for field in self.tallies:
+            value, votes = self.top(field)
+            if votes > min_agreement * self.num_results:
+                record[field] = self.originals[field][value]
+        return record
+
+    def agreement_scores(self, min_agreement: float = 0.5) -> Dict[str, float]:
+        """Fraction of consensus fields each strategy agrees with."""
+        consensus = {
+            field: normalize_value(value)
+            for field, value in self.consensus_record(min_agreement).items()
+        }
+        if not consensus:
+            return {strategy_id: 0.0 for strategy_id in self.strategy_values}
+        return {
+            strategy_id: sum(values.get(field) == value for field, value in consensus.items()) / len(consensus)
+            for strategy_id, values in self.strategy_values.items()
+        }
+
+    def is_settled(self, min_votes: int, fields: Optional[Iterable[str]] = None) -> bool:
+        """
+        Whether every required field has a value at least min_votes strategies agree on.
+
+        Args:
+            min_votes: Number of agreeing strategies required per field
+            fields: Required fields (e.g. schema keys); defaults to the fields
+                reported by a majority of results so far
+        """
+        if self.num_results < min_votes:
+            return False
+        if fields is not None:
+            required = [normalize_key(field) for field in fields]
+        else:
+            required = self.majority_fields()
+        if not required:
+            return False
+        majority = set(self.majority_fields())
+        for field in required:
+            # A schema field may be an object or list flattened into sub-paths;
+            # only sub-paths most strategies report have to agree
+            paths = [
+                path for path in self.tallies
+                if path == field or (path.startswith((field + ".", field + "[")) and path in majority)
+            ]
+            if not paths or any(self.top(path)[1] < min_votes for path in paths):
+                return False
+        return True
+
+    @classmethod
+    def from_results(cls, results: List[ExtractionResult]) -> "ConsensusEngine":
+        engine = cls()
+        for result in results:
+            engine.add(result)
+        return engine
@@ -0,0 +1,225 @@
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from .models import ExtractionResult
+from .validator import ResultValidator
+
+# A string field counts as matched at this similarity, as in validate_against_ground_truth
+MATCH_THRESHOLD = 0.8
+
+
+class CorpusEvaluation:
+    """
+    Columnar evaluation of a corpus run against ground truth.
+
+    Per-field match scores are packed into document x strategy x field
+    arrays once; all aggregates are then vectorized NumPy reductions.
+
+    Attributes:
+        documents, strategies, fields: Labels of the three axes
+        scores: (D, S, F) field match scores; NaN where the document's ground
+            truth has no such field
+        present: (D, S, F) whether the strategy extracted the field
+        cost, time: (D, S) cost and execution time per extraction
+        failed: (D, S) whether the extraction failed (or is missing)
+    """
+
+    def __init__(
+        self,
+        documents: List[str],
+        strategies: List[str],
+        fields: List[str],
+        scores: np.ndarray,
+        present: np.ndarray,
+        cost: np.ndarray,
+        time: np.ndarray,
+        failed: np.ndarray,
+        strategy_names: Optional[Dict[str, str]] = None
+    ):
+        self.documents = documents
+        self.strategies = strategies
+        self.fields = fields
+        self.scores = scores
+        self.present = present
+        self.cost = cost
+        self.time = time
+        self.failed = failed
+        self.strategy_names = strategy_names or {}
+
+    @classmethod
+    def from_results(
+        cls,
+        corpus_results: Dict[str, List[ExtractionResult]],
+        ground_truths: Dict[str, Dict[str, Any]]
+    ) -> "CorpusEvaluation":
+        """
+        Score a corpus run.
+
+        Args:
+            corpus_results: Mapping of document to its strategies' results
+                (as returned by ExtractionEngine.extract_corpus)
+            ground_truths: Mapping of document to its ground truth; documents
+                without ground truth are left out
+        """
+        documents = [doc for doc in corpus_results if ground_truths.get(doc)]
+        strategies: List[str] = []
+        names: Dict[str, str] = {}
+        fields: List[str] = []
+        truth_fields: Dict[str, List[str]] = {}
+        for doc in documents:
+            for result in corpus_results[doc]:
+                if result.strategy_id not in names:
+                    strategies.append(result.strategy_id)
+                    names[result.strategy_id] = result.strategy_name
+            # Nested truth is scored per leaf path ("line_items[0].qty")
+            truth_fields[doc] = list(
+                ResultValidator.validate_against_ground_truth({}, ground_truths[doc]).field_match_rate
+            )
+            fields.extend(key for key in truth_fields[doc] if key not in fields)
+
+        strategy_index = {strategy_id: i for i, strategy_id in enumerate(strategies)}
+        field_index = {field: i for i, field in enumerate(fields)}
+        shape = (len(documents), len(strategies), len(fields))
+        scores = np.full(shape, np.nan)
+        present = np.zeros(shape, dtype=bool)
+        cost = np.zeros(shape[:2])
+        time = np.zeros(shape[:2])
+        failed = np.ones(shape[:2], dtype=bool)
+
+        for d, doc in enumerate(documents):
+            truth = ground_truths[doc]
+            truth_columns = [field_index[key] for key in truth_fields[doc]]
+            # Missing strategies score 0 on every truth field
+            scores[d][:, truth_columns] = 0.0
+            similarities = ResultValidator.batch_similarities(corpus_results[doc], truth)
+            for result in corpus_results[doc]:
+                s = strategy_index[result.strategy_id]
+                cost[d, s] = result.cost
+                time[d, s] = result.execution_time
+                failed[d, s] = bool(result.error)
+                if result.error:
+                    continue
+                metrics = ResultValidator.validate_against_ground_truth(
+                    result.extracted_data, truth, similarities.get(result.strategy_id)
+                )
+                missing = set(metrics.missing_fields)
+                for key, rate in metrics.field_match_rate.items():
+                    scores[d, s, field_index[key]] = rate
+                    present[d, s, field_index[key]] = key not in missing
+
+        return cls(documents, strategies, fields, scores, present, cost, time, failed, names)
+
+    @property
+    def field_mask(self) -> np.ndarray:
+        """(D, F) whether each document's ground truth has the field."""
+        # Every strategy scores (at least 0) on each truth field, so any one column tells
+        if not self.strategies:
+            return np.zeros((len(self.documents), len(self.fields)), dtype=bool)
+        return ~np.isnan(self.scores[:, 0, :])
+
+    @property
+    def matched(self) -> np.ndarray:
+        """(D, S, F) whether the field matched the ground truth."""
+        return np.nan_to_num(self.scores, nan=0.0) >= MATCH_THRESHOLD
+
+    def document_accuracy(self) -> np.ndarray:
+        """(D, S) fraction of each document's truth fields matched."""
+        fields_per_document = np.maximum(self.field_mask.sum(axis=1), 1)[:, None]
+        return self.matched.sum(axis=2) / fields_per_document
+
+    def document_completeness(self) -> np.ndarray:
+        """(D, S) fraction of each document's truth fields extracted."""
+        fields_per_document = np.maximum(self.field_mask.sum(axis=1), 1)[:, None]
+        return (self.present & self.field_mask[:, None, :]).sum(axis=2) / fields_per_document
+
+    def field_accuracy(self) -> np.ndarray:
+        """(S, F) accuracy per strategy and field over documents that have the field."""
+        mask = self.field_mask
+        return (self.matched & mask[:, None, :]).sum(axis=0) / np.maximum(mask.sum(axis=0), 1)
+
+    def bootstrap_ci(
+        self,
+        values: Optional[np.ndarray] = None,
+        n_resamples: int = 1000,
+        confidence: float = 0.95,
+        seed: Optional[int] = 0,
+        batch_size: int = 200
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Percentile bootstrap confidence interval of per-strategy means over documents.
+
+        Resamples are drawn as multinomial document weights, so each batch of
+        resamples is one matrix product instead of materializing resampled
+        copies of the data.
+
+        Args:
+            values: (D, S) per-document values (default: document accuracy)
+            n_resamples: Number of bootstrap resamples
+            confidence: Interval coverage
+            seed: Random seed (None for nondeterministic)
+            batch_size: Resamples computed per matrix product (bounds memory)
+
+        Returns:
+            Tuple of (lower, upper) arrays of shape (S,)
+        """
+        values = self.document_accuracy() if values is None else values
+        count = values.shape[0]
+        if count == 0:
+            empty = np.full(values.shape[1], np.nan)
+            return empty, empty
+        rng = np.random.default_rng(seed)
+        means = []
+        for start in range(0, n_resamples, batch_size):
+            size = min(batch_size, n_resamples - start)
+            weights = rng.multinomial(count, np.full(count, 1 / count), size=size)
+            means.append(weights @ values / count)
+        means = np.concatenate(means)
+        alpha = (1 - confidence) / 2
+        return np.quantile(means, alpha, axis=0), np.quantile(means, 1 - alpha, axis=0)
+
+    def pareto_front(self, accuracy: Optional[np.ndarray] = None, cost: Optional[np.ndarray] = None) -> List[str]:
+        """
+        Strategies not dominated on (higher accuracy, lower cost).
+
+        A strategy is dominated if another is at least as accurate and at
+        most as expensive, and strictly better on one of the two.
+
+        Returns:
+            Strategy IDs on the front, cheapest first
+        """
+        accuracy = self.document_accuracy().mean(axis=0) if accuracy is None else accuracy
+        cost = self.cost.mean(axis=0) if cost is None else cost
+        # dominates[i, j]: strategy i dominates strategy j
+        at_least = (accuracy[:, None] >= accuracy[None, :]) & (cost[:, None] <= cost[None, :])
+        strictly = (accuracy[:, None] > accuracy[None, :]) | (cost[:, None] < cost[None, :])
+        dominated = (at_least & strictly).any(axis=0)
+        front = np.flatnonzero(~dominated)
+        return [self.strategies[i] for i in front[np.argsort(cost[front], kind="stable")]]
+
+    def summary(self, n_resamples: int = 1000, confidence: float = 0.95) -> Dict[str, Any]:
+        """JSON-serializable per-strategy and per-field aggregates."""
+        accuracy = self.document_accuracy()
+        completeness = self.document_completeness()
+        lower, upper = self.bootstrap_ci(accuracy, n_resamples, confidence)
+        field_accuracy = self.field_accuracy()
+        mean_accuracy = accuracy.mean(axis=0) if self.documents else np.zeros(len(self.strategies))
+
+        strategies = {}
+        for s, strategy_id in enumerate(self.strategies):
+            strategies[strategy_id] = {
+                "strategy_name": self.strategy_names.get(strategy_id, strategy_id),
+                "accuracy": float(mean_accuracy[s]),
+                "accuracy_ci": [float(lower[s]), float(upper[s])],
+                "completeness": float(completeness[:, s].mean()) if self.documents else 0.0,
+                "failure_rate": float(self.failed[:, s].mean()) if self.documents else 0.0,
+                "total_cost": float(self.cost[:, s].sum()),
+                "mean_time": float(self.time[:, s].mean()) if self.documents else 0.0,
+                "field_accuracy": {
+                    field: float(field_accuracy[s, f]) for f, field in enumerate(self.fields)
+                },
+            }
+        return {
+            "documents": len(self.documents),
+            "confidence": confidence,
+            "strategies": strategies,
+            "pareto_front": self.pareto_front(mean_accuracy, self.cost.mean(axis=0)) if self.documents else [],
+        }
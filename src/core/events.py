@@ -0,0 +1,130 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class EventType(str, Enum):
+    RUN_STARTED = "run_started"
+    STARTED = "started"
+    RETRIED = "retried"
+    # A top-level field of a streamed response is complete (partial result)
+    FIELD = "field"
+    # A failed parse or missing schema fields were fixed by a targeted repair call
+    REPAIRED = "repaired"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    RUN_COMPLETED = "run_completed"
+
+
+@dataclass(slots=True)
+class ExtractionEvent:
+    """A progress event emitted by the engine or a provider client."""
+    type: EventType
+    run_id: Optional[str] = None
+    strategy_id: Optional[str] = None
+    timestamp: float = field(default_factory=time.time)
+    data: Dict[str, Any] = field(default_factory=dict)
+
+
+Subscriber = Callable[[ExtractionEvent], None]
+
+
+class EventBus:
+    """
+    Synchronous publish/subscribe bus for extraction progress.
+
+    Emitting is a no-op when nothing is subscribed, and callers on hot paths
+    can test the bus for truthiness to skip building event payloads at all.
+    Subscribers must be fast and non-blocking; exceptions they raise are
+    swallowed so a broken subscriber cannot fail an extraction.
+    """
+
+    def __init__(self):
+        self._subscribers: List[Subscriber] = []
+
+    def __bool__(self) -> bool:
+        return bool(self._subscribers)
+
+    def subscribe(self, callback: Subscriber) -> Callable[[], None]:
+        """
+        Register a subscriber.
+
+        Returns:
+            Function that unsubscribes the callback
+        """
+        self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def emit(
+        self,
+        event_type: EventType,
+        run_id: Optional[str] = None,
+        strategy_id: Optional[str] = None,
+        **data: Any
+    ) -> None:
+        if not self._subscribers:
+            return
+        event = ExtractionEvent(event_type, run_id, strategy_id, time.time(), data)
+        for callback in tuple(self._subscribers):
+            try:
+                callback(event)
+            except Exception:
+                pass
+
+
+# Bus, run ID and strategy ID of the extraction running in the current task,
+# so code without a handle on the engine (e.g. provider retries) can emit
+_current: ContextVar[Optional[Tuple[EventBus, Optional[str], Optional[str]]]] = ContextVar(
+    "extraction_event_context", default=None
+)
+
+
+@contextmanager
+def event_context(bus: EventBus, run_id: Optional[str] = None, strategy_id: Optional[str] = None):
+    """Bind a bus and IDs for emit() calls made within the block."""
+    token = _current.set((bus, run_id, strategy_id))
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def emit(event_type: EventType, **data: Any) -> None:
+    """Emit an event on the bus bound to the current task, if any."""
+    context = _current.get()
+    if context is None:
+        return
+    bus, run_id, strategy_id = context
+    if bus:
+        bus.emit(event_type, run_id, strategy_id, **data)
+
+
+class EventMetrics:
+    """Subscriber aggregating event counts and strategy timings."""
+
+    def __init__(self):
+        self.counts: Dict[str, int] = {event_type.value: 0 for event_type in EventType}
+        self.total_execution_time = 0.0
+        self.total_cost = 0.0
+
+    def __call__(self, event: ExtractionEvent) -> None:
+        self.counts[event.type.value] += 1
+        if event.type in (EventType.COMPLETED, EventType.FAILED):
+            self.total_execution_time += event.data.get("execution_time", 0.0)
+            self.total_cost += event.data.get("cost", 0.0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        finished = self.counts[EventType.COMPLETED.value] + self.counts[EventType.FAILED.value]
+        return {
+            "events": dict(self.counts),
+            "average_execution_time": self.total_execution_time / finished if finished else 0.0,
+            "total_cost": self.total_cost,
+        }
@@ -1,9 +1,21 @@
 import asyncio
+import time
+import uuid
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 from .base_strategy import BaseExtractionStrategy
 from .models import ExtractionResult, ComparisonReport
+from .scheduler import ExtractionScheduler, Priority, DeadlineExceeded
+from .events import EventBus, EventType, event_context
+from .result_merger import merge_chunk_results
+from .packing import add_usage, pack_documents, extract_packed
+from .consensus import ConsensusEngine
+from .schema_validator import compile_schema, validate_result
+from .repair import needs_repair
 from ..utils.document_loader import DocumentLoader
+from ..utils.chunker import DocumentChunker
+from ..utils.section_index import select_relevant_sections
+from ..utils.compactor import DocumentCompactor, CompactionConfig
 from .llm_provider import BaseLLMClient
 import os
 from dotenv import load_dotenv
@@ -17,13 +29,26 @@ class ExtractionEngine:
         strategies: List[BaseExtractionStrategy],
         llm_client: Optional[BaseLLMClient] = None,
         max_concurrent: int = 5,
-        request_delay: float = 0.5
+        request_delay: float = 0.5,
+        scheduler: Optional[ExtractionScheduler] = None,
+        events: Optional[EventBus] = None
     ):
         load_dotenv()
         self.client = llm_client
         self.strategies = strategies
         self.max_concurrent = max_concurrent
         self.request_delay = request_delay
+        # A shared scheduler lets several engines (e.g. concurrent API requests)
+        # compete for the same provider quota by priority and deadline
+        self.scheduler = scheduler or ExtractionScheduler(max_concurrent)
+        # Earliest time.monotonic() at which the next request may be dispatched
+        self._next_dispatch = 0.0
+        # Progress events; nothing is built or sent until someone subscribes
+        self.events = events if events is not None else EventBus()
+        # Size reductions from preprocessing stages of the last run
+        self.last_preprocessing: Dict[str, Any] = {}
+        # Vote tallies of the last run's results
+        self.last_consensus = ConsensusEngine()
 
         # Initialize strategies with client if provided
         if self.client:
@@ -33,62 +58,386 @@ class ExtractionEngine:
 
     async def extract_with_all_strategies(
         self,
-        document_path: str | Path,
+        document_path: str | Path | bytes,
         schema: Optional[Dict[str, Any]] = None,
         max_tokens: int = 4096,
-        temperature: float = 0.0
+        temperature: float = 0.0,
+        priority: Priority = Priority.BATCH,
+        deadline: Optional[float] = None,
+        strategy_timeout: Optional[float] = None,
+        run_id: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        chunk_overlap: int = 500,
+        prune_to_schema: bool = False,
+        relevance_top_k: int = 8,
+        relevance_token_budget: int = 2000,
+        compaction: Optional[CompactionConfig] = None,
+        stop_when_agreed: Optional[int] = None,
+        document_name: Optional[str] = None,
+        strategy_ids: Optional[List[str]] = None,
+        stream_fields: bool = False,
+        repair: bool = False
     ) -> List[ExtractionResult]:
         """
         Run all strategies on a document.
 
         Args:
-            document_path: Path to document
+            document_path: Path to document, or its content as bytes
             schema: Optional schema for extraction
             max_tokens: Max tokens for API calls
             temperature: Temperature for API calls
+            priority: Scheduling priority class for this run
+            deadline: Optional seconds from now by which strategies must finish;
+                strategies that can no longer make it are shed, and those still
+                running when it passes are cancelled
+            strategy_timeout: Optional per-strategy timeout in seconds
+            run_id: Optional ID attached to this run's events (generated if omitted)
+            chunk_size: If set, documents longer than this many characters are
+                split on page/section boundaries and each strategy runs on all
+                chunks concurrently, with the partial results merged
+            chunk_overlap: Characters of overlap between consecutive chunks
+            prune_to_schema: With a schema, send strategies only the top-k
+                document sections relevant to its fields (BM25 ranked)
+            relevance_top_k: Maximum sections kept when pruning
+            relevance_token_budget: Token budget for the kept sections
+            compaction: If set, compact the text (repeated headers/footers,
+                table whitespace, boilerplate, Unicode) before pruning and chunking
+            stop_when_agreed: If set, cancel the remaining strategies once this
+                many agree on every schema field (or, without a schema, on every
+                field most strategies report)
+            document_name: Name reported in events; defaults to the file
+                name. Also used to detect the type of in-memory content
+            strategy_ids: If set, run only these strategies
+            stream_fields: Stream responses, emitting a FIELD event as each
+                top-level field completes; with a schema, generation stops
+                once every schema field is complete
+            repair: Follow a response that fails to parse or misses schema
+                fields with one targeted repair call (see
+                BaseExtractionStrategy.repair); chunked runs repair the merged
+                result, not each chunk
 
         Returns:
-            List of extraction results
+            List of extraction results, one per strategy in strategy order;
+            strategies cut off by a timeout are marked timed_out
         """
+        run_id = run_id or uuid.uuid4().hex[:12]
+        events = self.events
+        strategies = self.strategies
+        if strategy_ids is not None:
+            strategies = [s for s in strategies if s.metadata.id in strategy_ids]
+
         # Load document
-        text, doc_type = DocumentLoader.load(document_path)
-        text = DocumentLoader.preprocess_text(text)
+        document = DocumentLoader.load_document(document_path, filename=document_name)
+        doc_type = document.doc_type
+        if document_name is None:
+            document_name = "document" if isinstance(document_path, bytes) else Path(document_path).name
+        text = DocumentLoader.preprocess_text(document.text)
+        self.last_preprocessing = {}
+
+        if compaction is not None:
+            text, stats = DocumentCompactor(compaction).compact(text)
+            self.last_preprocessing["compaction"] = stats
+
+        if prune_to_schema and schema:
+            text, stats = select_relevant_sections(
+                text, compile_schema(schema).descriptions, relevance_top_k, relevance_token_budget
+            )
+            self.last_preprocessing["relevance_pruning"] = stats
+
+        self.last_consensus = ConsensusEngine()
+
+        # Long documents are split into chunks extracted concurrently and merged
+        chunks = [text]
+        chunk_pages = [None]
+        if chunk_size and len(text) > chunk_size:
+            chunker = DocumentChunker(chunk_size, min(chunk_overlap, chunk_size // 2))
+            spans = chunker.chunk_pages(text)
+            chunks = [chunk for chunk, _, _ in spans]
+            chunk_pages = [[first, last] for _, first, last in spans]
+
+        if events:
+            events.emit(
+                EventType.RUN_STARTED,
+                run_id,
+                document_name=document_name,
+                document_type=doc_type.value,
+                document_length=len(text),
+                pages=document.pages,
+                tables=len(document.tables),
+                strategies=len(strategies),
+                chunks=len(chunks),
+                preprocessing=self.last_preprocessing
+            )
+
+        # The scheduler is the only concurrency limit, so priority and
+        # deadline order decide which waiting request runs next
+        run_deadline = time.monotonic() + deadline if deadline is not None else None
+
+        async def run_strategy(
+            strategy: BaseExtractionStrategy,
+            document_text: str,
+            chunk_index: int,
+            repair_result: bool
+        ) -> ExtractionResult:
+            if events:
+                events.emit(EventType.STARTED, run_id, strategy.metadata.id,
+                            strategy_name=strategy.metadata.name,
+                            chunk=chunk_index, chunks=len(chunks), pages=chunk_pages[chunk_index])
+            with event_context(events, run_id, strategy.metadata.id):
+                result = await strategy.extract(
+                    document_text, schema, max_tokens, temperature,
+                    timeout=strategy_timeout, stream=stream_fields, repair=repair_result
+                )
+            return result
+
+        async def schedule(
+            strategy: BaseExtractionStrategy,
+            document_text: str,
+            chunk_index: int,
+            repair_result: bool = False
+        ):
+            try:
+                return await self._run_paced(
+                    lambda: run_strategy(strategy, document_text, chunk_index, repair_result),
+                    priority=priority,
+                    deadline=run_deadline
+                )
+            except DeadlineExceeded as e:
+                return ExtractionResult(
+                    strategy_name=strategy.metadata.name,
+                    strategy_id=strategy.metadata.id,
+                    extracted_data={},
+                    execution_time=0.0,
+                    token_count=0,
+                    cost=0.0,
+                    error=str(e)
+                )
+
+        async def run_strategy_over_chunks(strategy: BaseExtractionStrategy):
+            if len(chunks) == 1:
+                result = await schedule(strategy, chunks[0], 0, repair)
+            else:
+                # Map over chunks, then reduce with field-level conflict resolution
+                start = time.time()
+                partials = await asyncio.gather(*(
+                    schedule(strategy, chunk, i) for i, chunk in enumerate(chunks)
+                ))
+                result = validate_result(merge_chunk_results(partials, time.time() - start), schema)
+                if repair and needs_repair(result):
+                    with event_context(events, run_id, strategy.metadata.id):
+                        result = await strategy.repair(
+                            result, text, schema, max_tokens, temperature, strategy_timeout
+                        )
+
+            self._emit_result(run_id, result)
+            return result
 
-        print(f"Loaded {doc_type.value} document: {Path(document_path).name}")
-        print(f"Document length: {len(text)} characters")
-        print(f"Running {len(self.strategies)} strategies...\n")
+        # Execute all strategies; on the run deadline keep whatever finished.
+        # Results are tallied as they complete so the run can stop early on consensus
+        run_start = time.time()
+        tasks = [
+            asyncio.ensure_future(run_strategy_over_chunks(strategy))
+            for strategy in strategies
+        ]
+        consensus = self.last_consensus
+        required_fields = compile_schema(schema).fields if schema else None
+        pending = set(tasks)
+        agreed = False
+        try:
+            while pending and not agreed:
+                timeout = max(0.0, run_deadline - time.monotonic()) if run_deadline else None
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    break
+                for task in done:
+                    consensus.add(task.result())
+                agreed = bool(stop_when_agreed) and consensus.is_settled(stop_when_agreed, required_fields)
+        finally:
+            # Also reached when the caller is cancelled (e.g. client disconnect)
+            for task in tasks:
+                task.cancel()
+
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
 
-        # Run strategies with concurrency control
         results = []
-        semaphore = asyncio.Semaphore(self.max_concurrent)
-
-        async def run_strategy_with_semaphore(strategy: BaseExtractionStrategy):
-            async with semaphore:
-                print(f"Running: {strategy.metadata.name}", flush=True)
-                result = await strategy.extract(text, schema, max_tokens, temperature)
-
-                if result.error:
-                    print(f"  X Error: {result.error}", flush=True)
-                else:
-                    print(f"  ✓ Completed in {result.execution_time:.2f}s, cost: ${result.cost:.4f}", flush=True)
-                    # Show extracted data preview
-                    import json
-                    data_str = json.dumps(result.extracted_data, indent=2, ensure_ascii=False)
-                    if len(data_str) > 300:
-                        data_str = data_str[:300] + "..."
-                    print(f"  Data preview: {data_str}", flush=True)
-
-                # Delay between requests
-                await asyncio.sleep(self.request_delay)
-                return result
-
-        # Execute all strategies
-        tasks = [run_strategy_with_semaphore(strategy) for strategy in self.strategies]
-        results = await asyncio.gather(*tasks)
-
-        print(f"\n✓ All strategies completed")
+        for strategy, task in zip(strategies, tasks):
+            if task not in pending:
+                results.append(task.result())
+                continue
+            if agreed:
+                result = ExtractionResult(
+                    strategy_name=strategy.metadata.name,
+                    strategy_id=strategy.metadata.id,
+                    extracted_data={},
+                    execution_time=time.time() - run_start,
+                    token_count=0,
+                    cost=0.0,
+                    error="Cancelled: consensus reached"
+                )
+            else:
+                result = strategy.timed_out_result(time.time() - run_start)
+            self._emit_result(run_id, result)
+            results.append(result)
+
+        if events:
+            events.emit(
+                EventType.RUN_COMPLETED,
+                run_id,
+                total_time=time.time() - run_start,
+                timed_out=sum(1 for r in results if r.timed_out),
+                failed=sum(1 for r in results if r.error),
+                consensus_reached=agreed
+            )
         return results
 
+    async def extract_corpus(
+        self,
+        document_paths: List[str | Path],
+        schema: Optional[Dict[str, Any]] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.0,
+        priority: Priority = Priority.BATCH,
+        strategy_timeout: Optional[float] = None,
+        pack_token_budget: Optional[int] = None,
+        run_id: Optional[str] = None,
+        repair: bool = False
+    ) -> Dict[str, List[ExtractionResult]]:
+        """
+        Run all strategies on several documents.
+
+        Args:
+            document_paths: Paths to documents
+            schema: Optional schema for extraction
+            max_tokens: Max tokens for API calls
+            temperature: Temperature for API calls
+            priority: Scheduling priority class for this run
+            strategy_timeout: Optional per-call timeout in seconds
+            pack_token_budget: If set, small documents are packed into one
+                request per strategy up to this many document tokens; documents
+                the packed response does not cover fall back to single calls
+            run_id: Optional ID attached to this run's events
+            repair: Follow a response that fails to parse or misses schema
+                fields with one targeted repair call
+
+        Returns:
+            Mapping of document path to results in strategy order
+        """
+        run_id = run_id or uuid.uuid4().hex[:12]
+        texts = {}
+        for path in document_paths:
+            text, _ = DocumentLoader.load(path)
+            texts[str(path)] = DocumentLoader.preprocess_text(text)
+
+        # Short IDs keep the packed prompt small and unambiguous
+        ids = {f"doc_{i + 1}": key for i, key in enumerate(texts)}
+        batches = [[(doc_id, texts[key])] for doc_id, key in ids.items()]
+        if pack_token_budget:
+            batches = pack_documents([(doc_id, texts[key]) for doc_id, key in ids.items()], pack_token_budget)
+
+        if self.events:
+            self.events.emit(EventType.RUN_STARTED, run_id, documents=len(texts),
+                             batches=len(batches), strategies=len(self.strategies))
+
+        async def single(strategy: BaseExtractionStrategy, doc_id: str) -> ExtractionResult:
+            with event_context(self.events, run_id, strategy.metadata.id):
+                result = await strategy.extract(
+                    texts[ids[doc_id]], schema, max_tokens, temperature,
+                    timeout=strategy_timeout, repair=repair
+                )
+            return result
+
+        async def packed(strategy: BaseExtractionStrategy, batch) -> Dict[str, ExtractionResult]:
+            with event_context(self.events, run_id, strategy.metadata.id):
+                results = await extract_packed(
+                    strategy, batch, schema, max_tokens, temperature, timeout=strategy_timeout
+                )
+                if repair:
+                    for doc_id, result in results.items():
+                        if not result.error and needs_repair(result):
+                            results[doc_id] = await strategy.repair(
+                                result, texts[ids[doc_id]], schema, max_tokens, temperature, strategy_timeout
+                            )
+            return results
+
+        async def run_batch(strategy: BaseExtractionStrategy, batch) -> Dict[str, ExtractionResult]:
+            results: Dict[str, ExtractionResult] = {}
+            try:
+                if len(batch) > 1:
+                    results = await self._run_paced(lambda: packed(strategy, batch), priority)
+                # Single documents, and any the packed response did not cover;
+                # the fallback is charged its share of the wasted packed call
+                missing = [doc_id for doc_id, _ in batch if doc_id not in results or results[doc_id].error]
+                singles = await asyncio.gather(*(
+                    self._run_paced(lambda d=doc_id: single(strategy, d), priority)
+                    for doc_id in missing
+                ))
+                for doc_id, result in zip(missing, singles):
+                    results[doc_id] = add_usage(result, results.get(doc_id))
+            except DeadlineExceeded as e:
+                for doc_id, _ in batch:
+                    results.setdefault(doc_id, ExtractionResult(
+                        strategy_name=strategy.metadata.name,
+                        strategy_id=strategy.metadata.id,
+                        extracted_data={},
+                        execution_time=0.0,
+                        token_count=0,
+                        cost=0.0,
+                        error=str(e)
+                    ))
+            for result in results.values():
+                self._emit_result(run_id, result)
+            return results
+
+        batch_results = await asyncio.gather(*(
+            run_batch(strategy, batch)
+            for strategy in self.strategies
+            for batch in batches
+        ))
+
+        corpus_results: Dict[str, List[ExtractionResult]] = {key: [] for key in texts}
+        for results in batch_results:
+            for doc_id, result in results.items():
+                corpus_results[ids[doc_id]].append(result)
+
+        if self.events:
+            self.events.emit(EventType.RUN_COMPLETED, run_id, documents=len(texts),
+                             timed_out=sum(r.timed_out for rs in corpus_results.values() for r in rs))
+        return corpus_results
+
+    async def _run_paced(self, work, priority: Priority, deadline: Optional[float] = None):
+        """
+        Run work on the scheduler, request_delay after the previous dispatch.
+
+        The delay is waited out before a scheduler slot is taken, so it
+        neither holds a slot nor counts towards the expected run time the
+        scheduler sheds deadline work by.
+        """
+        now = time.monotonic()
+        wait = self._next_dispatch - now
+        self._next_dispatch = max(now, self._next_dispatch) + self.request_delay
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return await self.scheduler.run(work, priority, deadline)
+
+    def _emit_result(self, run_id: str, result: ExtractionResult) -> None:
+        if not self.events:
+            return
+        self.events.emit(
+            EventType.FAILED if result.error else EventType.COMPLETED,
+            run_id,
+            result.strategy_id,
+            strategy_name=result.strategy_name,
+            execution_time=result.execution_time,
+            cost=result.cost,
+            token_count=result.token_count,
+            error=result.error,
+            timed_out=result.timed_out,
+            result=result
+        )
+
     def create_comparison_report(
         self,
         document_name: str,
@@ -122,6 +471,12 @@ class ExtractionEngine:
         # TODO: Implement validation metrics
         validation_metrics = {}
 
+        consensus = ConsensusEngine.from_results(results)
+        consensus_summary = {
+            "record": consensus.consensus_record(),
+            "agreement": consensus.agreement_scores(),
+        }
+
         return ComparisonReport(
             document_name=document_name,
             total_strategies=len(results),
@@ -129,5 +484,7 @@ class ExtractionEngine:
             best_strategy=best_strategy,
             validation_metrics=validation_metrics,
             total_cost=total_cost,
-            total_time=total_time
+            total_time=total_time,
+            preprocessing=self.last_preprocessing,
+            consensus=consensus_summary
         )
@@ -0,0 +1,420 @@
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from ..utils.fields import flatten_fields
+
+# orjson (optional, compiled) parses the same documents as json, several times faster
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Start positions that failed to parse before the search gives up (bounds
+# the work on prose full of stray brackets)
+MAX_FAILED_CANDIDATES = 32
+
+_OPENING = re.compile(r"[{\[]")
+_TOKENS = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\]]', re.S)
+_JSON_STRING = re.compile(r'"(?:[^"\\\x00-\x1f]|\\["\\/bfnrt]|\\u[0-9a-fA-F]{4})*"')
+_NUMBER = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+_WORD = re.compile(r"[A-Za-z_$][\w$-]*")
+_WHITESPACE = re.compile(r"\s+")
+
+# Non-JSON literals models write (Python, JavaScript) and their JSON equivalents
+LITERALS = {
+    "true": "true", "false": "false", "null": "null",
+    "True": "true", "False": "false", "None": "null",
+    "NaN": "null", "Infinity": "null", "undefined": "null",
+}
+
+ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f"}
+
+
+def loads(text: str) -> Any:
+    """Strict JSON parse with the fastest available backend; raises ValueError."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _find_end(text: str, start: int) -> Tuple[int, bool]:
+    # End of the bracketed value starting at start, jumping between brackets
+    # and over whole double-quoted strings
+    depth = 0
+    for match in _TOKENS.finditer(text, start):
+        char = match.group()
+        if char == "{" or char == "[":
+            depth += 1
+        elif char == "}" or char == "]":
+            depth -= 1
+            if depth == 0:
+                return match.end(), True
+    return len(text), False
+
+
+def _read_string(text: str, start: int) -> Tuple[Optional[str], int]:
+    # JSON encoding of the string literal at start (either quote style), or
+    # None if the text ends inside it
+    quote = text[start]
+    if quote == '"':
+        match = _JSON_STRING.match(text, start)
+        if match:
+            return match.group(), match.end()
+    chars = []
+    pos = start + 1
+    while pos < len(text):
+        char = text[pos]
+        if char == quote:
+            return json.dumps("".join(chars), ensure_ascii=False), pos + 1
+        if char == "\\" and pos + 1 < len(text):
+            escaped = text[pos + 1]
+            if escaped == "u" and re.fullmatch(r"[0-9a-fA-F]{4}", text[pos + 2:pos + 6]):
+                chars.append(chr(int(text[pos + 2:pos + 6], 16)))
+                pos += 6
+                continue
+            # Unknown escapes such as "\d" keep their backslash
+            chars.append(ESCAPES.get(escaped, escaped if escaped in "\"'\\/" else "\\" + escaped))
+            pos += 2
+            continue
+        chars.append(char)
+        pos += 1
+    return None, pos
+
+
+def repair_json(text: str, start: int = 0) -> Tuple[str, int, bool]:
+    """
+    Rewrite the bracketed JSON-like value at text[start] as strict JSON.
+
+    Fixes what models commonly get wrong: comments, trailing or missing
+    commas, single-quoted strings, unquoted keys, Python/JavaScript literals,
+    raw control characters and bad escapes in strings. If the text ends
+    before the value closes (a truncated response), the incomplete tail is
+    dropped back to the last complete member and the open brackets are
+    closed, so truncation never invents a partial value.
+
+    Args:
+        text: Text containing the value
+        start: Index of its opening bracket
+
+    Returns:
+        Tuple of (repaired JSON, index after the value, whether it was complete)
+    """
+    out: List[str] = []
+    # Open containers: [closing bracket, expecting a key (objects only)]
+    stack: List[list] = []
+    safe_length = safe_depth = 0
+    pos = start
+    length = len(text)
+
+    def begin_value() -> None:
+        # Newline-separated members: insert the missing comma
+        if out and out[-1] not in ("{", "[", ",", ":"):
+            out.append(",")
+            if stack[-1][0] == "}":
+                stack[-1][1] = True
+
+    def mark_safe() -> None:
+        nonlocal safe_length, safe_depth
+        safe_length, safe_depth = len(out), len(stack)
+
+    while pos < length:
+        char = text[pos]
+        if char in " \t\r\n":
+            pos = _WHITESPACE.match(text, pos).end()
+        elif text.startswith("//", pos) or char == "#":
+            newline = text.find("\n", pos)
+            pos = length if newline < 0 else newline + 1
+        elif text.startswith("/*", pos):
+            close = text.find("*/", pos + 2)
+            pos = length if close < 0 else close + 2
+        elif char in "{[":
+            nested = bool(stack)
+            if nested:
+                begin_value()
+            out.append(char)
+            stack.append(["}" if char == "{" else "]", char == "{"])
+            # A nested container only becomes a safe point once it closes
+            if not nested:
+                mark_safe()
+            pos += 1
+        elif char in "}]":
+            if not stack:
+                break
+            if out[-1] == ",":
+                out.pop()
+            if out[-1] == ":":
+                # "key": with no value; drop the member
+                out.pop()
+                out.pop()
+                if out[-1] == ",":
+                    out.pop()
+            out.append(stack.pop()[0])
+            pos += 1
+            if not stack:
+                return "".join(out), pos, True
+            mark_safe()
+        elif char == ",":
+            if out[-1] not in ("{", "[", ","):
+                out.append(",")
+            if stack[-1][0] == "}":
+                stack[-1][1] = True
+            pos += 1
+        elif char == ":":
+            if stack[-1][0] == "}":
+                stack[-1][1] = False
+            out.append(":")
+            pos += 1
+        elif char in "\"'":
+            encoded, end = _read_string(text, pos)
+            if encoded is None:
+                break
+            begin_value()
+            is_key = stack[-1][1]
+            out.append(encoded)
+            pos = end
+            if not is_key:
+                mark_safe()
+        else:
+            match = _NUMBER.match(text, pos) or _WORD.match(text, pos)
+            if not match:
+                pos += 1
+                continue
+            if match.end() == length:
+                # Possibly cut off mid-token
+                break
+            token = match.group()
+            begin_value()
+            is_key = stack[-1][1]
+            if is_key:
+                out.append(json.dumps(token))
+            elif token[0].isalpha() or token[0] in "_$":
+                out.append(LITERALS.get(token) or json.dumps(token))
+                mark_safe()
+            else:
+                number = token.lstrip("+")
+                number = re.sub(r"^(-?)\.", r"\g<1>0.", number)
+                out.append(re.sub(r"\.(?=[eE]|$)", ".0", number))
+                mark_safe()
+            pos = match.end()
+
+    # Truncated: keep up to the last complete member and close what was open
+    repaired = out[:safe_length]
+    while repaired and repaired[-1] == ",":
+        repaired.pop()
+    closers = [closer for closer, _ in reversed(stack[:safe_depth])]
+    return "".join(repaired + closers), length, False
+
+
+def _size(value: Any) -> Tuple[bool, int]:
+    # Objects beat arrays (strategies return objects), then more fields win
+    return isinstance(value, dict), len(flatten_fields(value))
+
+
+def extract_json(text: str) -> Optional[Any]:
+    """
+    The best JSON value in an LLM response.
+
+    The response is scanned once for bracketed values, skipping prose and
+    code fences around them; each is parsed strictly first and repaired
+    (see repair_json) only if that fails. When several values are present,
+    the object with the most fields wins, the later one on ties.
+
+    Returns:
+        The parsed value, or None if the response contains none
+    """
+    # Fast paths: the whole response, or everything from the first to the
+    # last brace (code fences, prose without brackets), is a valid object.
+    # A whole-response array may hold a single object the second path finds
+    stripped = text.strip()
+    if stripped[:1] == "{":
+        try:
+            return loads(stripped)
+        except ValueError:
+            pass
+    first, last = text.find("{"), text.rfind("}")
+    if 0 < first < last:
+        try:
+            return loads(text[first:last + 1])
+        except ValueError:
+            pass
+
+    candidates = []
+    failures = 0
+    pos = 0
+    while failures < MAX_FAILED_CANDIDATES:
+        match = _OPENING.search(text, pos)
+        if not match:
+            break
+        start = match.start()
+        end, complete = _find_end(text, start)
+        value = None
+        if complete:
+            try:
+                value = loads(text[start:end])
+            except ValueError:
+                pass
+        if value is None:
+            repaired, end, complete = repair_json(text, start)
+            try:
+                value = loads(repaired)
+            except ValueError:
+                failures += 1
+                pos = start + 1
+                continue
+            if not complete and candidates:
+                # A truncated value only wins if nothing complete was found
+                break
+        candidates.append(value)
+        pos = end
+    if len(candidates) > 1:
+        # Later values win ties: models put examples before the answer
+        return max(reversed(candidates), key=_size)
+    return candidates[0] if candidates else None
+
+
+def extract_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """
+    The best JSON object in an LLM response (see extract_json).
+
+    A top-level array is unwrapped to its object element, or to the one
+    with the most fields if there are several.
+
+    Returns:
+        The parsed object, or None if the response contains none
+    """
+    value = extract_json(text)
+    if isinstance(value, list):
+        objects = [item for item in value if isinstance(item, dict)]
+        value = max(reversed(objects), key=_size) if objects else None
+    return value if isinstance(value, dict) else None
+
+
+def _parse_value(text: str) -> Tuple[bool, Any]:
+    # (parsed, value) for one complete member value
+    text = text.strip()
+    try:
+        return True, loads(text)
+    except ValueError:
+        pass
+    if text in LITERALS:
+        return True, loads(LITERALS[text])
+    if text[:1] in ("{", "["):
+        repaired, _, complete = repair_json(text)
+        if complete:
+            try:
+                return True, loads(repaired)
+            except ValueError:
+                pass
+    return False, None
+
+
+class IncrementalJSONParser:
+    """
+    Parses a streamed JSON object chunk by chunk, surfacing each top-level
+    field as soon as its value is complete.
+
+    Each call to feed scans only the new text, so parsing a whole response
+    costs one pass however it is chunked. Text before the first brace (prose,
+    a code fence) is skipped. Values are parsed when they close: strings at
+    their closing quote, objects and arrays at their closing bracket, numbers
+    and literals at the following comma or brace.
+
+    Attributes:
+        text: Everything fed so far
+        fields: Top-level fields completed so far, in order
+        complete: Whether the root object has closed
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.fields: Dict[str, Any] = {}
+        self.complete = False
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        # Position in the root object: "key", "colon", "value" or "comma"
+        self._expect = "key"
+        self._key: Optional[str] = None
+        self._token_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> Dict[str, Any]:
+        """
+        Add streamed text.
+
+        Returns:
+            Fields completed by this chunk
+        """
+        self.text += chunk
+        completed: Dict[str, Any] = {}
+        text = self.text
+        pos = self._pos
+        while pos < len(text) and not self.complete:
+            char = text[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._end_string(text[self._token_start:pos + 1], completed)
+                pos += 1
+                continue
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                pos += 1
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1:
+                    self._token_start = pos
+            elif char in "{[":
+                if self._depth == 1 and self._expect == "value":
+                    self._token_start = pos
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 1 and self._expect == "value":
+                    self._complete_value(text[self._token_start:pos + 1], completed)
+                elif self._depth == 0:
+                    self._end_bare_value(text, pos, completed)
+                    self.complete = True
+            elif self._depth == 1:
+                if char == ":":
+                    self._expect = "value"
+                    self._token_start = None
+                elif char == ",":
+                    self._end_bare_value(text, pos, completed)
+                    self._expect = "key"
+                elif self._expect == "value" and self._token_start is None and not char.isspace():
+                    # Start of a number or literal
+                    self._token_start = pos
+            pos += 1
+        self._pos = pos
+        return completed
+
+    def _end_string(self, token: str, completed: Dict[str, Any]) -> None:
+        if self._expect == "key":
+            try:
+                self._key = loads(token)
+            except ValueError:
+                self._key = token[1:-1]
+            self._expect = "colon"
+        elif self._expect == "value":
+            self._complete_value(token, completed)
+
+    def _end_bare_value(self, text: str, end: int, completed: Dict[str, Any]) -> None:
+        if self._expect == "value" and self._token_start is not None:
+            self._complete_value(text[self._token_start:end], completed)
+
+    def _complete_value(self, token: str, completed: Dict[str, Any]) -> None:
+        parsed, value = _parse_value(token)
+        if parsed and self._key is not None:
+            self.fields[self._key] = completed[self._key] = value
+        self._expect = "comma"
+        self._token_start = None
@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, Optional
 from enum import Enum
+import json
 import os
 from dotenv import load_dotenv
+from .events import EventType, emit
 
 
 class LLMProvider(str, Enum):
@@ -11,9 +13,15 @@ class LLMProvider(str, Enum):
     OPENROUTER = "openrouter"
 
 
+# Default per-call timeout in seconds for provider requests
+DEFAULT_TIMEOUT = 60.0
+
+
 class BaseLLMClient(ABC):
     """Base class for LLM provider clients."""
 
+    timeout: float = DEFAULT_TIMEOUT
+
     @abstractmethod
     async def generate(
         self,
@@ -34,23 +42,56 @@ class BaseLLMClient(ABC):
         """
         pass
 
+    async def stream(
+        self,
+        prompt: str,
+        max_tokens: int = 4096,
+        temperature: float = 0.0
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Generate a response as it is produced.
+
+        Yields chunks {"text": str} with the next piece of the response; the
+        last chunk also carries input_tokens, output_tokens and total_tokens
+        when the provider reports them. Closing the iterator early aborts the
+        request. Providers without streaming yield the whole response at once.
+        """
+        yield await self.generate(prompt, max_tokens, temperature)
+
     @abstractmethod
     def calculate_cost(self, input_tokens: int, output_tokens: int) -> float:
         """Calculate cost based on token usage."""
         pass
 
 
+def usage_chunk(input_tokens: int, output_tokens: int) -> Dict[str, Any]:
+    """Final stream chunk carrying token counts."""
+    return {
+        "text": "",
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": input_tokens + output_tokens
+    }
+
+
 class AnthropicClient(BaseLLMClient):
     """Anthropic Claude client."""
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "claude-3-5-sonnet-20241022"):
-        from anthropic import Anthropic
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "claude-3-5-sonnet-20241022",
+        timeout: float = DEFAULT_TIMEOUT
+    ):
+        from anthropic import AsyncAnthropic
         self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
         if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY not found")
 
-        self.client = Anthropic(api_key=self.api_key)
+        # Async client so task cancellation aborts the in-flight request
+        self.client = AsyncAnthropic(api_key=self.api_key, timeout=timeout)
         self.model = model
+        self.timeout = timeout
 
     async def generate(
         self,
@@ -58,7 +99,7 @@ class AnthropicClient(BaseLLMClient):
         max_tokens: int = 4096,
         temperature: float = 0.0
     ) -> Dict[str, Any]:
-        response = self.client.messages.create(
+        response = await self.client.messages.create(
             model=self.model,
             max_tokens=max_tokens,
             temperature=temperature,
@@ -72,6 +113,23 @@ class AnthropicClient(BaseLLMClient):
             "total_tokens": response.usage.input_tokens + response.usage.output_tokens
         }
 
+    async def stream(
+        self,
+        prompt: str,
+        max_tokens: int = 4096,
+        temperature: float = 0.0
+    ) -> AsyncIterator[Dict[str, Any]]:
+        async with self.client.messages.stream(
+            model=self.model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            messages=[{"role": "user", "content": prompt}]
+        ) as stream:
+            async for text in stream.text_stream:
+                yield {"text": text}
+            message = await stream.get_final_message()
+        yield usage_chunk(message.usage.input_tokens, message.usage.output_tokens)
+
     def calculate_cost(self, input_tokens: int, output_tokens: int) -> float:
         # Claude 3.5 Sonnet pricing (as of 2024)
         return (input_tokens * 0.003 / 1000) + (output_tokens * 0.015 / 1000)
@@ -80,7 +138,12 @@ class AnthropicClient(BaseLLMClient):
 class GeminiClient(BaseLLMClient):
     """Google Gemini client."""
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "gemini-2.0-flash-exp"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "gemini-2.0-flash-exp",
+        timeout: float = DEFAULT_TIMEOUT
+    ):
         import google.generativeai as genai
 
         self.api_key = api_key or os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
@@ -90,6 +153,7 @@ class GeminiClient(BaseLLMClient):
         genai.configure(api_key=self.api_key)
         self.model = genai.GenerativeModel(model)
         self.model_name = model
+        self.timeout = timeout
 
     async def generate(
         self,
@@ -102,14 +166,21 @@ class GeminiClient(BaseLLMClient):
             "temperature": temperature,
         }
 
-        response = self.model.generate_content(
+        # Async call so task cancellation aborts the in-flight request
+        response = await self.model.generate_content_async(
             prompt,
-            generation_config=generation_config
+            generation_config=generation_config,
+            request_options={"timeout": self.timeout}
         )
 
-        # Gemini token counting
-        input_tokens = self.model.count_tokens(prompt).total_tokens
-        output_tokens = self.model.count_tokens(response.text).total_tokens
+        # Gemini token counting (usage metadata avoids two extra round trips)
+        usage = getattr(response, "usage_metadata", None)
+        if usage and usage.prompt_token_count:
+            input_tokens = usage.prompt_token_count
+            output_tokens = usage.candidates_token_count or 0
+        else:
+            input_tokens = (await self.model.count_tokens_async(prompt)).total_tokens
+            output_tokens = (await self.model.count_tokens_async(response.text)).total_tokens
 
         return {
             "text": response.text,
@@ -118,6 +189,29 @@ class GeminiClient(BaseLLMClient):
             "total_tokens": input_tokens + output_tokens
         }
 
+    async def stream(
+        self,
+        prompt: str,
+        max_tokens: int = 4096,
+        temperature: float = 0.0
+    ) -> AsyncIterator[Dict[str, Any]]:
+        response = await self.model.generate_content_async(
+            prompt,
+            generation_config={"max_output_tokens": max_tokens, "temperature": temperature},
+            request_options={"timeout": self.timeout},
+            stream=True
+        )
+        async for chunk in response:
+            try:
+                yield {"text": chunk.text}
+            except ValueError:
+                # Chunks without text parts (e.g. the finish reason)
+                continue
+
+        usage = getattr(response, "usage_metadata", None)
+        if usage and usage.prompt_token_count:
+            yield usage_chunk(usage.prompt_token_count, usage.candidates_token_count or 0)
+
     def calculate_cost(self, input_tokens: int, output_tokens: int) -> float:
         # Gemini 2.0 Flash pricing (as of 2024)
         # Free tier: up to 1500 requests per day
@@ -128,7 +222,12 @@ class GeminiClient(BaseLLMClient):
 class OpenRouterClient(BaseLLMClient):
     """OpenRouter client - supports ANY model!"""
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "google/gemini-2.5-flash"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "google/gemini-2.5-flash",
+        timeout: float = DEFAULT_TIMEOUT
+    ):
         import httpx
 
         self.api_key = api_key or os.getenv("OPENROUTER_API_KEY")
@@ -137,12 +236,21 @@ class OpenRouterClient(BaseLLMClient):
 
         self.model = model
         self.base_url = "https://openrouter.ai/api/v1"
-        self.client = httpx.AsyncClient(timeout=60.0)
+        self.timeout = timeout
+        self.client = httpx.AsyncClient(timeout=timeout)
 
     async def close(self):
         """Close the HTTP client."""
         await self.client.aclose()
 
+    def _headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": os.getenv("SITE_URL", "https://github.com/ai-prompt-generator"),
+            "X-Title": "AI Prompt Generator"
+        }
+
     async def generate(
         self,
         prompt: str,
@@ -151,12 +259,7 @@ class OpenRouterClient(BaseLLMClient):
     ) -> Dict[str, Any]:
         import asyncio
 
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": os.getenv("SITE_URL", "https://github.com/ai-prompt-generator"),
-            "X-Title": "AI Prompt Generator"
-        }
+        headers = self._headers()
 
         data = {
             "model": self.model,
@@ -175,7 +278,7 @@ class OpenRouterClient(BaseLLMClient):
                     f"{self.base_url}/chat/completions",
                     json=data,
                     headers=headers,
-                    timeout=30.0
+                    timeout=self.timeout
                 )
 
                 # Check for HTTP errors
@@ -190,7 +293,7 @@ class OpenRouterClient(BaseLLMClient):
                     # Check if it's a rate limit error
                     if response.status_code == 429 and attempt < max_retries - 1:
                         delay = base_delay * (2 ** attempt)
-                        print(f"  ⏳ Rate limited, retrying in {delay}s...")
+                        emit(EventType.RETRIED, attempt=attempt + 1, delay=delay, reason="rate_limited")
                         await asyncio.sleep(delay)
                         continue
 
@@ -214,13 +317,68 @@ class OpenRouterClient(BaseLLMClient):
             except Exception as e:
                 if attempt < max_retries - 1 and "429" in str(e):
                     delay = base_delay * (2 ** attempt)
-                    print(f"  ⏳ Rate limited, retrying in {delay}s...")
+                    emit(EventType.RETRIED, attempt=attempt + 1, delay=delay, reason="rate_limited")
                     await asyncio.sleep(delay)
                 else:
                     # Add debugging info
                     error_msg = f"OpenRouter API error: {str(e)}\nModel: {self.model}\nURL: {self.base_url}/chat/completions"
                     raise Exception(error_msg) from e
 
+    async def stream(
+        self,
+        prompt: str,
+        max_tokens: int = 4096,
+        temperature: float = 0.0
+    ) -> AsyncIterator[Dict[str, Any]]:
+        import asyncio
+
+        data = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "stream": True,
+            "stream_options": {"include_usage": True}
+        }
+
+        # Retry rate limits until the first byte; after that the response is committed
+        max_retries = 3
+        base_delay = 2.0
+
+        for attempt in range(max_retries):
+            async with self.client.stream(
+                "POST",
+                f"{self.base_url}/chat/completions",
+                json=data,
+                headers=self._headers(),
+                timeout=self.timeout
+            ) as response:
+                if response.status_code == 429 and attempt < max_retries - 1:
+                    delay = base_delay * (2 ** attempt)
+                    emit(EventType.RETRIED, attempt=attempt + 1, delay=delay, reason="rate_limited")
+                    await asyncio.sleep(delay)
+                    continue
+                if response.status_code != 200:
+                    body = (await response.aread()).decode("utf-8", errors="replace")
+                    raise Exception(f"OpenRouter API error: HTTP {response.status_code}: {body}")
+
+                # Server-sent events; lines starting with ":" are keep-alive comments
+                async for line in response.aiter_lines():
+                    if not line.startswith("data: "):
+                        continue
+                    payload = line[len("data: "):]
+                    if payload == "[DONE]":
+                        break
+                    event = json.loads(payload)
+                    choices = event.get("choices") or [{}]
+                    text = (choices[0].get("delta") or {}).get("content") or ""
+                    usage = event.get("usage")
+                    if usage:
+                        yield {**usage_chunk(usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)), "text": text}
+                    elif text:
+                        yield {"text": text}
+                return
+
     def calculate_cost(self, input_tokens: int, output_tokens: int) -> float:
         # OpenRouter shows real-time pricing per model
         # Many models are FREE or very cheap!
@@ -236,7 +394,8 @@ class OpenRouterClient(BaseLLMClient):
 def create_llm_client(
     provider: LLMProvider = LLMProvider.GEMINI,
     api_key: Optional[str] = None,
-    model: Optional[str] = None
+    model: Optional[str] = None,
+    timeout: float = DEFAULT_TIMEOUT
 ) -> BaseLLMClient:
     """
     Factory function to create LLM client.
@@ -245,6 +404,7 @@ def create_llm_client(
         provider: LLM provider to use
         api_key: Optional API key (otherwise from env)
         model: Optional model name
+        timeout: Per-call request timeout in seconds
 
     Returns:
         LLM client instance
@@ -253,13 +413,13 @@ def create_llm_client(
 
     if provider == LLMProvider.ANTHROPIC:
         default_model = "claude-3-5-sonnet-20241022"
-        return AnthropicClient(api_key, model or default_model)
+        return AnthropicClient(api_key, model or default_model, timeout)
     elif provider == LLMProvider.GEMINI:
         default_model = "gemini-2.0-flash-exp"
-        return GeminiClient(api_key, model or default_model)
+        return GeminiClient(api_key, model or default_model, timeout)
     elif provider == LLMProvider.OPENROUTER:
         # Default to Gemini 2.5 Flash via OpenRouter
         default_model = os.getenv("OPENROUTER_MODEL", "google/gemini-2.5-flash")
-        return OpenRouterClient(api_key, model or default_model)
+        return OpenRouterClient(api_key, model or default_model, timeout)
     else:
         raise ValueError(f"Unsupported provider: {provider}")
@@ -1,3 +1,5 @@
+import csv
+import io
 from typing import Optional, Dict, Any, List
 from pydantic import BaseModel, Field, computed_field
 from datetime import datetime
@@ -11,6 +13,47 @@ class DocumentType(str, Enum):
     DOCX = "docx"
 
 
+class ExtractedTable(BaseModel):
+    """A table found in a document, as header plus data rows."""
+    page: Optional[int] = None
+    header: List[str] = Field(default_factory=list)
+    rows: List[List[str]] = Field(default_factory=list)
+
+    def to_csv(self) -> str:
+        """Compact comma-separated form: the header once, then one line per row."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        if self.header:
+            writer.writerow(self.header)
+        writer.writerows(self.rows)
+        return buffer.getvalue().rstrip("\n")
+
+
+class LoadedDocument(BaseModel):
+    """Text and structure of a loaded document."""
+    text: str
+    doc_type: DocumentType
+    pages: int = 1
+    tables: List[ExtractedTable] = Field(default_factory=list)
+
+
+class SchemaCheck(BaseModel):
+    """How well extracted data conforms to the requested schema."""
+    # Schema fields absent or null, by path ("bill_to.name")
+    missing_fields: List[str] = Field(default_factory=list)
+    # Extracted fields the schema does not define
+    extra_fields: List[str] = Field(default_factory=list)
+    # Fields whose value could not be coerced to the schema type, with the reason
+    invalid_fields: Dict[str, str] = Field(default_factory=dict)
+    completeness: float = 0.0
+
+    @computed_field
+    @property
+    def valid(self) -> bool:
+        """Whether every schema field is present and of the right type."""
+        return not self.missing_fields and not self.invalid_fields
+
+
 class ExtractionResult(BaseModel):
     """Result from a single extraction strategy."""
     strategy_name: str
@@ -21,6 +64,17 @@ class ExtractionResult(BaseModel):
     token_count: int
     cost: float
     error: Optional[str] = None
+    timed_out: bool = False
+    # Streamed generation was stopped once every schema field was complete
+    stopped_early: bool = False
+    # Set when extracted against a schema (see schema_validator)
+    schema_check: Optional[SchemaCheck] = None
+    # A targeted repair call followed the extraction; its share of the
+    # (already included) time, tokens and cost
+    repaired: bool = False
+    repair_time: float = 0.0
+    repair_tokens: int = 0
+    repair_cost: float = 0.0
     timestamp: datetime = Field(default_factory=datetime.now)
 
     @computed_field
@@ -42,6 +96,8 @@ class ValidationMetrics(BaseModel):
     completeness: float
     consistency: float
     field_match_rate: Dict[str, float]
+    # Ground-truth fields the extraction did not contain
+    missing_fields: List[str] = []
 
 
 class ComparisonReport(BaseModel):
@@ -53,6 +109,9 @@ class ComparisonReport(BaseModel):
     validation_metrics: Dict[str, ValidationMetrics]
     total_cost: float
     total_time: float
+    preprocessing: Dict[str, Any] = Field(default_factory=dict)
+    # Cross-strategy consensus record and per-strategy agreement
+    consensus: Dict[str, Any] = Field(default_factory=dict)
     timestamp: datetime = Field(default_factory=datetime.now)
 
     @computed_field
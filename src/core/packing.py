@@ -0,0 +1,178 @@
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from .base_strategy import BaseExtractionStrategy
+from .models import ExtractionResult
+from .schema_validator import validate_result
+from ..utils.tokens import estimate_tokens
+
+
+PACKING_INSTRUCTIONS = """
+
+IMPORTANT: The input above contains {count} separate documents, each wrapped in
+<document id="..."> tags. Extract data from each document independently.
+Return a single JSON object whose keys are the document ids ({ids}) and whose
+values are the extracted data for that document."""
+
+
+def pack_documents(
+    documents: List[Tuple[str, str]],
+    token_budget: int,
+    max_documents: int = 10
+) -> List[List[Tuple[str, str]]]:
+    """
+    Group small documents into batches that fit a token budget.
+
+    Documents are packed greedily in order; a document larger than the budget
+    gets a batch of its own.
+
+    Args:
+        documents: (document_id, text) pairs
+        token_budget: Maximum estimated input tokens of document text per batch
+        max_documents: Maximum documents per batch
+
+    Returns:
+        List of batches of (document_id, text) pairs
+    """
+    batches: List[List[Tuple[str, str]]] = []
+    current: List[Tuple[str, str]] = []
+    current_tokens = 0
+    for document_id, text in documents:
+        tokens = estimate_tokens(text)
+        if current and (current_tokens + tokens > token_budget or len(current) >= max_documents):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append((document_id, text))
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def build_packed_text(batch: List[Tuple[str, str]]) -> str:
+    """Concatenate documents with delimiting id tags."""
+    return "\n\n".join(f'<document id="{document_id}">\n{text}\n</document>' for document_id, text in batch)
+
+
+def split_packed_response(data: Dict[str, Any], document_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Pull per-document data out of a keyed response.
+
+    Accepts the data either at the top level or under a single wrapper key
+    (e.g. {"documents": {...}}). Documents missing from the response, or
+    whose value is not an object, are left out.
+    """
+    if not any(document_id in data for document_id in document_ids) and len(data) == 1:
+        wrapped = next(iter(data.values()))
+        if isinstance(wrapped, dict):
+            data = wrapped
+    return {
+        document_id: data[document_id]
+        for document_id in document_ids
+        if isinstance(data.get(document_id), dict)
+    }
+
+
+async def extract_packed(
+    strategy: BaseExtractionStrategy,
+    batch: List[Tuple[str, str]],
+    schema: Optional[Dict[str, Any]] = None,
+    max_tokens: int = 4096,
+    temperature: float = 0.0,
+    timeout: Optional[float] = None
+) -> Dict[str, ExtractionResult]:
+    """
+    Run one strategy over a batch of documents in a single LLM call.
+
+    Token usage and cost are apportioned to documents by their share of the
+    input text and of the output JSON. Documents the response does not cover
+    (or every document, if the call fails or its output does not parse) get
+    a failed result that still carries their share of the call's usage, so
+    callers can fall back to single-document calls for them and charge the
+    wasted share to the fallback (see add_usage).
+
+    Returns:
+        Mapping of every document_id to its extraction result
+    """
+    document_ids = [document_id for document_id, _ in batch]
+    start_time = time.time()
+    prompt = strategy.build_prompt(build_packed_text(batch), schema) + PACKING_INSTRUCTIONS.format(
+        count=len(batch), ids=", ".join(document_ids)
+    )
+
+    try:
+        response = await asyncio.wait_for(
+            strategy.client.generate(prompt=prompt, max_tokens=max_tokens, temperature=temperature),
+            timeout
+        )
+    except Exception as e:
+        # No usage is reported for a failed call; its time is still spent
+        execution_time = time.time() - start_time
+        error = f"Packed call failed: {e or type(e).__name__}"
+        return {
+            document_id: ExtractionResult(
+                strategy_name=strategy.metadata.name,
+                strategy_id=strategy.metadata.id,
+                extracted_data={},
+                execution_time=execution_time,
+                token_count=0,
+                cost=0.0,
+                error=error,
+                timed_out=isinstance(e, asyncio.TimeoutError)
+            )
+            for document_id in document_ids
+        }
+    execution_time = time.time() - start_time
+
+    per_document = split_packed_response(strategy.parse_response(response["text"]), document_ids)
+
+    text_sizes = [len(text) for _, text in batch]
+    input_shares = _apportion(response["input_tokens"], text_sizes)
+    # Output tokens go to the documents the output covers; if it covers none,
+    # they are split like the input
+    if per_document:
+        output_sizes = [len(json.dumps(per_document[d])) if d in per_document else 0 for d in document_ids]
+    else:
+        output_sizes = text_sizes
+    output_shares = _apportion(response["output_tokens"], output_sizes)
+
+    results = {}
+    for document_id, input_tokens, output_tokens in zip(document_ids, input_shares, output_shares):
+        covered = document_id in per_document
+        results[document_id] = validate_result(ExtractionResult(
+            strategy_name=strategy.metadata.name,
+            strategy_id=strategy.metadata.id,
+            extracted_data=per_document.get(document_id, {}),
+            execution_time=execution_time,
+            token_count=input_tokens + output_tokens,
+            cost=strategy.client.calculate_cost(input_tokens, output_tokens),
+            error=None if covered else "Not covered by the packed response"
+        ), schema)
+    return results
+
+
+def _apportion(total: int, weights: List[int]) -> List[int]:
+    # Integer shares of total proportional to weights that add up to total
+    if not any(weights):
+        weights = [1] * len(weights)
+    weight_sum = sum(weights)
+    shares = []
+    cumulative = allotted = 0
+    for weight in weights:
+        cumulative += weight
+        share = round(total * cumulative / weight_sum) - allotted
+        shares.append(share)
+        allotted += share
+    return shares
+
+
+def add_usage(result: ExtractionResult, spent: Optional[ExtractionResult]) -> ExtractionResult:
+    """Charge the time, tokens and cost of an earlier failed attempt to a result."""
+    if spent is None:
+        return result
+    return result.model_copy(update={
+        "execution_time": result.execution_time + spent.execution_time,
+        "token_count": result.token_count + spent.token_count,
+        "cost": result.cost + spent.cost,
+    })
@@ -0,0 +1,91 @@
+import re
+from typing import Any, Dict, List, Optional
+from .models import ExtractionResult
+from .result_merger import is_empty
+from .schema_validator import compile_schema
+from ..utils.section_index import select_relevant_sections
+
+# Excerpts sent when asking for missing fields: at most this many sections
+# within this many tokens (the whole document if it is smaller)
+REPAIR_TOP_K = 4
+REPAIR_TOKEN_BUDGET = 800
+
+REPAIR_JSON_PROMPT = """The following output was meant to be a single JSON object but could not be parsed.{fields}
+
+Output:
+{output}
+
+Rewrite it as valid JSON. Return ONLY the JSON object."""
+
+REPAIR_FIELDS_PROMPT = """Extract only the following fields from these document excerpts:
+{fields}
+
+Excerpts:
+{excerpts}
+
+Return ONLY a JSON object with exactly these fields. If a field cannot be found, use null."""
+
+_PATH_ROOT = re.compile(r"[.\[]")
+
+
+def missing_fields(result: ExtractionResult) -> List[str]:
+    """Top-level schema fields with something missing ("bill_to" for "bill_to.city")."""
+    if result.schema_check is None:
+        return []
+    return list(dict.fromkeys(_PATH_ROOT.split(path, 1)[0] for path in result.schema_check.missing_fields))
+
+
+def unparsed(result: ExtractionResult) -> bool:
+    """Whether the response held no JSON (see BaseExtractionStrategy.parse_response)."""
+    return list(result.extracted_data) == ["raw_response"]
+
+
+def needs_repair(result: ExtractionResult) -> bool:
+    """Whether a successful result failed to parse or misses schema fields."""
+    return not result.error and (unparsed(result) or bool(missing_fields(result)))
+
+
+def build_repair_prompt(
+    result: ExtractionResult,
+    document_text: str,
+    schema: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Prompt for a targeted repair call.
+
+    An unparsable response is sent back on its own to be rewritten as JSON.
+    Otherwise only the missing fields are requested, from the document
+    sections most relevant to them (BM25, as in relevance pruning), so a
+    repair costs a fraction of a full extraction.
+    """
+    # Field name -> description (a simple schema's type name, or JSON Schema "description")
+    fields = compile_schema(schema or {}).descriptions
+    if unparsed(result):
+        listed = f"\nIt should contain these fields: {', '.join(fields)}" if fields else ""
+        return REPAIR_JSON_PROMPT.format(fields=listed, output=result.extracted_data["raw_response"])
+
+    wanted = {field: fields.get(field) for field in missing_fields(result)}
+    excerpts, _ = select_relevant_sections(document_text, wanted, REPAIR_TOP_K, REPAIR_TOKEN_BUDGET)
+    lines = "\n".join(
+        f"- {field}: {description}" if description else f"- {field}"
+        for field, description in wanted.items()
+    )
+    return REPAIR_FIELDS_PROMPT.format(fields=lines, excerpts=excerpts)
+
+
+def merge_repair(original: Any, repaired: Any) -> Any:
+    """
+    Fill the gaps in original data with repaired values.
+
+    Values the original already has are kept; nested objects are filled key
+    by key. Keys are expected in their schema spelling (see schema_validator).
+    """
+    if is_empty(original):
+        return repaired
+    if isinstance(original, dict) and isinstance(repaired, dict):
+        merged = dict(original)
+        for key, value in repaired.items():
+            if not is_empty(value):
+                merged[key] = merge_repair(original.get(key), value)
+        return merged
+    return original
@@ -0,0 +1,95 @@
+import json
+from typing import Any, Dict, List, Optional
+from .models import ExtractionResult
+
+
+def is_empty(value: Any) -> bool:
+    """Whether an extracted value carries no information."""
+    return value is None or value == "" or value == [] or value == {}
+
+
+def _vote_key(value: Any) -> str:
+    if isinstance(value, str):
+        return " ".join(value.lower().split())
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def merge_values(values: List[Any]) -> Any:
+    """
+    Resolve one field seen in several chunks.
+
+    Dicts merge recursively, lists are concatenated without duplicates, and
+    scalars are decided by majority vote on their normalized form (ties go to
+    the earliest chunk, which is usually where a field is first defined).
+    """
+    values = [v for v in values if not is_empty(v)]
+    if not values:
+        return None
+    if all(isinstance(v, dict) for v in values):
+        return merge_extracted_data(values)
+    if all(isinstance(v, list) for v in values):
+        merged, seen = [], set()
+        for items in values:
+            for item in items:
+                key = _vote_key(item)
+                if key not in seen:
+                    seen.add(key)
+                    merged.append(item)
+        return merged
+
+    votes: Dict[str, int] = {}
+    first: Dict[str, Any] = {}
+    for value in values:
+        key = _vote_key(value)
+        votes[key] = votes.get(key, 0) + 1
+        first.setdefault(key, value)
+    # max() keeps the first key on ties, and dicts preserve insertion order
+    return first[max(votes, key=votes.get)]
+
+
+def merge_extracted_data(partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge per-chunk extracted data field by field, keeping first-seen key order."""
+    keys: List[str] = []
+    for partial in partials:
+        for key in partial:
+            if key not in keys:
+                keys.append(key)
+
+    merged = {}
+    for key in keys:
+        value = merge_values([p[key] for p in partials if key in p])
+        if value is not None:
+            merged[key] = value
+    return merged
+
+
+def merge_chunk_results(
+    partials: List[ExtractionResult],
+    execution_time: Optional[float] = None
+) -> ExtractionResult:
+    """
+    Combine the results of one strategy run over several chunks.
+
+    Tokens and cost are summed. The merged result only fails if every chunk
+    failed; failed chunks are otherwise dropped from the merge.
+    """
+    succeeded = [r for r in partials if not r.error]
+    first = partials[0]
+
+    if succeeded:
+        error = None
+        data = merge_extracted_data([r.extracted_data for r in succeeded])
+    else:
+        error = first.error
+        data = {}
+
+    return ExtractionResult(
+        strategy_name=first.strategy_name,
+        strategy_id=first.strategy_id,
+        extracted_data=data,
+        execution_time=execution_time if execution_time is not None else max(r.execution_time for r in partials),
+        token_count=sum(r.token_count for r in partials),
+        cost=sum(r.cost for r in partials),
+        error=error,
+        timed_out=not succeeded and any(r.timed_out for r in partials)
+    )
@@ -0,0 +1,159 @@
+import asyncio
+import heapq
+import itertools
+import time
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class Priority(IntEnum):
+    """Priority classes for extraction work. Lower values dispatch first."""
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+class DeadlineExceeded(Exception):
+    """Raised when work is shed because it can no longer meet its deadline."""
+
+
+class ExtractionScheduler:
+    """
+    Dispatches extraction work items to a fixed number of slots.
+
+    Waiting items are ordered by priority class first and earliest deadline
+    second, so interactive calls overtake queued batch work. Items whose
+    deadline can no longer be met (given the observed average run time) are
+    shed with DeadlineExceeded instead of occupying a slot.
+    """
+
+    def __init__(self, max_concurrent: int = 5, runtime_smoothing: float = 0.2):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self.max_concurrent = max_concurrent
+        self.runtime_smoothing = runtime_smoothing
+        self._active = 0
+        self._waiting: List[Tuple[int, float, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self._avg_runtime: Dict[Priority, float] = {}
+        self.stats: Dict[str, int] = {"dispatched": 0, "shed": 0}
+
+    @property
+    def active(self) -> int:
+        """Number of work items currently holding a slot."""
+        return self._active
+
+    @property
+    def queued(self) -> int:
+        """Number of work items waiting for a slot."""
+        return sum(1 for *_, waiter in self._waiting if not waiter.done())
+
+    def expected_runtime(self, priority: Priority) -> float:
+        """Smoothed run time observed for a priority class (0 if unknown)."""
+        return self._avg_runtime.get(priority, 0.0)
+
+    async def run(
+        self,
+        work: Callable[[], Awaitable[T]],
+        priority: Priority = Priority.BATCH,
+        deadline: Optional[float] = None
+    ) -> T:
+        """
+        Run a work item once a slot is available.
+
+        Args:
+            work: Zero-argument callable returning the awaitable to run
+            priority: Priority class of the work item
+            deadline: Absolute time.monotonic() deadline, or None for no deadline
+
+        Returns:
+            Result of the work item
+
+        Raises:
+            DeadlineExceeded: If the item was shed before dispatch
+        """
+        await self._acquire(priority, deadline)
+        start_time = time.monotonic()
+        try:
+            return await work()
+        finally:
+            self._record_runtime(priority, time.monotonic() - start_time)
+            self._release()
+
+    async def _acquire(self, priority: Priority, deadline: Optional[float]) -> None:
+        if self._cannot_meet(priority, deadline):
+            self.stats["shed"] += 1
+            raise DeadlineExceeded("Deadline cannot be met, work shed before dispatch")
+
+        if self._active < self.max_concurrent and not self.queued:
+            self._active += 1
+            self.stats["dispatched"] += 1
+            return
+
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        sort_deadline = deadline if deadline is not None else float("inf")
+        heapq.heappush(self._waiting, (int(priority), sort_deadline, next(self._counter), waiter))
+
+        timeout = None
+        if deadline is not None:
+            timeout = max(0.0, deadline - self.expected_runtime(priority) - time.monotonic())
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout)
+        except DeadlineExceeded:
+            self.stats["shed"] += 1
+            raise
+        except asyncio.TimeoutError:
+            self._abandon(waiter)
+            self.stats["shed"] += 1
+            raise DeadlineExceeded("Deadline expired while queued, work shed") from None
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+
+    def _abandon(self, waiter: asyncio.Future) -> None:
+        """Withdraw a waiter, returning its slot if one was already granted."""
+        if not waiter.done():
+            waiter.cancel()
+        elif not waiter.cancelled() and waiter.exception() is None:
+            self._release()
+
+    def _release(self) -> None:
+        self._active -= 1
+        while self._waiting and self._active < self.max_concurrent:
+            priority, deadline, _, waiter = heapq.heappop(self._waiting)
+            if waiter.done():
+                continue
+            if self._cannot_meet(Priority(priority), deadline):
+                waiter.set_exception(
+                    DeadlineExceeded("Deadline cannot be met, work shed before dispatch")
+                )
+                continue
+            self._active += 1
+            self.stats["dispatched"] += 1
+            waiter.set_result(None)
+
+    def _cannot_meet(self, priority: Priority, deadline: Optional[float]) -> bool:
+        if deadline is None or deadline == float("inf"):
+            return False
+        return time.monotonic() + self.expected_runtime(priority) > deadline
+
+    def _record_runtime(self, priority: Priority, runtime: float) -> None:
+        previous = self._avg_runtime.get(priority)
+        if previous is None:
+            self._avg_runtime[priority] = runtime
+        else:
+            alpha = self.runtime_smoothing
+            self._avg_runtime[priority] = alpha * runtime + (1 - alpha) * previous
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current scheduler state for health and metrics endpoints."""
+        return {
+            "max_concurrent": self.max_concurrent,
+            "active": self.active,
+            "queued": self.queued,
+            "expected_runtime": {p.name.lower(): round(t, 3) for p, t in self._avg_runtime.items()},
+            **self.stats,
+        }
@@ -0,0 +1,273 @@
+import json
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .models import ExtractionResult, SchemaCheck
+from ..utils.fields import normalize_key, parse_date, parse_number
+
+# Type names understood in simple {"field": "type"} schemas; any other value
+# (usually a description) accepts whatever was extracted
+TYPE_NAMES = {
+    "string": "string", "str": "string", "text": "string",
+    "number": "number", "float": "number", "decimal": "number",
+    "currency": "number", "amount": "number", "money": "number",
+    "integer": "integer", "int": "integer",
+    "boolean": "boolean", "bool": "boolean",
+    "date": "date", "datetime": "date", "date-time": "date",
+    "array": "array", "list": "array",
+    "object": "object", "dict": "object",
+}
+
+# A nested dict made only of these keys is a JSON Schema node, not a sub-object
+JSON_SCHEMA_KEYWORDS = {"type", "format", "description", "title", "items", "properties", "required", "enum"}
+
+BOOLEAN_WORDS = {"true": True, "yes": True, "y": True, "1": True, "false": False, "no": False, "n": False, "0": False}
+
+
+def _to_string(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        raise ValueError("expected a string")
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value if isinstance(value, str) else str(value)
+
+
+def _to_number(value: Any) -> Any:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    number = parse_number(value) if isinstance(value, str) else None
+    if number is None:
+        raise ValueError("expected a number")
+    return int(number) if number.is_integer() else number
+
+
+def _to_integer(value: Any) -> Any:
+    try:
+        number = _to_number(value)
+    except ValueError:
+        number = None
+    if number is None or not float(number).is_integer():
+        raise ValueError("expected an integer")
+    return int(number)
+
+
+def _to_boolean(value: Any) -> Any:
+    if isinstance(value, bool):
+        return value
+    word = str(value).strip().lower() if isinstance(value, (str, int)) else None
+    if word not in BOOLEAN_WORDS:
+        raise ValueError("expected a boolean")
+    return BOOLEAN_WORDS[word]
+
+
+def _to_date(value: Any) -> Any:
+    date = parse_date(value) if isinstance(value, str) else None
+    if date is None:
+        raise ValueError("expected a date")
+    return date
+
+
+COERCERS: Dict[str, Callable[[Any], Any]] = {
+    "string": _to_string,
+    "number": _to_number,
+    "integer": _to_integer,
+    "boolean": _to_boolean,
+    "date": _to_date,
+}
+
+
+# Extracted key spellings repeat across results; normalize each once
+_normalize_key = lru_cache(maxsize=4096)(normalize_key)
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _join(path: str, key: str) -> str:
+    return f"{path}.{key}" if path else key
+
+
+class SchemaValidator:
+    """
+    A schema compiled for repeated validation of extracted data.
+
+    Accepts the schema forms callers pass to strategies: simple maps of field
+    name to type name ({"total": "currency"}), nested dicts for sub-objects,
+    one-element lists for arrays ({"items": [{"qty": "integer"}]}), and JSON
+    Schema (type / properties / items / required / format). Field names are
+    resolved once at compile time, so validation is a single walk over the
+    data with dict lookups on normalized keys.
+
+    Attributes:
+        kind: "object", "array", a scalar type from TYPE_NAMES, or "any"
+        properties: Compiled sub-schemas of an object, in schema order
+        required: Object fields that count as missing when absent
+        items: Compiled schema of an array's elements
+        description: The field's description (a simple schema's value, or
+            JSON Schema "description"), if any
+        leaves: Number of required leaf fields (arrays count as one)
+    """
+
+    def __init__(self, schema: Any):
+        self.kind = "any"
+        self.properties: Dict[str, "SchemaValidator"] = {}
+        self.required: set = set()
+        self.items: Optional["SchemaValidator"] = None
+        self.description: Optional[str] = None
+
+        if isinstance(schema, dict) and schema and self._is_json_schema(schema):
+            self._compile_json_schema(schema)
+        elif isinstance(schema, dict):
+            self.kind = "object"
+            self.properties = {name: SchemaValidator(spec) for name, spec in schema.items()}
+            self.required = set(self.properties)
+        elif isinstance(schema, list):
+            self.kind = "array"
+            self.items = SchemaValidator(schema[0]) if schema else None
+        elif isinstance(schema, str):
+            self.kind = TYPE_NAMES.get(schema.strip().lower(), "any")
+            self.description = schema
+
+        # Extracted key (normalized) -> schema field name
+        self.keys = {normalize_key(name): name for name in self.properties}
+        self.leaves = sum(
+            spec.leaves if spec.kind == "object" and spec.properties else 1
+            for name, spec in self.properties.items() if name in self.required
+        )
+
+    @staticmethod
+    def _is_json_schema(schema: Dict[str, Any]) -> bool:
+        if not set(schema) <= JSON_SCHEMA_KEYWORDS:
+            return False
+        return isinstance(schema.get("properties"), dict) or isinstance(schema.get("type"), (str, list))
+
+    def _compile_json_schema(self, schema: Dict[str, Any]) -> None:
+        types = schema.get("type", "object" if "properties" in schema else "any")
+        if isinstance(types, list):
+            types = next((t for t in types if t != "null"), "any")
+        if schema.get("format") in ("date", "date-time"):
+            types = "date"
+        self.kind = TYPE_NAMES.get(str(types).lower(), "any")
+        if isinstance(schema.get("description"), str):
+            self.description = schema["description"]
+        if self.kind == "object":
+            properties = schema.get("properties") or {}
+            self.properties = {name: SchemaValidator(spec) for name, spec in properties.items()}
+            self.required = set(schema.get("required", self.properties)) & set(self.properties)
+        elif self.kind == "array" and "items" in schema:
+            self.items = SchemaValidator(schema["items"])
+
+    @property
+    def fields(self) -> List[str]:
+        """Top-level field names, in schema order."""
+        return list(self.properties)
+
+    @property
+    def descriptions(self) -> Dict[str, Optional[str]]:
+        """Top-level field name -> description (None if it has none), in schema order."""
+        return {name: spec.description for name, spec in self.properties.items()}
+
+    def validate(self, data: Any) -> Tuple[Any, SchemaCheck]:
+        """
+        Coerce extracted data to the schema and report where it does not conform.
+
+        Numbers and amounts ("$2,500.00") become numbers, dates become ISO
+        strings, and keys are renamed to their schema spelling ("invoice_number"
+        for "InvoiceNumber"). Values that cannot be coerced are kept as
+        extracted and reported as invalid; fields outside the schema are kept
+        and reported as extra.
+
+        Args:
+            data: Extracted data
+
+        Returns:
+            Tuple of (coerced data, schema check)
+        """
+        check = SchemaCheck()
+        coerced = self._coerce(data, "", check)
+        # Fields missing inside array elements are reported but, like the
+        # arrays themselves, count once towards completeness
+        counted = sum(1 for path in check.missing_fields if "[" not in path)
+        check.completeness = 1.0 - counted / self.leaves if self.leaves else 1.0
+        return coerced, check
+
+    def _missing(self, path: str) -> List[str]:
+        if self.kind == "object" and self.properties:
+            return [
+                leaf for name, spec in self.properties.items() if name in self.required
+                for leaf in spec._missing(_join(path, name))
+            ]
+        return [path]
+
+    def _coerce(self, value: Any, path: str, check: SchemaCheck) -> Any:
+        if self.kind == "object" and self.properties:
+            if not isinstance(value, dict):
+                check.invalid_fields[path or "$"] = "expected an object"
+                return value
+            present: Dict[str, Any] = {}
+            extra: Dict[str, Any] = {}
+            for key, item in value.items():
+                name = self.keys.get(_normalize_key(key))
+                if name is None or name in present:
+                    extra[key] = item
+                    check.extra_fields.append(_join(path, key))
+                else:
+                    present[name] = item
+            coerced = {}
+            for name, spec in self.properties.items():
+                item = present.get(name)
+                if _is_empty(item):
+                    if name in self.required:
+                        check.missing_fields.extend(spec._missing(_join(path, name)))
+                    if name in present:
+                        coerced[name] = item
+                    continue
+                coerced[name] = spec._coerce(item, _join(path, name), check)
+            coerced.update(extra)
+            return coerced
+
+        if self.kind == "array":
+            # XML-style containers: {"Item": [...]}
+            if isinstance(value, dict) and len(value) == 1 and isinstance(next(iter(value.values())), list):
+                value = next(iter(value.values()))
+            if not isinstance(value, list):
+                check.invalid_fields[path] = "expected an array"
+                return value
+            if self.items is None:
+                return value
+            return [
+                item if _is_empty(item) else self.items._coerce(item, f"{path}[{i}]", check)
+                for i, item in enumerate(value)
+            ]
+
+        coerce = COERCERS.get(self.kind)
+        if coerce is None:
+            return value
+        try:
+            return coerce(value)
+        except ValueError as e:
+            check.invalid_fields[path] = str(e)
+            return value
+
+
+@lru_cache(maxsize=256)
+def _compile(schema_json: str) -> SchemaValidator:
+    return SchemaValidator(json.loads(schema_json))
+
+
+def compile_schema(schema: Dict[str, Any]) -> SchemaValidator:
+    """The compiled validator for a schema, built once per distinct schema."""
+    # Field order is part of the schema, so keys are not sorted
+    return _compile(json.dumps(schema))
+
+
+def validate_result(result: ExtractionResult, schema: Optional[Dict[str, Any]]) -> ExtractionResult:
+    """
+    Coerce a successful result's data to the schema and attach its schema check.
+
+    Failed results, and any result when there is no schema, are returned unchanged.
+    """
+    if not schema or result.error:
+        return result
+    data, check = compile_schema(schema).validate(result.extracted_data)
+    return result.model_copy(update={"extracted_data": data, "schema_check": check})
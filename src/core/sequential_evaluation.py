@@ -0,0 +1,197 @@
+import math
+from itertools import combinations
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from .models import ExtractionResult
+from .validator import ResultValidator
+
+
+class SequentialComparison:
+    """
+    Anytime-valid pairwise comparison of strategies over a stream of documents.
+
+    Each pair of strategies keeps a running sum of the per-document accuracy
+    difference on the documents both were evaluated on. The difference lies
+    in [-1, 1], so Hoeffding's inequality with the error budget split over
+    pairs and over sample sizes (alpha / (n (n + 1)) at n documents) gives a
+    confidence interval that holds at every n simultaneously. It is therefore
+    valid to look after every document and stop as soon as it is decisive.
+
+    A strategy stops being evaluated once it is significantly worse than
+    another strategy, or once every comparison with the strategies still
+    running is settled (it wins, or the two are within margin).
+    """
+
+    def __init__(self, strategy_ids: List[str], confidence: float = 0.95, margin: float = 0.0):
+        """
+        Args:
+            strategy_ids: Strategies to compare
+            confidence: Probability that every settled comparison is correct
+            margin: Accuracy difference below which two strategies count as tied
+                (0 means only a strict winner settles a pair)
+        """
+        self.strategy_ids = list(strategy_ids)
+        self.confidence = confidence
+        self.margin = margin
+        pairs = max(1, len(self.strategy_ids) * (len(self.strategy_ids) - 1) // 2)
+        self.pair_alpha = (1 - confidence) / pairs
+
+        self.active = list(self.strategy_ids)
+        # Why each strategy stopped, e.g. "worse than strategy_02" or "settled"
+        self.stopped: Dict[str, str] = {}
+        self.documents = {strategy_id: 0 for strategy_id in self.strategy_ids}
+        self.accuracy_sum = {strategy_id: 0.0 for strategy_id in self.strategy_ids}
+        # Keyed by (a, b) in strategy order: paired document count and sum of a - b
+        self.pair_count: Dict[Tuple[str, str], int] = {}
+        self.pair_sum: Dict[Tuple[str, str], float] = {}
+        for a, b in combinations(self.strategy_ids, 2):
+            self.pair_count[a, b] = 0
+            self.pair_sum[a, b] = 0.0
+
+    @property
+    def done(self) -> bool:
+        """Whether no strategy needs further documents."""
+        return not self.active
+
+    def radius(self, n: int) -> float:
+        """Half-width of the anytime-valid interval for a pair after n documents."""
+        if n == 0:
+            return math.inf
+        return math.sqrt(2 * math.log(2 * n * (n + 1) / self.pair_alpha) / n)
+
+    def _key(self, a: str, b: str) -> Tuple[Tuple[str, str], float]:
+        if (a, b) in self.pair_count:
+            return (a, b), 1.0
+        return (b, a), -1.0
+
+    def interval(self, a: str, b: str) -> Tuple[float, float]:
+        """Confidence interval of accuracy(a) - accuracy(b)."""
+        key, sign = self._key(a, b)
+        n = self.pair_count[key]
+        if n == 0:
+            return -1.0, 1.0
+        mean = sign * self.pair_sum[key] / n
+        r = self.radius(n)
+        return max(-1.0, mean - r), min(1.0, mean + r)
+
+    def outcome(self, a: str, b: str) -> Optional[str]:
+        """The better strategy's ID, "tie" if within margin, or None if unsettled."""
+        low, high = self.interval(a, b)
+        if low > 0:
+            return a
+        if high < 0:
+            return b
+        if self.margin and -self.margin <= low and high <= self.margin:
+            return "tie"
+        return None
+
+    def update(self, accuracies: Dict[str, float]) -> List[str]:
+        """
+        Add one document's accuracy for the strategies evaluated on it.
+
+        Args:
+            accuracies: Mapping of strategy_id to accuracy on the document
+
+        Returns:
+            Strategies that stopped as a result
+        """
+        for strategy_id, accuracy in accuracies.items():
+            self.documents[strategy_id] += 1
+            self.accuracy_sum[strategy_id] += accuracy
+        for key in self.pair_count:
+            a, b = key
+            if a in accuracies and b in accuracies:
+                self.pair_count[key] += 1
+                self.pair_sum[key] += accuracies[a] - accuracies[b]
+
+        stopped = []
+        for strategy_id in self.active:
+            others = [other for other in self.active if other != strategy_id]
+            outcomes = {other: self.outcome(strategy_id, other) for other in others}
+            better = [other for other, winner in outcomes.items() if winner == other]
+            if better:
+                self.stopped[strategy_id] = f"worse than {better[0]}"
+                stopped.append(strategy_id)
+            elif all(outcomes.values()):
+                self.stopped[strategy_id] = "settled"
+                stopped.append(strategy_id)
+        # Decided against the active set as it was, so stopping order does not matter
+        self.active = [strategy_id for strategy_id in self.active if strategy_id not in stopped]
+        return stopped
+
+    def mean_accuracy(self, strategy_id: str) -> float:
+        """Mean accuracy over the documents the strategy was evaluated on."""
+        n = self.documents[strategy_id]
+        return self.accuracy_sum[strategy_id] / n if n else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """JSON-serializable per-strategy and per-pair state."""
+        return {
+            "confidence": self.confidence,
+            "margin": self.margin,
+            "strategies": {
+                strategy_id: {
+                    "documents": self.documents[strategy_id],
+                    "accuracy": self.mean_accuracy(strategy_id),
+                    "status": self.stopped.get(strategy_id, "running"),
+                }
+                for strategy_id in self.strategy_ids
+            },
+            "pairs": [
+                {
+                    "strategies": [a, b],
+                    "documents": self.pair_count[a, b],
+                    "difference": list(self.interval(a, b)),
+                    "outcome": self.outcome(a, b),
+                }
+                for a, b in self.pair_count
+            ],
+        }
+
+
+async def evaluate_sequentially(
+    engine,
+    document_paths: List[str | Path],
+    ground_truths: Dict[str, Dict[str, Any]],
+    confidence: float = 0.95,
+    margin: float = 0.0,
+    **extract_kwargs
+) -> Tuple[Dict[str, List[ExtractionResult]], SequentialComparison]:
+    """
+    Evaluate the engine's strategies document by document until the comparison settles.
+
+    Each document runs only the strategies still active and scores them with
+    ResultValidator against its ground truth; documents without ground truth
+    are skipped. Strategies stop once settled (see SequentialComparison), and
+    the loop ends when none are left or the documents run out.
+
+    Args:
+        engine: ExtractionEngine whose strategies are compared
+        document_paths: Documents in evaluation order
+        ground_truths: Mapping of str(path) to the document's ground truth
+        confidence: Probability that every settled comparison is correct
+        margin: Accuracy difference below which strategies count as tied
+        **extract_kwargs: Passed to engine.extract_with_all_strategies
+
+    Returns:
+        Tuple of (results per evaluated document, comparison state)
+    """
+    comparison = SequentialComparison(
+        [strategy.metadata.id for strategy in engine.strategies], confidence, margin
+    )
+    corpus_results: Dict[str, List[ExtractionResult]] = {}
+    for path in document_paths:
+        if comparison.done:
+            break
+        ground_truth = ground_truths.get(str(path))
+        if not ground_truth:
+            continue
+        results = await engine.extract_with_all_strategies(
+            path, strategy_ids=list(comparison.active), **extract_kwargs
+        )
+        corpus_results[str(path)] = results
+        metrics = ResultValidator.compare_results(results, ground_truth)
+        comparison.update({
+            strategy_id: validation.accuracy for strategy_id, validation in metrics.items()
+        })
+    return corpus_results, comparison
@@ -0,0 +1,44 @@
+from difflib import SequenceMatcher
+from typing import Dict, List
+
+# Scores are always difflib's, so the 0.8 match threshold keeps its meaning;
+# the savings come from skipping equal and repeated values, not a faster measure
+
+# difflib ignores characters that make up over 1% of a second sequence at
+# least this long, so only shorter equal strings are known to score 1.0
+AUTOJUNK_MIN_LENGTH = 200
+
+
+def _equal(a: str, b: str) -> bool:
+    return a == b and len(b) < AUTOJUNK_MIN_LENGTH
+
+
+def ratio(a: str, b: str) -> float:
+    """
+    difflib.SequenceMatcher(None, a, b).ratio(), in [0, 1].
+
+    Equal strings are answered without building a matcher.
+    """
+    if _equal(a, b):
+        return 1.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def batch_ratio(truth: str, candidates: List[str]) -> List[float]:
+    """
+    ratio(truth, candidate) for every candidate.
+
+    Strategies often extract the same value for a field, so each distinct
+    candidate is scored once, by one matcher holding truth.
+    """
+    matcher = SequenceMatcher(None, truth, "")
+    scores: Dict[str, float] = {}
+    for candidate in candidates:
+        if candidate in scores:
+            continue
+        if _equal(truth, candidate):
+            scores[candidate] = 1.0
+        else:
+            matcher.set_seq2(candidate)
+            scores[candidate] = matcher.ratio()
+    return [scores[candidate] for candidate in candidates]
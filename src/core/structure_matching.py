@@ -0,0 +1,268 @@
+from typing import Any, Dict, List, Optional
+import numpy as np
+from .similarity import ratio
+from ..utils.fields import find_key, flatten_fields, normalize_value
+
+# scipy (optional, compiled) and the NumPy fallback below find the same
+# minimum-cost assignment
+try:
+    from scipy.optimize import linear_sum_assignment
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+# rapidfuzz (optional, compiled) and the NumPy fallback below compute the
+# same indel similarity matrix
+try:
+    from rapidfuzz import process
+    from rapidfuzz.distance import Indel
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+
+def leaf_score(true_value: Any, extracted_value: Any) -> float:
+    """
+    Match score of one leaf value in [0, 1].
+
+    Values equal after normalization (so "$2,500.00" matches 2500) score 1;
+    otherwise two strings score their case-insensitive similarity.
+    """
+    if normalize_value(true_value) == normalize_value(extracted_value):
+        return 1.0
+    if isinstance(true_value, str) and isinstance(extracted_value, str):
+        return ratio(true_value.lower(), extracted_value.lower())
+    return 0.0
+
+
+def _as_list(value: Any) -> Optional[List[Any]]:
+    if isinstance(value, list):
+        return value
+    # XML-style containers: {"Item": [...]} or a single {"Item": {...}}
+    if isinstance(value, dict) and len(value) == 1:
+        inner = next(iter(value.values()))
+        return inner if isinstance(inner, list) else [inner]
+    return None
+
+
+def match_fields(true_value: Any, extracted_value: Any, path: str) -> Dict[str, Optional[float]]:
+    """
+    Score every ground-truth leaf of a (possibly nested) value.
+
+    Dicts are matched key by key, lists element by element through an
+    optimal assignment (see match_items), so reordered line items still
+    match. Leaves are addressed by path, e.g. "line_items[0].qty".
+
+    Args:
+        true_value: Ground truth value
+        extracted_value: Extracted value at the same place (None if missing)
+        path: Path of the value
+
+    Returns:
+        Mapping of leaf path to score, or None where nothing was extracted
+    """
+    if isinstance(true_value, dict) and true_value:
+        extracted = extracted_value if isinstance(extracted_value, dict) else {}
+        scores: Dict[str, Optional[float]] = {}
+        for key, value in true_value.items():
+            scores.update(match_fields(value, find_key(extracted, key), f"{path}.{key}"))
+        return scores
+
+    if isinstance(true_value, list) and true_value:
+        extracted = _as_list(extracted_value) or []
+        assignment = match_items(true_value, extracted) if extracted else {}
+        scores = {}
+        for i, item in enumerate(true_value):
+            j = assignment.get(i)
+            scores.update(match_fields(item, extracted[j] if j is not None else None, f"{path}[{i}]"))
+        return scores
+
+    if extracted_value is None:
+        return {path: None}
+    return {path: leaf_score(true_value, extracted_value)}
+
+
+def _item_columns(item: Any) -> Dict[str, Any]:
+    return flatten_fields(item) if isinstance(item, (dict, list)) else {"": item}
+
+
+def _lcs_lengths(truths: List[str], candidates: List[str]) -> np.ndarray:
+    # Bit-parallel LCS (Allison-Dix / Hyyro) of every truth against every
+    # candidate at once: each truth is a bit vector of 64-bit words, and the
+    # candidates are scanned one character position at a time for all pairs
+    alphabet: Dict[str, int] = {}
+    words = max(1, -(-max(map(len, truths)) // 64))
+    rows, chars, positions = [], [], []
+    for i, truth in enumerate(truths):
+        for k, char in enumerate(truth):
+            rows.append(i)
+            chars.append(alphabet.setdefault(char, len(alphabet) + 1))
+            positions.append(k)
+    # masks[w, i, c]: word w of the positions of character code c in truth i;
+    # code 0 pads shorter candidates and matches nothing
+    masks = np.zeros((words, len(truths), len(alphabet) + 1), dtype=np.uint64)
+    positions = np.array(positions, dtype=np.int64)
+    np.bitwise_or.at(
+        masks, (positions // 64, np.array(rows, dtype=np.int64), np.array(chars, dtype=np.int64)),
+        np.left_shift(np.uint64(1), (positions % 64).astype(np.uint64))
+    )
+    # Bits of each word that hold a truth character
+    full = np.array([
+        [(1 << min(64, max(0, len(truth) - 64 * w))) - 1 for truth in truths] for w in range(words)
+    ], dtype=np.uint64)[:, :, None]
+
+    codes = np.zeros((len(candidates), max(1, max(map(len, candidates)))), dtype=np.int64)
+    for j, candidate in enumerate(candidates):
+        codes[j, :len(candidate)] = [alphabet.get(char, 0) for char in candidate]
+
+    v = np.repeat(full, len(candidates), axis=2)
+    for column in codes.T:
+        carry = None
+        for w in range(words):
+            # v = (v + u) | (v - u), with the addition carried across words;
+            # u is a subset of v, so v - u is v & ~u and never borrows
+            u = v[w] & masks[w][:, column]
+            total = v[w] + u
+            if words > 1:
+                overflow = total < u
+                if carry is not None:
+                    total += carry
+                    overflow |= total < carry
+                carry = overflow.astype(np.uint64)
+            v[w] &= ~u
+            v[w] |= total
+            v[w] &= full[w]
+    unmatched = np.unpackbits(v[..., None].view(np.uint8), axis=-1).sum(axis=(0, -1))
+    return np.array([len(truth) for truth in truths])[:, None] - unmatched
+
+
+def _string_similarity(truths: List[str], candidates: List[str]) -> np.ndarray:
+    """
+    Indel similarity, 2 * LCS / (len(a) + len(b)), of every truth against every candidate.
+
+    On difflib's scale, and never below difflib's ratio (whose matches are
+    a common subsequence); used only to rank pairings, which is why a
+    vectorized measure is good enough here.
+    """
+    if RAPIDFUZZ_AVAILABLE:
+        return process.cdist(truths, candidates, scorer=Indel.normalized_similarity, dtype=np.float64)
+    totals = np.array([len(truth) for truth in truths])[:, None] + np.array([len(c) for c in candidates])[None, :]
+    lcs = _lcs_lengths(truths, candidates)
+    return np.where(totals > 0, 2 * lcs / np.maximum(totals, 1), 1.0)
+
+
+def item_scores(true_items: List[Any], extracted_items: List[Any]) -> np.ndarray:
+    """
+    (n, m) mean leaf score of every true item against every extracted item.
+
+    Leaves are compared column by column: normalized values are coded as
+    integers so equality is one broadcast comparison, and string similarity
+    is one vectorized indel matrix over the distinct strings (see
+    _string_similarity). These scores only decide the pairing; the paired
+    leaves are then scored with difflib by match_fields.
+    """
+    true_columns = [_item_columns(item) for item in true_items]
+    extracted_columns = [_item_columns(item) for item in extracted_items]
+    keys = list(dict.fromkeys(key for columns in true_columns for key in columns))
+    n, m = len(true_items), len(extracted_items)
+    total = np.zeros((n, m))
+    counts = np.zeros(n)
+
+    codes: Dict[str, int] = {}
+    for key in keys:
+        true_values = [columns.get(key) for columns in true_columns]
+        extracted_values = [columns.get(key) for columns in extracted_columns]
+        has_truth = np.array([key in columns for columns in true_columns])
+        # -1 / -2 mark missing values so they never compare equal
+        true_codes = np.array([
+            codes.setdefault(normalize_value(value), len(codes)) if present else -1
+            for value, present in zip(true_values, has_truth)
+        ])
+        extracted_codes = np.array([
+            codes.setdefault(normalize_value(value), len(codes)) if key in columns else -2
+            for value, columns in zip(extracted_values, extracted_columns)
+        ])
+        column = (true_codes[:, None] == extracted_codes[None, :]).astype(float)
+
+        true_strings = [i for i, value in enumerate(true_values) if isinstance(value, str)]
+        extracted_strings = [j for j, value in enumerate(extracted_values) if isinstance(value, str)]
+        if true_strings and extracted_strings:
+            true_unique: Dict[str, int] = {}
+            rows = np.array([true_unique.setdefault(true_values[i].lower(), len(true_unique)) for i in true_strings])
+            extracted_unique: Dict[str, int] = {}
+            cols = np.array([
+                extracted_unique.setdefault(extracted_values[j].lower(), len(extracted_unique))
+                for j in extracted_strings
+            ])
+            similarity = _string_similarity(list(true_unique), list(extracted_unique))
+            block = np.ix_(true_strings, extracted_strings)
+            column[block] = np.maximum(column[block], similarity[np.ix_(rows, cols)])
+
+        total += column * has_truth[:, None]
+        counts += has_truth
+    return total / np.maximum(counts, 1)[:, None]
+
+
+def _assign(cost: np.ndarray) -> np.ndarray:
+    # Shortest augmenting path Hungarian algorithm (n <= m) with the inner
+    # scan over columns vectorized; returns the column assigned to each row
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    owner = np.zeros(m + 1, dtype=int)  # 1-based row owning each column, 0 if free
+    way = np.zeros(m + 1, dtype=int)
+    for i in range(1, n + 1):
+        owner[0] = i
+        j0 = 0
+        min_reduced = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = owner[j0]
+            free = ~used
+            free[0] = False
+            reduced = cost[i0 - 1] - u[i0] - v[1:]
+            better = free[1:] & (reduced < min_reduced[1:])
+            min_reduced[1:][better] = reduced[better]
+            way[1:][better] = j0
+            candidates = np.where(free, min_reduced, np.inf)
+            j1 = int(np.argmin(candidates))
+            delta = candidates[j1]
+            u[owner[used]] += delta
+            v[used] -= delta
+            min_reduced[free] -= delta
+            j0 = j1
+            if owner[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            owner[j0] = owner[j1]
+            j0 = j1
+    columns = np.zeros(n, dtype=int)
+    for j in range(1, m + 1):
+        if owner[j]:
+            columns[owner[j] - 1] = j - 1
+    return columns
+
+
+def assign(cost: np.ndarray) -> Dict[int, int]:
+    """Minimum-cost assignment of rows to columns of a rectangular cost matrix."""
+    if cost.size == 0:
+        return {}
+    if SCIPY_AVAILABLE:
+        rows, cols = linear_sum_assignment(cost)
+        return dict(zip(rows.tolist(), cols.tolist()))
+    if cost.shape[0] <= cost.shape[1]:
+        return dict(enumerate(_assign(cost).tolist()))
+    return {row: col for col, row in enumerate(_assign(cost.T).tolist())}
+
+
+def match_items(true_items: List[Any], extracted_items: List[Any]) -> Dict[int, int]:
+    """
+    Pair true list elements with extracted ones maximizing the total item score.
+
+    Returns:
+        Mapping of true index to extracted index; true items left over when
+        fewer items were extracted are absent
+    """
+    return assign(1.0 - item_scores(true_items, extracted_items))
@@ -1,6 +1,8 @@
 from typing import Dict, Any, List, Optional
 from .models import ExtractionResult, ValidationMetrics
-from difflib import SequenceMatcher
+from .consensus import ConsensusEngine
+from .similarity import batch_ratio, ratio
+from ..utils.fields import find_key, normalize_value
 
 
 class ResultValidator:
@@ -8,20 +10,52 @@ class ResultValidator:
 
     @staticmethod
     def calculate_similarity(str1: str, str2: str) -> float:
-        """Calculate similarity ratio between two strings."""
-        return SequenceMatcher(None, str1.lower(), str2.lower()).ratio()
+        """Calculate similarity ratio between two strings (difflib ratio, case-insensitive)."""
+        return ratio(str1.lower(), str2.lower())
+
+    @staticmethod
+    def batch_similarities(
+        results: List[ExtractionResult],
+        ground_truth: Dict[str, Any]
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Score every strategy's string value against each string truth value at once.
+
+        Returns:
+            Mapping of strategy_id to {field: similarity}
+        """
+        scores: Dict[str, Dict[str, float]] = {result.strategy_id: {} for result in results}
+        for key, true_value in ground_truth.items():
+            if not isinstance(true_value, str):
+                continue
+            candidates = [
+                result for result in results
+                if not result.error and isinstance(find_key(result.extracted_data, key), str)
+            ]
+            values = [find_key(result.extracted_data, key).lower() for result in candidates]
+            for result, score in zip(candidates, batch_ratio(true_value.lower(), values)):
+                scores[result.strategy_id][key] = score
+        return scores
 
     @staticmethod
     def validate_against_ground_truth(
         extracted: Dict[str, Any],
-        ground_truth: Dict[str, Any]
+        ground_truth: Dict[str, Any],
+        similarities: Optional[Dict[str, float]] = None
     ) -> ValidationMetrics:
         """
         Validate extraction against ground truth.
 
+        Keys match case- and separator-insensitively. Nested dicts and lists
+        are scored per leaf under path-addressed names such as
+        "line_items[0].quantity", with list elements paired to the extracted
+        elements they match best, so accuracy and completeness count leaves.
+
         Args:
             extracted: Extracted data
             ground_truth: Ground truth data
+            similarities: Optional precomputed string similarities per field
+                (see batch_similarities)
 
         Returns:
             Validation metrics
@@ -34,33 +68,48 @@ class ResultValidator:
                 field_match_rate={}
             )
 
-        total_fields = len(ground_truth)
-        matched_fields = 0
         field_match_rate = {}
+        missing_fields = []
 
         for key, true_value in ground_truth.items():
-            if key in extracted:
-                extracted_value = extracted[key]
-
+            extracted_value = find_key(extracted, key)
+
+            # Nested values are scored leaf by leaf, with list elements paired
+            # by optimal assignment ("line_items[0].qty", ...)
+            if isinstance(true_value, (dict, list)) and true_value:
+                from .structure_matching import match_fields
+                for path, score in match_fields(true_value, extracted_value, key).items():
+                    field_match_rate[path] = score or 0.0
+                    if score is None:
+                        missing_fields.append(path)
+                continue
+
+            if extracted_value is not None or key in extracted:
                 # Compare values
                 if isinstance(true_value, str) and isinstance(extracted_value, str):
-                    similarity = ResultValidator.calculate_similarity(
-                        str(true_value),
-                        str(extracted_value)
-                    )
+                    if normalize_value(true_value) == normalize_value(extracted_value):
+                        # Same date or amount written differently
+                        similarity = 1.0
+                    elif similarities and key in similarities:
+                        similarity = similarities[key]
+                    else:
+                        similarity = ResultValidator.calculate_similarity(
+                            str(true_value),
+                            str(extracted_value)
+                        )
                     field_match_rate[key] = similarity
-                    if similarity >= 0.8:  # 80% threshold
-                        matched_fields += 1
-                elif true_value == extracted_value:
+                elif true_value == extracted_value or normalize_value(true_value) == normalize_value(extracted_value):
                     field_match_rate[key] = 1.0
-                    matched_fields += 1
                 else:
                     field_match_rate[key] = 0.0
             else:
                 field_match_rate[key] = 0.0
+                missing_fields.append(key)
 
+        total_fields = len(field_match_rate)
+        matched_fields = sum(1 for rate in field_match_rate.values() if rate >= 0.8)  # 80% threshold
         accuracy = matched_fields / total_fields if total_fields > 0 else 0.0
-        completeness = len([k for k in ground_truth.keys() if k in extracted]) / total_fields if total_fields > 0 else 0.0
+        completeness = (total_fields - len(missing_fields)) / total_fields if total_fields > 0 else 0.0
 
         # Consistency: how many fields match exactly
         exact_matches = sum(1 for rate in field_match_rate.values() if rate == 1.0)
@@ -70,7 +119,8 @@ class ResultValidator:
             accuracy=accuracy,
             completeness=completeness,
             consistency=consistency,
-            field_match_rate=field_match_rate
+            field_match_rate=field_match_rate,
+            missing_fields=missing_fields
         )
 
     @staticmethod
@@ -89,6 +139,9 @@ class ResultValidator:
             Dictionary mapping strategy_id to validation metrics
         """
         validation_map = {}
+        # Without ground truth, strategies are scored against each other
+        consensus = None if ground_truth else ConsensusEngine.from_results(results)
+        similarities = ResultValidator.batch_similarities(results, ground_truth) if ground_truth else {}
 
         for result in results:
             if result.error:
@@ -102,22 +155,28 @@ class ResultValidator:
             elif ground_truth:
                 metrics = ResultValidator.validate_against_ground_truth(
                     result.extracted_data,
-                    ground_truth
+                    ground_truth,
+                    similarities.get(result.strategy_id)
                 )
                 validation_map[result.strategy_id] = metrics
             else:
                 # No ground truth - use cross-strategy consensus
-                validation_map[result.strategy_id] = ResultValidator._estimate_quality(result)
+                validation_map[result.strategy_id] = ResultValidator._estimate_quality(result, consensus)
 
         return validation_map
 
     @staticmethod
-    def _estimate_quality(result: ExtractionResult) -> ValidationMetrics:
+    def _estimate_quality(
+        result: ExtractionResult,
+        consensus: Optional[ConsensusEngine] = None
+    ) -> ValidationMetrics:
         """
         Estimate quality without ground truth based on structure.
 
         Args:
             result: Extraction result
+            consensus: Optional consensus over all strategies' results; when
+                given, consistency is the result's agreement with it
 
         Returns:
             Estimated validation metrics
@@ -129,12 +188,25 @@ class ResultValidator:
         has_values = sum(1 for v in data.values() if v) if isinstance(data, dict) else 0
 
         completeness = has_values / num_fields if num_fields > 0 else 0.0
+        # Against a schema, completeness counts the schema's fields instead
+        if result.schema_check is not None:
+            completeness = result.schema_check.completeness
+
+        consistency = 0.0
+        field_match_rate = {}
+        if consensus is not None and consensus.num_results > 1:
+            consistency = consensus.agreement_scores().get(result.strategy_id, 0.0)
+            values = consensus.strategy_values.get(result.strategy_id, {})
+            field_match_rate = {
+                field: 1.0 if values.get(field) == consensus.top(field)[0] else 0.0
+                for field in consensus.consensus_record()
+            }
 
         return ValidationMetrics(
             accuracy=0.0,  # Cannot determine without ground truth
             completeness=completeness,
-            consistency=0.0,  # Cannot determine from single result
-            field_match_rate={}
+            consistency=consistency,
+            field_match_rate=field_match_rate
         )
 
     @staticmethod
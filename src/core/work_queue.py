@@ -0,0 +1,247 @@
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+from pydantic import BaseModel
+from .models import ExtractionResult
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    text TEXT NOT NULL,
+    schema TEXT,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    document_id INTEGER NOT NULL REFERENCES documents(id),
+    strategy_id TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_until REAL,
+    worker_id TEXT,
+    result TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status, lease_until);
+CREATE INDEX IF NOT EXISTS idx_tasks_document ON tasks(document_id);
+"""
+
+
+class TaskStatus:
+    PENDING = "pending"
+    LEASED = "leased"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class LeasedTask(BaseModel):
+    """A document x strategy task leased to a worker."""
+    task_id: int
+    document_id: int
+    document_name: str
+    strategy_id: str
+    text: str
+    extraction_schema: Optional[Dict[str, Any]] = None
+    attempts: int
+
+
+class WorkQueue:
+    """
+    Durable document x strategy task queue backed by a local SQLite file.
+
+    Workers lease tasks for a visibility timeout; tasks whose lease expires
+    (e.g. the worker died) become available to other workers again. Every
+    operation is a short transaction, so any number of processes can share
+    one queue file.
+    """
+
+    def __init__(self, path: str | Path, max_attempts: int = 3, wal: bool = True):
+        """
+        Args:
+            path: SQLite database file
+            max_attempts: Leases per task before it is marked failed
+            wal: Use write-ahead logging. Disable when the file lives on a
+                network filesystem shared between hosts (WAL needs shared memory).
+        """
+        self.path = Path(path)
+        self.max_attempts = max_attempts
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute(f"PRAGMA journal_mode={'WAL' if wal else 'DELETE'}")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def enqueue_document(
+        self,
+        name: str,
+        text: str,
+        strategy_ids: List[str],
+        schema: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """
+        Store a loaded document and enqueue one task per strategy.
+
+        Returns:
+            Document ID
+        """
+        now = time.time()
+        with self._transaction():
+            cursor = self.conn.execute(
+                "INSERT INTO documents (name, text, schema, created_at) VALUES (?, ?, ?, ?)",
+                (name, text, json.dumps(schema) if schema else None, now)
+            )
+            document_id = cursor.lastrowid
+            self.conn.executemany(
+                "INSERT INTO tasks (document_id, strategy_id, updated_at) VALUES (?, ?, ?)",
+                [(document_id, strategy_id, now) for strategy_id in strategy_ids]
+            )
+        return document_id
+
+    def lease(self, worker_id: str, visibility_timeout: float = 300.0) -> Optional[LeasedTask]:
+        """
+        Lease the oldest available task, including tasks with expired leases.
+
+        Returns:
+            Leased task, or None if nothing is available
+        """
+        now = time.time()
+        with self._transaction():
+            # Expired leases that used up their attempts are failed, not retried
+            self.conn.execute(
+                "UPDATE tasks SET status = ?, error = 'Lease expired too many times', updated_at = ? "
+                "WHERE status = ? AND lease_until < ? AND attempts >= ?",
+                (TaskStatus.FAILED, now, TaskStatus.LEASED, now, self.max_attempts)
+            )
+            row = self.conn.execute(
+                "SELECT t.id, t.document_id, t.strategy_id, t.attempts, d.name, d.text, d.schema "
+                "FROM tasks t JOIN documents d ON d.id = t.document_id "
+                "WHERE t.status = ? OR (t.status = ? AND t.lease_until < ?) "
+                "ORDER BY t.id LIMIT 1",
+                (TaskStatus.PENDING, TaskStatus.LEASED, now)
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute(
+                "UPDATE tasks SET status = ?, worker_id = ?, lease_until = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (TaskStatus.LEASED, worker_id, now + visibility_timeout, now, row["id"])
+            )
+
+        return LeasedTask(
+            task_id=row["id"],
+            document_id=row["document_id"],
+            document_name=row["name"],
+            strategy_id=row["strategy_id"],
+            text=row["text"],
+            extraction_schema=json.loads(row["schema"]) if row["schema"] else None,
+            attempts=row["attempts"] + 1
+        )
+
+    def heartbeat(self, task_id: int, worker_id: str, visibility_timeout: float = 300.0) -> bool:
+        """
+        Extend a lease held by this worker.
+
+        Returns:
+            False if the lease was lost to another worker
+        """
+        now = time.time()
+        cursor = self.conn.execute(
+            "UPDATE tasks SET lease_until = ?, updated_at = ? "
+            "WHERE id = ? AND worker_id = ? AND status = ?",
+            (now + visibility_timeout, now, task_id, worker_id, TaskStatus.LEASED)
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, task_id: int, worker_id: str, result: ExtractionResult) -> bool:
+        """
+        Store the result of a leased task.
+
+        Returns:
+            False if the lease was lost and the result discarded
+        """
+        cursor = self.conn.execute(
+            "UPDATE tasks SET status = ?, result = ?, error = NULL, lease_until = NULL, updated_at = ? "
+            "WHERE id = ? AND worker_id = ? AND status = ?",
+            (TaskStatus.DONE, result.model_dump_json(), time.time(), task_id, worker_id, TaskStatus.LEASED)
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, task_id: int, worker_id: str, error: str) -> None:
+        """Release a leased task after an error, failing it once attempts run out."""
+        self.conn.execute(
+            "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+            "error = ?, lease_until = NULL, updated_at = ? "
+            "WHERE id = ? AND worker_id = ? AND status = ?",
+            (self.max_attempts, TaskStatus.FAILED, TaskStatus.PENDING,
+             error, time.time(), task_id, worker_id, TaskStatus.LEASED)
+        )
+
+    def counts(self) -> Dict[str, int]:
+        """Number of tasks per status."""
+        rows = self.conn.execute("SELECT status, COUNT(*) AS n FROM tasks GROUP BY status").fetchall()
+        counts = {status: 0 for status in (TaskStatus.PENDING, TaskStatus.LEASED, TaskStatus.DONE, TaskStatus.FAILED)}
+        counts.update({row["status"]: row["n"] for row in rows})
+        return counts
+
+    def is_drained(self) -> bool:
+        """Whether every task has finished (done or failed)."""
+        counts = self.counts()
+        return counts[TaskStatus.PENDING] == 0 and counts[TaskStatus.LEASED] == 0
+
+    def documents(self) -> List[Dict[str, Any]]:
+        """All enqueued documents (without their text)."""
+        rows = self.conn.execute("SELECT id, name, created_at FROM documents ORDER BY id").fetchall()
+        return [dict(row) for row in rows]
+
+    def results(self, document_id: int) -> List[ExtractionResult]:
+        """
+        Collect results for a document in task order.
+
+        Tasks that failed permanently are returned as error results.
+        """
+        rows = self.conn.execute(
+            "SELECT strategy_id, status, result, error FROM tasks WHERE document_id = ? ORDER BY id",
+            (document_id,)
+        ).fetchall()
+
+        results = []
+        for row in rows:
+            if row["status"] == TaskStatus.DONE:
+                results.append(ExtractionResult.model_validate_json(row["result"]))
+            elif row["status"] == TaskStatus.FAILED:
+                results.append(ExtractionResult(
+                    strategy_name=row["strategy_id"],
+                    strategy_id=row["strategy_id"],
+                    extracted_data={},
+                    execution_time=0.0,
+                    token_count=0,
+                    cost=0.0,
+                    error=row["error"] or "Task failed"
+                ))
+        return results
+
+    def _transaction(self):
+        return _ImmediateTransaction(self.conn)
+
+
+class _ImmediateTransaction:
+    """BEGIN IMMEDIATE ... COMMIT, so concurrent leases cannot pick the same task."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
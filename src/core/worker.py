@@ -0,0 +1,160 @@
+import asyncio
+import multiprocessing
+import os
+import socket
+from pathlib import Path
+from typing import Dict, Optional
+from .base_strategy import BaseExtractionStrategy
+from .llm_provider import create_llm_client, LLMProvider
+from .scheduler import ExtractionScheduler
+from .work_queue import WorkQueue, LeasedTask
+
+
+def default_worker_id() -> str:
+    """Worker ID unique across hosts sharing a queue file."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class QueueWorker:
+    """Leases tasks from a WorkQueue and runs them through the strategies."""
+
+    def __init__(
+        self,
+        queue: WorkQueue,
+        strategies: Dict[str, BaseExtractionStrategy],
+        worker_id: Optional[str] = None,
+        concurrency: int = 5,
+        visibility_timeout: float = 300.0,
+        poll_interval: float = 1.0,
+        max_tokens: int = 4096,
+        temperature: float = 0.0,
+        strategy_timeout: Optional[float] = None
+    ):
+        self.queue = queue
+        self.strategies = strategies
+        self.worker_id = worker_id or default_worker_id()
+        self.concurrency = concurrency
+        self.visibility_timeout = visibility_timeout
+        self.poll_interval = poll_interval
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.strategy_timeout = strategy_timeout
+        self.scheduler = ExtractionScheduler(concurrency)
+        self.processed = 0
+
+    async def run(self, exit_when_drained: bool = True) -> int:
+        """
+        Process tasks until the queue is drained (or forever).
+
+        Returns:
+            Number of tasks processed by this worker
+        """
+        in_flight = set()
+        while True:
+            while len(in_flight) < self.concurrency:
+                task = self.queue.lease(self.worker_id, self.visibility_timeout)
+                if task is None:
+                    break
+                in_flight.add(asyncio.ensure_future(self._process(task)))
+
+            if in_flight:
+                _, in_flight = await asyncio.wait(
+                    in_flight, timeout=self.poll_interval, return_when=asyncio.FIRST_COMPLETED
+                )
+            elif exit_when_drained and self.queue.is_drained():
+                return self.processed
+            else:
+                # Other workers hold the remaining leases; wait in case they die
+                await asyncio.sleep(self.poll_interval)
+
+    async def _process(self, task: LeasedTask) -> None:
+        strategy = self.strategies.get(task.strategy_id)
+        if strategy is None:
+            self.queue.fail(task.task_id, self.worker_id, f"Strategy not found: {task.strategy_id}")
+            return
+
+        heartbeat = asyncio.ensure_future(self._heartbeat(task.task_id))
+        try:
+            result = await self.scheduler.run(lambda: strategy.extract(
+                task.text,
+                task.extraction_schema,
+                self.max_tokens,
+                self.temperature,
+                timeout=self.strategy_timeout
+            ))
+        except Exception as e:
+            self.queue.fail(task.task_id, self.worker_id, str(e))
+            return
+        finally:
+            heartbeat.cancel()
+
+        # Strategies report provider errors in the result rather than raising;
+        # those are retried (up to max_attempts), timeouts are recorded as is
+        if result.error and not result.timed_out:
+            self.queue.fail(task.task_id, self.worker_id, result.error)
+            return
+
+        self.queue.complete(task.task_id, self.worker_id, result)
+        self.processed += 1
+
+    async def _heartbeat(self, task_id: int) -> None:
+        """Keep extending the lease while a long extraction runs."""
+        while True:
+            await asyncio.sleep(self.visibility_timeout / 3)
+            if not self.queue.heartbeat(task_id, self.worker_id, self.visibility_timeout):
+                return
+
+
+def run_worker_process(
+    queue_path: str | Path,
+    provider: str = "gemini",
+    api_key: Optional[str] = None,
+    model: Optional[str] = None,
+    concurrency: int = 5,
+    visibility_timeout: float = 300.0,
+    strategy_timeout: Optional[float] = None,
+    exit_when_drained: bool = True,
+    wal: bool = True
+) -> int:
+    """
+    Entry point for one worker process.
+
+    wal is passed to WorkQueue; turn it off when the queue file is shared
+    between hosts over a network filesystem.
+
+    Returns:
+        Number of tasks processed
+    """
+    from ..strategies.strategy_registry import get_all_strategies
+
+    client = create_llm_client(LLMProvider(provider), api_key=api_key, model=model)
+    strategies = {s.metadata.id: s for s in get_all_strategies(client)}
+    queue = WorkQueue(queue_path, wal=wal)
+    try:
+        worker = QueueWorker(
+            queue,
+            strategies,
+            concurrency=concurrency,
+            visibility_timeout=visibility_timeout,
+            strategy_timeout=strategy_timeout
+        )
+        return asyncio.run(worker.run(exit_when_drained))
+    finally:
+        queue.close()
+
+
+def start_workers(num_workers: int, queue_path: str | Path, **worker_kwargs) -> None:
+    """Run num_workers worker processes against a queue and wait for them to exit."""
+    processes = [
+        multiprocessing.Process(
+            target=run_worker_process,
+            args=(str(queue_path),),
+            kwargs=worker_kwargs,
+            daemon=False
+        )
+        for _ in range(num_workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
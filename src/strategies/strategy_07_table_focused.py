@@ -23,7 +23,7 @@ Document:
 {document_text}
 
 Instructions:
-- Identify any tables or structured data
+- Identify any tables or structured data (tables may appear as comma-separated rows under a header line)
 - Extract row and column information
 - Preserve relationships between data points
 - Format as JSON with clear structure
@@ -48,8 +48,12 @@ Return well-formed XML with appropriate tags for all extracted data."""
         """Convert XML element to dictionary."""
         result = {}
         for child in element:
-            if len(child) == 0:
-                result[child.tag] = child.text
+            value = child.text if len(child) == 0 else self._xml_to_dict(child)
+            if child.tag in result:
+                # Repeated tags (e.g. <Item> line items) become a list
+                if not isinstance(result[child.tag], list):
+                    result[child.tag] = [result[child.tag]]
+                result[child.tag].append(value)
             else:
-                result[child.tag] = self._xml_to_dict(child)
+                result[child.tag] = value
         return result if result else element.text
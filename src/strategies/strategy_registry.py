@@ -1,90 +1,146 @@
-from typing import List
+import importlib
+import warnings
+from importlib.metadata import entry_points
+from typing import Dict, List, Optional, Tuple, Type
 from ..core.base_strategy import BaseExtractionStrategy
 from ..core.llm_provider import BaseLLMClient
+from ..core.models import StrategyMetadata
 
-# Import all strategies
-from .strategy_01_basic import BasicExtractionStrategy
-from .strategy_02_structured import StructuredExtractionStrategy
-from .strategy_03_cot import ChainOfThoughtStrategy
-from .strategy_04_role_expert import RoleExpertStrategy
-from .strategy_05_few_shot import FewShotStrategy
-from .strategy_06_step_by_step import StepByStepStrategy
-from .strategy_07_table_focused import TableFocusedStrategy
-from .strategy_08_entity_focused import EntityFocusedStrategy
-from .strategy_09_minimal import MinimalStrategy
-from .strategy_10_verbose import VerboseStrategy
-from .strategy_11_context_aware import ContextAwareStrategy
-from .strategy_12_xml_format import XMLFormatStrategy
-from .strategy_13_confidence_scoring import ConfidenceScoringStrategy
-from .strategy_14_multi_pass import MultiPassStrategy
-from .strategy_15_template_matching import TemplateMatchingStrategy
-from .strategy_16_key_value_pairs import KeyValuePairStrategy
-from .strategy_17_semantic_extraction import SemanticExtractionStrategy
-from .strategy_18_prioritized import PrioritizedExtractionStrategy
-from .strategy_19_comparative import ComparativeStrategy
-from .strategy_20_hybrid import HybridStrategy
-
-
-def get_all_strategies(client: BaseLLMClient, model: str = "") -> List[BaseExtractionStrategy]:
-    """Get all available extraction strategies."""
-    return [
-        BasicExtractionStrategy(client, model),
-        StructuredExtractionStrategy(client, model),
-        ChainOfThoughtStrategy(client, model),
-        RoleExpertStrategy(client, model),
-        FewShotStrategy(client, model),
-        StepByStepStrategy(client, model),
-        TableFocusedStrategy(client, model),
-        EntityFocusedStrategy(client, model),
-        MinimalStrategy(client, model),
-        VerboseStrategy(client, model),
-        ContextAwareStrategy(client, model),
-        XMLFormatStrategy(client, model),
-        ConfidenceScoringStrategy(client, model),
-        MultiPassStrategy(client, model),
-        TemplateMatchingStrategy(client, model),
-        KeyValuePairStrategy(client, model),
-        SemanticExtractionStrategy(client, model),
-        PrioritizedExtractionStrategy(client, model),
-        ComparativeStrategy(client, model),
-        HybridStrategy(client, model),
-    ]
-
-
-def get_strategy_by_id(strategy_id: str, client: BaseLLMClient, model: str = "") -> BaseExtractionStrategy:
-    """Get a specific strategy by ID."""
-    strategies = get_all_strategies(client, model)
-    for strategy in strategies:
-        if strategy.metadata.id == strategy_id:
-            return strategy
-    raise ValueError(f"Strategy not found: {strategy_id}")
+# Built-in strategies by ID: (module in this package, class name). Modules
+# are imported the first time their strategy is used
+BUILTIN_STRATEGIES: Dict[str, Tuple[str, str]] = {
+    "strategy_01": ("strategy_01_basic", "BasicExtractionStrategy"),
+    "strategy_02": ("strategy_02_structured", "StructuredExtractionStrategy"),
+    "strategy_03": ("strategy_03_cot", "ChainOfThoughtStrategy"),
+    "strategy_04": ("strategy_04_role_expert", "RoleExpertStrategy"),
+    "strategy_05": ("strategy_05_few_shot", "FewShotStrategy"),
+    "strategy_06": ("strategy_06_step_by_step", "StepByStepStrategy"),
+    "strategy_07": ("strategy_07_table_focused", "TableFocusedStrategy"),
+    "strategy_08": ("strategy_08_entity_focused", "EntityFocusedStrategy"),
+    "strategy_09": ("strategy_09_minimal", "MinimalStrategy"),
+    "strategy_10": ("strategy_10_verbose", "VerboseStrategy"),
+    "strategy_11": ("strategy_11_context_aware", "ContextAwareStrategy"),
+    "strategy_12": ("strategy_12_xml_format", "XMLFormatStrategy"),
+    "strategy_13": ("strategy_13_confidence_scoring", "ConfidenceScoringStrategy"),
+    "strategy_14": ("strategy_14_multi_pass", "MultiPassStrategy"),
+    "strategy_15": ("strategy_15_template_matching", "TemplateMatchingStrategy"),
+    "strategy_16": ("strategy_16_key_value_pairs", "KeyValuePairStrategy"),
+    "strategy_17": ("strategy_17_semantic_extraction", "SemanticExtractionStrategy"),
+    "strategy_18": ("strategy_18_prioritized", "PrioritizedExtractionStrategy"),
+    "strategy_19": ("strategy_19_comparative", "ComparativeStrategy"),
+    "strategy_20": ("strategy_20_hybrid", "HybridStrategy"),
+}
 
+# Installed packages add strategies by exposing BaseExtractionStrategy
+# subclasses under this entry point group, e.g. in pyproject.toml:
+#   [project.entry-points."document_extraction.strategies"]
+#   my_strategy = "my_package.strategies:MyStrategy"
+ENTRY_POINT_GROUP = "document_extraction.strategies"
 
-def list_strategies() -> None:
-    """Print all available strategies."""
-    from ..core.llm_provider import create_llm_client, LLMProvider
-    import os
-    from dotenv import load_dotenv
 
-    load_dotenv()
+class StrategyRegistry:
+    """
+    Strategy classes indexed by ID.
+
+    Nothing is imported or instantiated up front: a built-in strategy's
+    module is imported when it is first asked for, third-party strategies
+    are discovered from entry points when the registry is first listed or
+    searched, and metadata is read once per class without a client.
+    Instances are created per call and bound to a client only if one is
+    given; the engine binds its own client to strategies created without one.
+    """
+
+    def __init__(self, discover_plugins: bool = True):
+        self._locations: Dict[str, Tuple[str, str]] = dict(BUILTIN_STRATEGIES)
+        self._classes: Dict[str, Type[BaseExtractionStrategy]] = {}
+        self._metadata: Dict[str, StrategyMetadata] = {}
+        self._discovered = not discover_plugins
+
+    def register(self, strategy_class: Type[BaseExtractionStrategy]) -> str:
+        """
+        Add a strategy class; a class with the ID of an existing one replaces it.
+
+        Returns:
+            The strategy's ID
+        """
+        metadata = strategy_class(None).metadata
+        self._locations.pop(metadata.id, None)
+        self._classes[metadata.id] = strategy_class
+        self._metadata[metadata.id] = metadata
+        return metadata.id
+
+    def _discover(self) -> None:
+        if self._discovered:
+            return
+        self._discovered = True
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            try:
+                strategy_class = entry_point.load()
+                if not (isinstance(strategy_class, type) and issubclass(strategy_class, BaseExtractionStrategy)):
+                    raise TypeError("not a BaseExtractionStrategy subclass")
+                self.register(strategy_class)
+            except Exception as e:
+                # A broken plugin must not take the built-in strategies down with it
+                warnings.warn(f"Skipping strategy plugin {entry_point.name}: {e}")
+
+    def ids(self) -> List[str]:
+        """IDs of all strategies: built-ins in order, then plugins."""
+        self._discover()
+        return list(dict.fromkeys([*BUILTIN_STRATEGIES, *self._classes]))
+
+    def get_class(self, strategy_id: str) -> Type[BaseExtractionStrategy]:
+        """The class of a strategy, importing its module on first use."""
+        if strategy_id not in self._classes:
+            if strategy_id not in self._locations:
+                self._discover()
+            if strategy_id in self._classes:
+                return self._classes[strategy_id]
+            if strategy_id not in self._locations:
+                raise ValueError(f"Strategy not found: {strategy_id}")
+            module_name, class_name = self._locations[strategy_id]
+            module = importlib.import_module(f"{__package__}.{module_name}")
+            self._classes[strategy_id] = getattr(module, class_name)
+        return self._classes[strategy_id]
+
+    def metadata(self, strategy_id: str) -> StrategyMetadata:
+        """A strategy's metadata, read once without a client."""
+        if strategy_id not in self._metadata:
+            self._metadata[strategy_id] = self.get_class(strategy_id)(None).metadata
+        return self._metadata[strategy_id]
 
-    # Try to create client with available API key
-    try:
-        client = create_llm_client(LLMProvider.GEMINI)
-    except:
-        try:
-            client = create_llm_client(LLMProvider.ANTHROPIC)
-        except:
-            # Dummy client for listing only
-            from ..core.llm_provider import GeminiClient
-            client = GeminiClient(api_key="dummy")
+    def all_metadata(self) -> List[StrategyMetadata]:
+        """Metadata of every strategy, in ID order."""
+        return [self.metadata(strategy_id) for strategy_id in self.ids()]
 
-    strategies = get_all_strategies(client)
+    def create(
+        self,
+        strategy_id: str,
+        client: Optional[BaseLLMClient] = None,
+        model: str = ""
+    ) -> BaseExtractionStrategy:
+        """A new instance of a strategy, bound to client if given."""
+        return self.get_class(strategy_id)(client, model)
 
+
+registry = StrategyRegistry()
+
+
+def get_all_strategies(client: Optional[BaseLLMClient], model: str = "") -> List[BaseExtractionStrategy]:
+    """Get all available extraction strategies."""
+    return [registry.create(strategy_id, client, model) for strategy_id in registry.ids()]
+
+
+def get_strategy_by_id(strategy_id: str, client: Optional[BaseLLMClient] = None, model: str = "") -> BaseExtractionStrategy:
+    """Get a specific strategy by ID; only its own module is imported."""
+    return registry.create(strategy_id, client, model)
+
+
+def list_strategies() -> None:
+    """Print all available strategies."""
+    # Metadata needs no client, so no provider SDK is imported
     print("\nAvailable Extraction Strategies:")
     print("=" * 80)
-    for strategy in strategies:
-        meta = strategy.metadata
+    for meta in registry.all_metadata():
         print(f"\n{meta.id}: {meta.name}")
         print(f"  Category: {meta.category}")
         print(f"  Description: {meta.description}")
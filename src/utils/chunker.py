@@ -0,0 +1,127 @@
+import re
+from typing import List, Tuple
+from .document_loader import PAGE_BREAK
+
+# Numbered headings ("3. Payment", "4.2 Late Fees") and named divisions
+# ("Section 4", "Schedule B", markdown "## Terms")
+NUMBERED_HEADING = re.compile(r"^\d+(\.\d+)*[.)]?\s+[A-Z][^.]{0,58}$")
+NAMED_HEADING = re.compile(
+    r"^(#{1,6}\s+\S|(section|article|clause|schedule|appendix|annex|exhibit|part)\s+[\dA-Z])",
+    re.IGNORECASE
+)
+
+
+def is_section_heading(line: str) -> bool:
+    """Whether a line looks like a section heading."""
+    line = line.strip()
+    if not line or len(line) > 60:
+        return False
+    # Short ALL-CAPS titles ("TERMS AND CONDITIONS"), but not amounts ("TOTAL: $3,780.00")
+    if line.isupper() and sum(c.isalpha() for c in line) >= 3 and not any(c.isdigit() for c in line):
+        return True
+    return bool(NAMED_HEADING.match(line) or NUMBERED_HEADING.match(line))
+
+
+def split_page_sections(text: str) -> List[Tuple[int, str]]:
+    """
+    Split text into sections on page breaks and section headings.
+
+    Page breaks always start a new section; within a page a new section
+    starts at each heading line.
+
+    Returns:
+        (page_number, section) pairs, pages numbered from 1 by page break
+    """
+    sections = []
+    for page_number, page in enumerate(text.split(PAGE_BREAK), start=1):
+        current: List[str] = []
+        for line in page.split("\n"):
+            if current and is_section_heading(line):
+                sections.append((page_number, "\n".join(current).strip()))
+                current = []
+            current.append(line)
+        if current:
+            sections.append((page_number, "\n".join(current).strip()))
+    return [(page_number, section) for page_number, section in sections if section]
+
+
+def split_sections(text: str) -> List[str]:
+    """Split text into sections on page breaks and section headings."""
+    return [section for _, section in split_page_sections(text)]
+
+
+class DocumentChunker:
+    """Splits long documents into overlapping chunks on natural boundaries."""
+
+    def __init__(self, max_chars: int = 12000, overlap_chars: int = 500):
+        if overlap_chars >= max_chars:
+            raise ValueError("overlap_chars must be smaller than max_chars")
+        self.max_chars = max_chars
+        self.overlap_chars = overlap_chars
+
+    def chunk(self, text: str) -> List[str]:
+        """
+        Split text into chunks of at most max_chars (plus overlap).
+
+        Sections are packed greedily; sections longer than a chunk are split
+        on line boundaries. Each chunk after the first starts with the last
+        overlap_chars of the previous chunk (snapped to a line start) so
+        fields straddling a boundary are seen whole at least once.
+        """
+        return [chunk for chunk, _, _ in self.chunk_pages(text)]
+
+    def chunk_pages(self, text: str) -> List[Tuple[str, int, int]]:
+        """
+        Split text like chunk(), also reporting the pages each chunk covers.
+
+        Returns:
+            (chunk, first_page, last_page) tuples; pages are counted by
+            PAGE_BREAK and exclude the overlap taken from the previous chunk
+        """
+        if len(text) <= self.max_chars:
+            return [(text, 1, text.count(PAGE_BREAK) + 1)]
+
+        chunks: List[Tuple[str, int, int]] = []
+        current: List[str] = []
+        current_len = 0
+        first_page = last_page = 1
+
+        for page_number, unit in self._units(text):
+            if current and current_len + len(unit) + 1 > self.max_chars:
+                chunks.append(("\n".join(current), first_page, last_page))
+                current, current_len = [], 0
+            if not current:
+                first_page = page_number
+            current.append(unit)
+            current_len += len(unit) + 1
+            last_page = page_number
+        if current:
+            chunks.append(("\n".join(current), first_page, last_page))
+
+        if self.overlap_chars <= 0:
+            return chunks
+        return [chunks[0]] + [
+            (self._tail(previous) + "\n" + chunk, first, last)
+            for (previous, _, _), (chunk, first, last) in zip(chunks, chunks[1:])
+        ]
+
+    def _units(self, text: str) -> List[Tuple[int, str]]:
+        """Sections with their page, oversized sections broken into line groups."""
+        units = []
+        for page_number, section in split_page_sections(text):
+            if len(section) <= self.max_chars:
+                units.append((page_number, section))
+                continue
+            for line in section.split("\n"):
+                while len(line) > self.max_chars:
+                    units.append((page_number, line[:self.max_chars]))
+                    line = line[self.max_chars:]
+                units.append((page_number, line))
+        return units
+
+    def _tail(self, chunk: str) -> str:
+        tail = chunk[-self.overlap_chars:]
+        newline = tail.find("\n")
+        if 0 <= newline < len(tail) - 1:
+            tail = tail[newline + 1:]
+        return tail
@@ -0,0 +1,154 @@
+import re
+import unicodedata
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+from pydantic import BaseModel
+from .document_loader import PAGE_BREAK
+from .tokens import estimate_tokens
+
+# Characters NFKC leaves alone that still cost tokens for no information
+UNICODE_REPLACEMENTS = str.maketrans({
+    "\u2018": "'", "\u2019": "'", "\u201a": "'", "\u201b": "'",
+    "\u201c": '"', "\u201d": '"', "\u201e": '"',
+    "\u2010": "-", "\u2011": "-", "\u2012": "-", "\u2013": "-", "\u2014": "-", "\u2212": "-",
+    "\u2022": "*", "\u00b7": "*",
+    # Zero-width characters, BOM and soft hyphen
+    "\u200b": None, "\u200c": None, "\u200d": None, "\u2060": None, "\ufeff": None, "\u00ad": None,
+})
+LEADER = re.compile(r"\s*(\.\s?){3,}\s*|\s*\u2026{2,}\s*|\s*_{3,}\s*")
+RULE_LINE = re.compile(r"^[\s\-=_*~.]{3,}$")
+COLUMN_GAP = re.compile(r"[ \t]{2,}")
+DIGITS = re.compile(r"\d+")
+
+
+class CompactionConfig(BaseModel):
+    """Which compaction stages to run."""
+    normalize_unicode: bool = True
+    strip_repeated_lines: bool = True
+    # A header/footer line must appear on at least this many pages (and half of them)
+    min_repeat_pages: int = 3
+    # Only this many lines at the top and bottom of each page are header/footer candidates
+    edge_lines: int = 3
+    remove_leaders: bool = True
+    collapse_table_whitespace: bool = True
+    column_delimiter: str = " | "
+    dedupe_paragraphs: bool = True
+    # Shorter repeated lines (e.g. "Qty", "Total") are legitimate and kept
+    min_paragraph_chars: int = 80
+
+
+class DocumentCompactor:
+    """Token-minimizing cleanup of loaded document text."""
+
+    def __init__(self, config: CompactionConfig | None = None):
+        self.config = config or CompactionConfig()
+
+    def compact(self, text: str) -> Tuple[str, Dict[str, Any]]:
+        """
+        Run the enabled compaction stages.
+
+        Returns:
+            Tuple of (compacted_text, stats) where stats holds per-stage counts
+            and the measured token reduction
+        """
+        config = self.config
+        original_tokens = estimate_tokens(text)
+        stats: Dict[str, Any] = {"original_chars": len(text), "original_tokens": original_tokens}
+
+        if config.normalize_unicode:
+            text = self.normalize_unicode(text)
+        if config.strip_repeated_lines:
+            text, stats["repeated_lines_removed"] = self.strip_repeated_lines(text)
+        if config.remove_leaders:
+            text, stats["leader_lines_changed"] = self.remove_leaders(text)
+        if config.collapse_table_whitespace:
+            text, stats["table_lines_collapsed"] = self.collapse_table_whitespace(text)
+        if config.dedupe_paragraphs:
+            text, stats["duplicate_paragraphs_removed"] = self.dedupe_paragraphs(text)
+
+        compacted_tokens = estimate_tokens(text)
+        stats.update({
+            "compacted_chars": len(text),
+            "compacted_tokens": compacted_tokens,
+            "reduction": 1 - compacted_tokens / original_tokens if original_tokens else 0.0,
+        })
+        return text, stats
+
+    @staticmethod
+    def normalize_unicode(text: str) -> str:
+        """NFKC-normalize (ligatures, full-width forms, nbsp) and map typographic punctuation to ASCII."""
+        return unicodedata.normalize("NFKC", text).translate(UNICODE_REPLACEMENTS)
+
+    def strip_repeated_lines(self, text: str) -> Tuple[str, int]:
+        """Remove header/footer lines repeated at the top or bottom of most pages."""
+        pages = [page.split("\n") for page in text.split(PAGE_BREAK)]
+        min_pages = max(self.config.min_repeat_pages, (len(pages) + 1) // 2)
+        if len(pages) < min_pages:
+            return text, 0
+
+        # Digits are masked so "Page 3 of 10" matches "Page 4 of 10"
+        def key(line: str) -> str:
+            return DIGITS.sub("#", line.strip().lower())
+
+        edge = self.config.edge_lines
+        counts: Counter = Counter()
+        for lines in pages:
+            content = [line for line in lines if line.strip()]
+            counts.update({key(line) for line in content[:edge] + content[-edge:]})
+        repeated = {k for k, n in counts.items() if n >= min_pages and k}
+
+        removed = 0
+        kept_pages = []
+        for lines in pages:
+            content_positions = [i for i, line in enumerate(lines) if line.strip()]
+            edge_positions = set(content_positions[:edge] + content_positions[-edge:])
+            kept = []
+            for i, line in enumerate(lines):
+                if i in edge_positions and key(line) in repeated:
+                    removed += 1
+                else:
+                    kept.append(line)
+            kept_pages.append("\n".join(kept))
+        return PAGE_BREAK.join(kept_pages), removed
+
+    @staticmethod
+    def remove_leaders(text: str) -> Tuple[str, int]:
+        """Drop rule lines (-----, =====) and shrink dotted/underscore leaders to a space."""
+        changed = 0
+        lines = []
+        for line in text.split("\n"):
+            if line != PAGE_BREAK and RULE_LINE.match(line):
+                changed += 1
+                continue
+            new_line = LEADER.sub(" ", line)
+            if new_line != line:
+                changed += 1
+            lines.append(new_line)
+        return "\n".join(lines), changed
+
+    def collapse_table_whitespace(self, text: str) -> Tuple[str, int]:
+        """Replace column-aligning runs of spaces with a compact delimiter."""
+        collapsed = 0
+        lines = []
+        for line in text.split("\n"):
+            stripped = line.strip(" \t")
+            if COLUMN_GAP.search(stripped):
+                line = COLUMN_GAP.sub(self.config.column_delimiter, stripped)
+                collapsed += 1
+            lines.append(line)
+        return "\n".join(lines), collapsed
+
+    def dedupe_paragraphs(self, text: str) -> Tuple[str, int]:
+        """Keep only the first occurrence of long repeated lines (boilerplate)."""
+        seen = set()
+        removed = 0
+        lines: List[str] = []
+        for line in text.split("\n"):
+            if len(line) >= self.config.min_paragraph_chars:
+                normalized = " ".join(line.lower().split())
+                if normalized in seen:
+                    removed += 1
+                    continue
+                seen.add(normalized)
+            lines.append(line)
+        return "\n".join(lines), removed
@@ -1,24 +1,182 @@
+import io
+import os
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
-import pypdf
-from PIL import Image
-import pytesseract
-from ..core.models import DocumentType
+from typing import TYPE_CHECKING, BinaryIO, Iterable, Iterator, List, Optional, Tuple, Union
+from ..core.models import DocumentType, ExtractedTable, LoadedDocument
+from .text_cache import TextCache
+from .ocr_preprocessing import OCRPreprocessConfig
+from .table_extractor import extract_tables
 
-try:
-    from docx import Document
-    DOCX_AVAILABLE = True
-except ImportError:
-    DOCX_AVAILABLE = False
+# Parsing backends (pypdf, Pillow, pytesseract, python-docx, pypdfium2) are
+# imported on first use so importing this module, and everything that needs
+# PAGE_BREAK, stays cheap
+if TYPE_CHECKING:
+    import pypdf
+    from PIL import Image
+
+# Marks page boundaries in loaded text (kept by preprocess_text) so chunking
+# can split on pages
+PAGE_BREAK = "\f"
+
+# A document given as a path, raw bytes (e.g. an upload) or a binary stream
+DocumentSource = Union[str, Path, bytes, BinaryIO]
+
+# Part of the text cache key; bump when loading output changes
+LOADER_VERSION = "5"
+
+# PDFs shorter than this are not worth starting worker processes for
+PARALLEL_MIN_PAGES = 32
+
+# A page whose text layer has fewer visible characters than this is treated
+# as scanned and OCR'd
+MIN_TEXT_LAYER_CHARS = 16
+# Resolution scanned pages are rendered at for OCR (with pypdfium2)
+OCR_DPI = 300
+
+# Sizes of the DIB headers that follow a BMP file header (BITMAPCOREHEADER
+# through BITMAPV5HEADER)
+BMP_DIB_HEADER_SIZES = {12, 40, 52, 56, 64, 108, 124}
+
+
+def has_text_layer(text: str) -> bool:
+    """Whether extracted page text is substantial enough to skip OCR."""
+    return sum(1 for c in text if not c.isspace()) >= MIN_TEXT_LAYER_CHARS
+
+
+def _readable(source: str | Path | bytes):
+    """Something parsers can open: a path, or the bytes wrapped in a stream."""
+    return io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+
+
+def _is_bmp(data: bytes) -> bool:
+    # "BM" alone also starts plain text ("BMW invoice"), so the rest of the
+    # file header must hold up: zero reserved bytes and a known DIB header size
+    if len(data) < 18 or not data.startswith(b"BM"):
+        return False
+    reserved = int.from_bytes(data[6:10], "little")
+    dib_header_size = int.from_bytes(data[14:18], "little")
+    return reserved == 0 and dib_header_size in BMP_DIB_HEADER_SIZES
+
+
+def sniff_document_type(data: bytes) -> Optional[DocumentType]:
+    """Detect document type from file content (magic numbers), or None if unknown."""
+    if data.startswith(b"%PDF-"):
+        return DocumentType.PDF
+    if data.startswith((b"\x89PNG\r\n\x1a\n", b"\xff\xd8\xff", b"II*\x00", b"MM\x00*")) or _is_bmp(data):
+        return DocumentType.IMAGE
+    if data.startswith(b"PK\x03\x04"):
+        try:
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                if "word/document.xml" in archive.namelist():
+                    return DocumentType.DOCX
+        except zipfile.BadZipFile:
+            pass
+        return None
+    if b"\x00" in data[:4096]:
+        return None
+    try:
+        data[:4096].decode("utf-8")
+    except UnicodeDecodeError as e:
+        # A multi-byte character may straddle the cut-off
+        if e.start < 4096 - 4:
+            return None
+    return DocumentType.TEXT
+
+
+def _page_text(page: "pypdf.PageObject", layout: bool = False) -> str:
+    if layout:
+        return page.extract_text(extraction_mode="layout") or ""
+    return page.extract_text() or ""
+
+
+def _extract_page_range(source: str | bytes, start: int, stop: int, layout: bool = False) -> List[str]:
+    """Text of pages start..stop-1 (0-based); runs in worker processes."""
+    import pypdf
+    reader = pypdf.PdfReader(_readable(source))
+    return [_page_text(reader.pages[i], layout) for i in range(start, stop)]
+
+
+class PdfPageRenderer:
+    """
+    A PDF opened once for rendering pages to OCR, one page per call.
+
+    With pypdfium2 installed each page is rendered at OCR_DPI; otherwise the
+    page's embedded images are used, which for scanned documents is the scan
+    itself. Neither backend is thread-safe, so rendering is serialized while
+    callers OCR the rendered images in parallel.
+    """
+
+    def __init__(self, file_path: str | Path | bytes):
+        try:
+            import pypdfium2 as pdfium
+        except ImportError:
+            pdfium = None
+        self._lock = threading.Lock()
+        self._pdf = None
+        self._reader = None
+        if pdfium is not None:
+            self._pdf = pdfium.PdfDocument(file_path if isinstance(file_path, (bytes, bytearray)) else str(file_path))
+        else:
+            import pypdf
+            self._reader = pypdf.PdfReader(_readable(file_path))
+
+    def images(self, page_number: int) -> List["Image.Image"]:
+        """Images to OCR for one 1-based page."""
+        with self._lock:
+            if self._pdf is not None:
+                return [self._pdf[page_number - 1].render(scale=OCR_DPI / 72).to_pil()]
+            return [image.image for image in self._reader.pages[page_number - 1].images]
+
+    def close(self) -> None:
+        if self._pdf is not None:
+            self._pdf.close()
+
+    def __enter__(self) -> "PdfPageRenderer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
 
 
 class DocumentLoader:
     """Handles loading and preprocessing documents."""
 
+    # Shared cache of parsed text; None disables caching
+    cache: Optional[TextCache] = None
+    # Worker processes used by load() for large PDFs; 1 extracts pages serially
+    pdf_workers: int = 1
+    # OCR PDF pages that have no text layer, using this many threads
+    ocr_pdfs: bool = True
+    ocr_workers: int = 4
+    # Rewrite column-aligned PDF tables as compact CSV. Off by default: it
+    # extracts every page in pypdf's slower layout mode and changes the text
+    # strategies see. DOCX tables are always extracted (they are marked up)
+    extract_tables: bool = False
+    # Image cleanup before OCR; None sends images to Tesseract unchanged
+    ocr_preprocessing: Optional[OCRPreprocessConfig] = OCRPreprocessConfig()
+
+    @staticmethod
+    def configure_cache(directory: Optional[str | Path], max_bytes: int = 512 * 1024 * 1024) -> Optional[TextCache]:
+        """
+        Enable (or with directory=None, disable) the on-disk text cache.
+
+        Args:
+            directory: Cache directory
+            max_bytes: Size limit; least recently used entries are evicted beyond it
+
+        Returns:
+            The configured cache
+        """
+        DocumentLoader.cache = TextCache(directory, max_bytes) if directory else None
+        return DocumentLoader.cache
+
     @staticmethod
-    def detect_document_type(file_path: Path) -> DocumentType:
+    def detect_document_type(file_path: str | Path) -> DocumentType:
         """Detect document type from file extension."""
-        suffix = file_path.suffix.lower()
+        suffix = Path(file_path).suffix.lower()
         if suffix == '.pdf':
             return DocumentType.PDF
         elif suffix in ['.png', '.jpg', '.jpeg', '.tiff', '.bmp']:
@@ -31,39 +189,242 @@ class DocumentLoader:
             raise ValueError(f"Unsupported file type: {suffix}")
 
     @staticmethod
-    def load_text_file(file_path: Path) -> str:
+    def load_text_file(file_path: Path | bytes) -> str:
         """Load plain text file."""
+        if isinstance(file_path, (bytes, bytearray)):
+            return bytes(file_path).decode('utf-8')
         with open(file_path, 'r', encoding='utf-8') as f:
             return f.read()
 
     @staticmethod
-    def load_pdf(file_path: Path) -> str:
-        """Extract text from PDF file."""
-        text_parts = []
-        with open(file_path, 'rb') as f:
-            pdf_reader = pypdf.PdfReader(f)
-            for page in pdf_reader.pages:
-                text = page.extract_text()
-                if text:
-                    text_parts.append(text)
-        return "\n\n".join(text_parts)
-
-    @staticmethod
-    def load_image(file_path: Path) -> str:
-        """Extract text from image using OCR."""
-        image = Image.open(file_path)
-        text = pytesseract.image_to_string(image)
-        return text
+    def iter_pdf_pages(
+        file_path: str | Path | bytes,
+        pages: Optional[Iterable[int]] = None,
+        max_pages: Optional[int] = None,
+        layout: bool = False
+    ) -> Iterator[Tuple[int, str]]:
+        """
+        Lazily yield the text of PDF pages.
+
+        Only one page's text is held at a time, so callers can stop early or
+        stream very long PDFs.
+
+        Args:
+            file_path: Path to PDF file, or its bytes
+            pages: Optional 1-based page numbers to extract (e.g. range(1, 11));
+                pages past the end of the document are skipped
+            max_pages: Optional maximum number of pages to yield
+            layout: Preserve the page layout (column alignment) with spaces
+
+        Yields:
+            Tuples of (page_number, page_text); page_text is "" for pages
+            without a text layer
+        """
+        import pypdf
+        reader = pypdf.PdfReader(_readable(file_path))
+        page_count = len(reader.pages)
+        numbers = pages if pages is not None else range(1, page_count + 1)
+        yielded = 0
+        for number in numbers:
+            if max_pages is not None and yielded >= max_pages:
+                break
+            if not 1 <= number <= page_count:
+                continue
+            yield number, _page_text(reader.pages[number - 1], layout)
+            yielded += 1
 
     @staticmethod
-    def load_docx(file_path: Path) -> str:
+    def load_pdf_pages_parallel(
+        file_path: str | Path | bytes,
+        workers: Optional[int] = None,
+        layout: bool = False
+    ) -> List[str]:
+        """
+        Extract all page texts across a process pool, in page order.
+
+        Pages are sharded into one contiguous range per worker; each worker
+        parses the PDF independently.
+
+        Args:
+            file_path: Path to PDF file, or its bytes (sent to each worker)
+            workers: Number of worker processes (default: CPU count)
+            layout: Preserve the page layout (column alignment) with spaces
+
+        Returns:
+            Page texts, index i holding page i + 1
+        """
+        import pypdf
+        if not isinstance(file_path, (bytes, bytearray)):
+            file_path = str(file_path)
+        page_count = len(pypdf.PdfReader(_readable(file_path)).pages)
+        workers = max(1, min(workers or os.cpu_count() or 1, page_count))
+        if workers == 1:
+            return _extract_page_range(file_path, 0, page_count, layout)
+
+        bounds = [page_count * i // workers for i in range(workers + 1)]
+        with ProcessPoolExecutor(workers) as executor:
+            shards = executor.map(
+                _extract_page_range,
+                [file_path] * workers, bounds[:-1], bounds[1:], [layout] * workers
+            )
+            return [text for shard in shards for text in shard]
+
+    @staticmethod
+    def ocr_image(image: "Image.Image") -> str:
+        """Preprocess one image (see ocr_preprocessing) and run Tesseract on it."""
+        import pytesseract
+        from .ocr_preprocessing import preprocess_image
+        if DocumentLoader.ocr_preprocessing is not None:
+            image = preprocess_image(image, DocumentLoader.ocr_preprocessing)
+        return pytesseract.image_to_string(image)
+
+    @staticmethod
+    def ocr_scanned_pages(file_path: str | Path | bytes, page_texts: List[str], workers: Optional[int] = None) -> List[str]:
+        """
+        Replace the text of pages without a usable text layer with OCR output.
+
+        Born-digital pages are left untouched. Scanned pages are OCR'd
+        concurrently in a thread pool (Tesseract runs as a subprocess, so
+        threads run in parallel); each worker renders its own page from the
+        PDF opened once (see PdfPageRenderer), so at most one rendered page
+        per worker is held in memory.
+
+        Args:
+            file_path: Path to PDF file, or its bytes
+            page_texts: Text layer of each page, index i holding page i + 1
+            workers: OCR threads (default: ocr_workers)
+
+        Returns:
+            Page texts with scanned pages filled in
+        """
+        scanned = [i for i, text in enumerate(page_texts) if not has_text_layer(text)]
+        if not scanned:
+            return page_texts
+
+        import pytesseract
+        workers = workers or DocumentLoader.ocr_workers
+        page_texts = list(page_texts)
+        try:
+            with PdfPageRenderer(file_path) as renderer, ThreadPoolExecutor(workers) as executor:
+                def ocr_page(i: int) -> str:
+                    images = renderer.images(i + 1)
+                    return "\n".join(DocumentLoader.ocr_image(image).strip() for image in images).strip()
+
+                for i, ocr_text in zip(scanned, executor.map(ocr_page, scanned)):
+                    if ocr_text:
+                        page_texts[i] = ocr_text
+        except pytesseract.TesseractNotFoundError:
+            # Without Tesseract, scanned pages keep their (empty) text layer
+            pass
+        return page_texts
+
+    @staticmethod
+    def load_pdf_pages(
+        file_path: Path | bytes,
+        workers: Optional[int] = None,
+        ocr: Optional[bool] = None,
+        layout: bool = False
+    ) -> List[str]:
+        """
+        Extract the text of every PDF page.
+
+        Args:
+            file_path: Path to PDF file, or its bytes
+            workers: Worker processes for large PDFs (default: pdf_workers)
+            ocr: OCR pages without a text layer (default: ocr_pdfs)
+            layout: Preserve the page layout (column alignment) with spaces
+
+        Returns:
+            Page texts, index i holding page i + 1; "" for pages without text
+        """
+        import pypdf
+        workers = workers or DocumentLoader.pdf_workers
+        if workers > 1 and len(pypdf.PdfReader(_readable(file_path)).pages) >= PARALLEL_MIN_PAGES:
+            page_texts = DocumentLoader.load_pdf_pages_parallel(file_path, workers, layout)
+        else:
+            page_texts = [text for _, text in DocumentLoader.iter_pdf_pages(file_path, layout=layout)]
+
+        if DocumentLoader.ocr_pdfs if ocr is None else ocr:
+            page_texts = DocumentLoader.ocr_scanned_pages(file_path, page_texts)
+        return page_texts
+
+    @staticmethod
+    def load_pdf(file_path: Path | bytes, workers: Optional[int] = None, ocr: Optional[bool] = None) -> str:
+        """
+        Extract text from PDF file.
+
+        Pages are separated by PAGE_BREAK lines. Pages without text are kept
+        empty, so page N of the result is page N of the PDF.
+
+        Args:
+            file_path: Path to PDF file, or its bytes
+            workers: Worker processes for large PDFs (default: pdf_workers)
+            ocr: OCR pages without a text layer (default: ocr_pdfs)
+        """
+        return f"\n{PAGE_BREAK}\n".join(DocumentLoader.load_pdf_pages(file_path, workers, ocr))
+
+    @staticmethod
+    def load_pdf_with_tables(file_path: Path | bytes) -> Tuple[str, List[ExtractedTable]]:
+        """
+        Extract PDF text with column-aligned tables rewritten as compact CSV.
+
+        Pages are extracted with their layout preserved so table columns can
+        be detected; other lines are collapsed to single spaces.
+
+        Returns:
+            Tuple of (text, tables)
+        """
+        page_texts = []
+        tables: List[ExtractedTable] = []
+        for number, page_text in enumerate(DocumentLoader.load_pdf_pages(file_path, layout=True), start=1):
+            page_text, page_tables = extract_tables(page_text, page=number)
+            page_texts.append(page_text)
+            tables.extend(page_tables)
+        return f"\n{PAGE_BREAK}\n".join(page_texts), tables
+
+    @staticmethod
+    def load_image(file_path: Path | bytes, workers: Optional[int] = None) -> str:
+        """
+        Extract text from image using OCR.
+
+        Multi-frame images (e.g. multi-page TIFF scans) are split into frames
+        OCR'd concurrently and joined as pages.
+
+        Args:
+            file_path: Path to image file, or its bytes
+            workers: OCR threads for multi-frame images (default: ocr_workers)
+        """
+        from PIL import Image, ImageSequence
+        with Image.open(_readable(file_path)) as image:
+            frames = [frame.copy() for frame in ImageSequence.Iterator(image)]
+        if len(frames) == 1:
+            return DocumentLoader.ocr_image(frames[0])
+
+        with ThreadPoolExecutor(workers or DocumentLoader.ocr_workers) as executor:
+            texts = list(executor.map(DocumentLoader.ocr_image, frames))
+        return f"\n{PAGE_BREAK}\n".join(text.strip() for text in texts)
+
+    @staticmethod
+    def load_docx(file_path: Path | bytes) -> str:
         """Extract text from DOCX file."""
-        if not DOCX_AVAILABLE:
+        return DocumentLoader.load_docx_with_tables(file_path)[0]
+
+    @staticmethod
+    def load_docx_with_tables(file_path: Path | bytes) -> Tuple[str, List[ExtractedTable]]:
+        """
+        Extract DOCX paragraphs, then tables as compact CSV (header row once).
+
+        Returns:
+            Tuple of (text, tables)
+        """
+        try:
+            from docx import Document
+        except ImportError:
             raise ImportError(
                 "python-docx is not installed. Install it with: pip install python-docx"
             )
 
-        doc = Document(file_path)
+        doc = Document(_readable(file_path))
         text_parts = []
 
         # Extract text from paragraphs
@@ -72,53 +433,119 @@ class DocumentLoader:
                 text_parts.append(paragraph.text)
 
         # Extract text from tables
+        tables = []
         for table in doc.tables:
+            rows = []
             for row in table.rows:
-                row_text = []
+                # Merged cells repeat the same cell object across the columns they span
+                cells, seen = [], set()
                 for cell in row.cells:
-                    if cell.text.strip():
-                        row_text.append(cell.text.strip())
-                if row_text:
-                    text_parts.append(" | ".join(row_text))
+                    if id(cell._tc) not in seen:
+                        seen.add(id(cell._tc))
+                        cells.append(" ".join(cell.text.split()))
+                if any(cells):
+                    rows.append(cells)
+            if not rows:
+                continue
+            extracted = ExtractedTable(header=rows[0], rows=rows[1:]) if len(rows) > 1 else ExtractedTable(rows=rows)
+            tables.append(extracted)
+            text_parts.append(extracted.to_csv())
 
-        return "\n".join(text_parts)
+        return "\n".join(text_parts), tables
 
     @staticmethod
-    def load(file_path: str | Path) -> tuple[str, DocumentType]:
+    def load(file_path: DocumentSource, filename: Optional[str] = None) -> tuple[str, DocumentType]:
         """
         Load document and return text content with document type.
 
         Args:
-            file_path: Path to document file
+            file_path: Path to document file, or its content as bytes or a
+                binary stream (e.g. an upload), whose type is sniffed from
+                the content
+            filename: Optional original file name, used to detect the type
+                of in-memory content that cannot be sniffed
 
         Returns:
             Tuple of (text_content, document_type)
         """
-        file_path = Path(file_path)
+        document = DocumentLoader.load_document(file_path, filename)
+        return document.text, document.doc_type
+
+    @staticmethod
+    def load_document(file_path: DocumentSource, filename: Optional[str] = None) -> LoadedDocument:
+        """
+        Load document text together with its page count and tables.
 
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
+        Args:
+            file_path: Path to document file, or its content as bytes or a
+                binary stream
+            filename: Optional original file name for in-memory content
 
-        doc_type = DocumentLoader.detect_document_type(file_path)
+        Returns:
+            Loaded document
+        """
+        if isinstance(file_path, (str, Path)):
+            file_path = Path(file_path)
+            if not file_path.exists():
+                raise FileNotFoundError(f"File not found: {file_path}")
+            doc_type = DocumentLoader.detect_document_type(file_path)
+        else:
+            if not isinstance(file_path, (bytes, bytearray)):
+                file_path = file_path.read()
+            doc_type = sniff_document_type(file_path)
+            if doc_type is None:
+                if not filename:
+                    raise ValueError("Unsupported file type: content not recognized")
+                doc_type = DocumentLoader.detect_document_type(filename)
+
+        # Parsing PDFs, images and DOCX is slow; identical bytes are parsed once
+        cache = DocumentLoader.cache
+        key = None
+        if cache is not None and doc_type != DocumentType.TEXT:
+            preprocessing = DocumentLoader.ocr_preprocessing
+            options = {
+                "doc_type": doc_type.value,
+                "ocr": DocumentLoader.ocr_pdfs,
+                "ocr_preprocessing": preprocessing.model_dump() if preprocessing else None,
+                "tables": DocumentLoader.extract_tables,
+            }
+            content = file_path if isinstance(file_path, (bytes, bytearray)) else file_path.read_bytes()
+            key = TextCache.make_key(content, LOADER_VERSION, options)
+            cached = cache.get(key)
+            if cached is not None:
+                return LoadedDocument.model_validate(cached)
 
-        if doc_type == DocumentType.PDF:
+        tables: List[ExtractedTable] = []
+        if doc_type == DocumentType.PDF and DocumentLoader.extract_tables:
+            text, tables = DocumentLoader.load_pdf_with_tables(file_path)
+        elif doc_type == DocumentType.PDF:
             text = DocumentLoader.load_pdf(file_path)
         elif doc_type == DocumentType.IMAGE:
             text = DocumentLoader.load_image(file_path)
         elif doc_type == DocumentType.TEXT:
             text = DocumentLoader.load_text_file(file_path)
         elif doc_type == DocumentType.DOCX:
-            text = DocumentLoader.load_docx(file_path)
+            text, tables = DocumentLoader.load_docx_with_tables(file_path)
         else:
             raise ValueError(f"Unsupported document type: {doc_type}")
 
-        return text, doc_type
+        document = LoadedDocument(
+            text=text,
+            doc_type=doc_type,
+            pages=text.count(PAGE_BREAK) + 1,
+            tables=tables
+        )
+        if key is not None:
+            cache.put(key, document.model_dump(mode="json"))
+        return document
 
     @staticmethod
     def preprocess_text(text: str, max_length: Optional[int] = None) -> str:
         """
         Preprocess text (clean up whitespace, truncate if needed).
 
+        Page break lines are preserved.
+
         Args:
             text: Raw text content
             max_length: Optional maximum length to truncate to
@@ -127,7 +554,7 @@ class DocumentLoader:
             Preprocessed text
         """
         # Remove excessive whitespace
-        lines = [line.strip() for line in text.split('\n')]
+        lines = [line if line == PAGE_BREAK else line.strip() for line in text.split('\n')]
         text = '\n'.join(line for line in lines if line)
 
         # Truncate if needed
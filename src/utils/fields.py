@@ -0,0 +1,113 @@
+import re
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+NON_ALNUM = re.compile(r"[^a-z0-9]+")
+CAMEL_BOUNDARY = re.compile(r"([a-z0-9])([A-Z])")
+# "$2,500.00", "2500 usd" style amounts: a number with thousands separators and
+# an optional currency symbol or code (matched against lowercased text)
+CURRENCY = r"(?:[$\u20ac\u00a3\u00a5]|usd|eur|gbp|jpy|chf|cad|aud|czk)"
+AMOUNT = re.compile(rf"^{CURRENCY}?\s*(-?\d[\d,]*(\.\d+)?)\s*{CURRENCY}?$")
+# Cheap screen so only date-shaped strings reach strptime: 2024-01-15,
+# 01/15/2024, 15.01.2024, Jan 15, 2024, 15th January 2024
+DATE_SHAPE = re.compile(
+    r"^(\d{4}-\d{1,2}-\d{1,2}(t[\d:.]+z?)?|\d{1,4}[/.]\d{1,2}[/.]\d{1,4}"
+    r"|[a-z]{3,9}\.? \d{1,2}(st|nd|rd|th)?,? \d{4}|\d{1,2}(st|nd|rd|th)? [a-z]{3,9}\.?,? \d{4})$"
+)
+ORDINAL = re.compile(r"(\d)(st|nd|rd|th)\b")
+# Tried in order; month-first before day-first, as in US invoices
+DATE_FORMATS = [
+    "%Y/%m/%d", "%Y.%m.%d", "%m/%d/%Y", "%d/%m/%Y", "%d.%m.%Y", "%m/%d/%y", "%d.%m.%y",
+    "%B %d, %Y", "%b %d, %Y", "%B %d %Y", "%b %d %Y", "%d %B %Y", "%d %b %Y",
+]
+
+
+def normalize_key(key: str) -> str:
+    """Canonical field name: "InvoiceNumber", "invoice number" and "invoice_number" all match."""
+    return NON_ALNUM.sub("_", CAMEL_BOUNDARY.sub(r"\1_\2", str(key)).lower()).strip("_")
+
+
+def find_key(data: Dict[str, Any], key: str) -> Any:
+    """data[key], falling back to a key that normalizes the same ("LineItems" for "line_items")."""
+    if key in data:
+        return data[key]
+    wanted = normalize_key(key)
+    for candidate, value in data.items():
+        if normalize_key(candidate) == wanted:
+            return value
+    return None
+
+
+def flatten_fields(data: Any, prefix: str = "") -> Dict[str, Any]:
+    """
+    Flatten nested extracted data into path-addressed leaf fields.
+
+    Keys are normalized; list elements are addressed by index, e.g.
+    {"Bill To": {"name": "X"}, "items": [{"qty": 1}]} becomes
+    {"bill_to.name": "X", "items[0].qty": 1}. Empty containers are kept as
+    leaves so their presence still counts.
+    """
+    if isinstance(data, dict) and data:
+        flat: Dict[str, Any] = {}
+        for key, value in data.items():
+            path = f"{prefix}.{normalize_key(key)}" if prefix else normalize_key(key)
+            flat.update(flatten_fields(value, path))
+        return flat
+    if isinstance(data, list) and data:
+        flat = {}
+        for index, value in enumerate(data):
+            flat.update(flatten_fields(value, f"{prefix}[{index}]"))
+        return flat
+    return {prefix: data} if prefix else {}
+
+
+def parse_date(value: str) -> Optional[str]:
+    """ISO 8601 form (YYYY-MM-DD) of a date written in a common format, or None."""
+    text = " ".join(value.lower().split())
+    if not DATE_SHAPE.match(text):
+        return None
+    if text[4:5] == "-":
+        try:
+            return datetime.fromisoformat(text.upper()).date().isoformat()
+        except ValueError:
+            return None
+    text = ORDINAL.sub(r"\1", text).replace(".,", ",").replace(". ", " ")
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+def parse_number(value: str) -> Optional[float]:
+    """The number in an amount such as "$2,500.00" or "2500 USD", or None."""
+    match = AMOUNT.match(" ".join(value.lower().split()))
+    if not match:
+        return None
+    try:
+        return float(match.group(1).replace(",", ""))
+    except ValueError:
+        return None
+
+
+def normalize_value(value: Any) -> str:
+    """
+    Canonical string form of a leaf value for equality voting.
+
+    Strings are lowercased with whitespace collapsed; amounts such as
+    "$2,500.00" and numbers such as 2500.0 both become "2500", and dates
+    such as "Jan 15, 2024" become "2024-01-15".
+    """
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        number = float(value)
+        return str(int(number)) if number.is_integer() else repr(number)
+    text = " ".join(str(value).lower().split())
+    number = parse_number(text)
+    if number is not None:
+        return normalize_value(number)
+    return parse_date(text) or text
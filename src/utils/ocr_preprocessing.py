@@ -0,0 +1,122 @@
+from typing import TYPE_CHECKING, List, Optional
+from pydantic import BaseModel
+
+# Pillow is imported on first use; the config is needed at import time by the loader
+if TYPE_CHECKING:
+    from PIL import Image
+
+
+class OCRPreprocessConfig(BaseModel):
+    """Which image preprocessing stages run before OCR."""
+    # Scans above this resolution are scaled down to it (Tesseract works best near 300 dpi)
+    target_dpi: int = 300
+    # Images without DPI metadata (e.g. phone photos) are scaled so the long side fits
+    max_side: int = 3500
+    grayscale: bool = True
+    binarize: bool = True
+    deskew: bool = True
+    # Skew search range and step in degrees
+    max_skew: float = 5.0
+    skew_step: float = 0.5
+
+
+def downscale(image: "Image.Image", target_dpi: int, max_side: int, dpi: Optional[tuple] = None) -> "Image.Image":
+    """Scale oversized images down to target_dpi, or to max_side without DPI metadata."""
+    from PIL import Image
+    dpi = dpi or image.info.get("dpi")
+    scale = 1.0
+    if dpi and dpi[0] and dpi[0] > target_dpi:
+        scale = target_dpi / float(dpi[0])
+    if max(image.size) * scale > max_side:
+        scale = max_side / max(image.size)
+    if scale >= 1.0:
+        return image
+    size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+    return image.resize(size, Image.LANCZOS)
+
+
+def otsu_threshold(image: "Image.Image") -> int:
+    """Gray level that best separates ink from background (Otsu's method)."""
+    histogram = image.histogram()[:256]
+    total = sum(histogram)
+    weighted_total = sum(level * count for level, count in enumerate(histogram))
+
+    best_level, best_variance = 127, -1.0
+    background = background_sum = 0.0
+    for level, count in enumerate(histogram):
+        background += count
+        if background == 0:
+            continue
+        foreground = total - background
+        if foreground == 0:
+            break
+        background_sum += level * count
+        mean_background = background_sum / background
+        mean_foreground = (weighted_total - background_sum) / foreground
+        variance = background * foreground * (mean_background - mean_foreground) ** 2
+        if variance > best_variance:
+            best_level, best_variance = level, variance
+    return best_level
+
+
+def binarize(image: "Image.Image") -> "Image.Image":
+    """Black text on white using an Otsu threshold."""
+    threshold = otsu_threshold(image)
+    return image.point(lambda value: 255 if value > threshold else 0)
+
+
+def _row_profile_variance(image: "Image.Image") -> float:
+    from PIL import Image
+    # Averaging each row to one pixel gives the ink profile; text lines that
+    # run horizontally make it peaky, so its variance peaks at zero skew
+    rows: List[int] = list(image.resize((1, image.height), Image.BOX).tobytes())
+    mean = sum(rows) / len(rows)
+    return sum((value - mean) ** 2 for value in rows) / len(rows)
+
+
+def estimate_skew(image: "Image.Image", max_skew: float = 5.0, step: float = 0.5) -> float:
+    """
+    Angle in degrees that straightens the text lines of a grayscale image.
+
+    Searches rotations within +-max_skew on a reduced copy for the one
+    maximizing the variance of the row ink profile.
+    """
+    from PIL import Image
+    sample = image.convert("L")
+    if max(sample.size) > 1000:
+        sample = sample.copy()
+        sample.thumbnail((1000, 1000))
+
+    best_angle, best_score = 0.0, -1.0
+    steps = int(max_skew / step)
+    for i in range(-steps, steps + 1):
+        angle = i * step
+        rotated = sample.rotate(angle, resample=Image.BILINEAR, fillcolor=255)
+        score = _row_profile_variance(rotated)
+        if score > best_score:
+            best_angle, best_score = angle, score
+    return best_angle
+
+
+def preprocess_image(image: "Image.Image", config: Optional[OCRPreprocessConfig] = None) -> "Image.Image":
+    """
+    Prepare an image for OCR.
+
+    Stages run in order: EXIF orientation, downscale, grayscale, deskew,
+    binarize. Deskew runs before binarizing so the rotation is interpolated
+    on gray levels.
+    """
+    from PIL import Image, ImageOps
+    config = config or OCRPreprocessConfig()
+    dpi = image.info.get("dpi")
+    image = ImageOps.exif_transpose(image)
+    image = downscale(image, config.target_dpi, config.max_side, dpi)
+    if config.grayscale or config.binarize or config.deskew:
+        image = image.convert("L")
+    if config.deskew:
+        angle = estimate_skew(image, config.max_skew, config.skew_step)
+        if angle:
+            image = image.rotate(angle, resample=Image.BICUBIC, expand=True, fillcolor=255)
+    if config.binarize:
+        image = binarize(image)
+    return image
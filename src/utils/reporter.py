@@ -3,11 +3,65 @@ from pathlib import Path
 import json
 from datetime import datetime
 from ..core.models import ComparisonReport, ExtractionResult, ValidationMetrics
+from ..core.events import ExtractionEvent, EventType
 
 
 class ResultReporter:
     """Generates reports from extraction results."""
 
+    @staticmethod
+    def print_event(event: ExtractionEvent) -> None:
+        """Print engine progress events to console (subscribe to an EventBus)."""
+        data = event.data
+        if event.type == EventType.RUN_STARTED and "documents" in data:
+            print(f"Running {data['strategies']} strategies on {data['documents']} documents "
+                  f"in {data['batches']} batches...\n")
+        elif event.type == EventType.RUN_STARTED:
+            print(f"Loaded {data['document_type']} document: {data['document_name']}")
+            print(f"Document length: {data['document_length']} characters")
+            if data.get("tables"):
+                print(f"Tables: {data['tables']} (as CSV)")
+            compaction = data["preprocessing"].get("compaction")
+            if compaction:
+                print(f"Compaction: {compaction['original_tokens']} -> {compaction['compacted_tokens']} tokens "
+                      f"({compaction['reduction']:.0%} fewer)")
+            pruning = data["preprocessing"].get("relevance_pruning")
+            if pruning:
+                print(f"Relevance pruning kept {pruning['sections_kept']}/{pruning['sections_total']} sections "
+                      f"({pruning['reduction']:.0%} fewer tokens)")
+            if data["chunks"] > 1:
+                print(f"Split into {data['chunks']} chunks")
+            print(f"Running {data['strategies']} strategies...\n")
+        elif event.type == EventType.STARTED:
+            chunk = ""
+            if data.get("chunks", 1) > 1:
+                pages = data.get("pages")
+                page_range = f", pages {pages[0]}-{pages[1]}" if pages else ""
+                chunk = f" (chunk {data['chunk'] + 1}/{data['chunks']}{page_range})"
+            print(f"Running: {data['strategy_name']}{chunk}", flush=True)
+        elif event.type == EventType.RETRIED:
+            print(f"  ⏳ Rate limited, retrying in {data['delay']}s...", flush=True)
+        elif event.type == EventType.FAILED:
+            print(f"  X Error: {data['error']}", flush=True)
+        elif event.type == EventType.REPAIRED:
+            fields = f" ({', '.join(data['fields'])})" if data["fields"] else ""
+            print(f"  ↻ Repaired{fields} in {data['execution_time']:.2f}s, cost: ${data['cost']:.4f}", flush=True)
+        elif event.type == EventType.COMPLETED:
+            early = " (stopped once schema fields were complete)" if data["result"].stopped_early else ""
+            print(f"  ✓ Completed in {data['execution_time']:.2f}s, cost: ${data['cost']:.4f}{early}", flush=True)
+            # Show extracted data preview
+            data_str = json.dumps(data["result"].extracted_data, indent=2, ensure_ascii=False)
+            if len(data_str) > 300:
+                data_str = data_str[:300] + "..."
+            print(f"  Data preview: {data_str}", flush=True)
+        elif event.type == EventType.RUN_COMPLETED:
+            if data.get("consensus_reached"):
+                print(f"\n✓ Strategies agreed, remaining strategies cancelled")
+            elif data["timed_out"]:
+                print(f"\n⏱ Run deadline reached, {data['timed_out']} strategies timed out")
+            else:
+                print(f"\n✓ All strategies completed")
+
     @staticmethod
     def print_summary(report: ComparisonReport) -> None:
         """Print summary to console."""
@@ -32,6 +86,8 @@ class ResultReporter:
             status = "OK" if not result.error else "FAIL"
             print(f"\n[{status}] {result.strategy_name} (ID: {result.strategy_id})")
             print(f"   Time: {result.execution_time:.2f}s | Cost: ${result.cost:.4f} | Tokens: {result.token_count}")
+            if result.repaired:
+                print(f"   Repair: {result.repair_time:.2f}s | Cost: ${result.repair_cost:.4f} | Tokens: {result.repair_tokens}")
 
             if result.error:
                 print(f"   Error: {result.error}")
@@ -41,6 +97,11 @@ class ResultReporter:
                 if len(data_str) > 200:
                     data_str = data_str[:200] + "..."
                 print(f"   Data: {data_str}")
+                check = result.schema_check
+                if check and not check.valid:
+                    problems = [f"missing {', '.join(check.missing_fields)}"] if check.missing_fields else []
+                    problems += [f"{path} {reason}" for path, reason in check.invalid_fields.items()]
+                    print(f"   Schema: {'; '.join(problems)}")
 
             # Show validation metrics if available
             if result.strategy_id in report.validation_metrics:
@@ -95,6 +156,50 @@ class ResultReporter:
 
         return filepath
 
+    @staticmethod
+    def print_corpus_summary(summary: Dict[str, Any]) -> None:
+        """Print per-strategy corpus aggregates (see CorpusEvaluation.summary)."""
+        print("\n" + "=" * 80)
+        print(f"CORPUS EVALUATION ({summary['documents']} documents)")
+        print("=" * 80)
+        confidence = summary["confidence"]
+        front = set(summary["pareto_front"])
+        ranked = sorted(summary["strategies"].items(), key=lambda item: item[1]["accuracy"], reverse=True)
+        for strategy_id, row in ranked:
+            low, high = row["accuracy_ci"]
+            marker = "*" if strategy_id in front else " "
+            print(f"{marker} {row['strategy_name']} (ID: {strategy_id})")
+            print(f"   Accuracy: {row['accuracy']:.2%} ({confidence:.0%} CI {low:.2%}-{high:.2%}) | "
+                  f"Completeness: {row['completeness']:.2%} | Failures: {row['failure_rate']:.2%}")
+            print(f"   Cost: ${row['total_cost']:.4f} | Mean time: {row['mean_time']:.2f}s")
+        print("\n* Pareto front (accuracy vs. cost): " + ", ".join(summary["pareto_front"]))
+        print("=" * 80)
+
+    @staticmethod
+    def print_sequential_summary(summary: Dict[str, Any]) -> None:
+        """Print the state of a sequential comparison (see SequentialComparison.summary)."""
+        print("\n" + "=" * 80)
+        print(f"SEQUENTIAL EVALUATION ({summary['confidence']:.0%} confidence)")
+        print("=" * 80)
+        ranked = sorted(summary["strategies"].items(), key=lambda item: item[1]["accuracy"], reverse=True)
+        for strategy_id, row in ranked:
+            print(f"{strategy_id}: Accuracy {row['accuracy']:.2%} over {row['documents']} documents "
+                  f"({row['status']})")
+        print("=" * 80)
+
+    @staticmethod
+    def save_corpus_summary(summary: Dict[str, Any], output_dir: str | Path) -> Path:
+        """Save corpus aggregates as JSON."""
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filepath = output_dir / f"corpus_summary_{timestamp}.json"
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+
+        return filepath
+
     @staticmethod
     def generate_comparison_table(results: List[ExtractionResult]) -> str:
         """Generate a comparison table string."""
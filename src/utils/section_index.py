@@ -0,0 +1,132 @@
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+from .chunker import split_sections
+from .tokens import estimate_tokens
+
+WORD = re.compile(r"[a-z0-9]+")
+
+# Schema values that name a type rather than describe the field
+TYPE_WORDS = {"string", "str", "number", "float", "int", "integer", "bool", "boolean",
+              "date", "datetime", "list", "array", "object", "dict", "currency", "any"}
+
+
+def tokenize(text: str) -> List[str]:
+    return WORD.findall(text.lower())
+
+
+def field_query(name: str, description: Any = None) -> List[str]:
+    """Query terms for a schema field: its name split on _ and camelCase, plus any description."""
+    words = re.sub(r"([a-z])([A-Z])", r"\1 \2", name).replace("_", " ").replace("-", " ")
+    terms = tokenize(words)
+    if isinstance(description, str) and description.strip().lower() not in TYPE_WORDS:
+        terms += tokenize(description)
+    return terms
+
+
+class SectionIndex:
+    """In-memory BM25 index over document sections."""
+
+    def __init__(self, sections: List[str], k1: float = 1.5, b: float = 0.75):
+        self.sections = sections
+        self.k1 = k1
+        self.b = b
+        self.term_freqs = [Counter(tokenize(section)) for section in sections]
+        self.lengths = [sum(tf.values()) for tf in self.term_freqs]
+        self.avg_length = (sum(self.lengths) / len(self.lengths)) if sections else 0.0
+        doc_freq: Counter = Counter()
+        for tf in self.term_freqs:
+            doc_freq.update(tf.keys())
+        n = len(sections)
+        self.idf = {term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in doc_freq.items()}
+
+    def scores(self, query: List[str]) -> List[float]:
+        """BM25 score of every section for a query."""
+        scores = []
+        for tf, length in zip(self.term_freqs, self.lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / self.avg_length) if self.avg_length else self.k1
+            score = 0.0
+            for term in query:
+                freq = tf.get(term)
+                if freq:
+                    score += self.idf[term] * freq * (self.k1 + 1) / (freq + norm)
+            scores.append(score)
+        return scores
+
+    def search(self, query: List[str], top_k: int = 5) -> List[Tuple[int, float]]:
+        """Top-k (section index, score) pairs with a positive score."""
+        ranked = sorted(enumerate(self.scores(query)), key=lambda item: -item[1])
+        return [(i, score) for i, score in ranked[:top_k] if score > 0]
+
+
+def select_relevant_sections(
+    text: str,
+    fields: Dict[str, Optional[str]],
+    top_k: int = 8,
+    token_budget: int = 2000
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Keep only the sections relevant to the given fields.
+
+    Each field is queried separately and sections are taken round-robin
+    across the fields' rankings, so every field gets its best sections
+    before any field gets its second best, until top_k sections or the
+    token budget is reached. Kept sections are returned in document order.
+    Text already under the budget is returned unchanged.
+
+    Args:
+        text: Document text
+        fields: Field name -> description (or None), e.g. a compiled
+            schema's descriptions (see SchemaValidator.descriptions)
+        top_k: Maximum number of sections kept
+        token_budget: Maximum tokens kept
+
+    Returns:
+        Tuple of (pruned_text, stats)
+    """
+    original_tokens = estimate_tokens(text)
+    sections = split_sections(text)
+    stats: Dict[str, Any] = {
+        "original_chars": len(text),
+        "original_tokens": original_tokens,
+        "sections_total": len(sections),
+    }
+
+    queries = [q for q in (field_query(name, description) for name, description in fields.items()) if q]
+    if original_tokens <= token_budget or not sections or not queries:
+        return text, {**stats, "pruned_chars": len(text), "pruned_tokens": original_tokens,
+                      "sections_kept": len(sections), "reduction": 0.0}
+
+    index = SectionIndex(sections)
+    rankings = [index.search(query, top_k) for query in queries]
+
+    kept: List[int] = []
+    used_tokens = 0
+    for rank in range(top_k):
+        for ranking in rankings:
+            if rank >= len(ranking) or len(kept) >= top_k:
+                continue
+            section_id = ranking[rank][0]
+            if section_id in kept:
+                continue
+            cost = estimate_tokens(sections[section_id])
+            if used_tokens + cost > token_budget and kept:
+                continue
+            kept.append(section_id)
+            used_tokens += cost
+
+    if not kept:
+        # Nothing matched any field; pruning would only lose information
+        return text, {**stats, "pruned_chars": len(text), "pruned_tokens": original_tokens,
+                      "sections_kept": len(sections), "reduction": 0.0}
+
+    pruned = "\n".join(sections[i] for i in sorted(kept))
+    pruned_tokens = estimate_tokens(pruned)
+    return pruned, {
+        **stats,
+        "pruned_chars": len(pruned),
+        "pruned_tokens": pruned_tokens,
+        "sections_kept": len(kept),
+        "reduction": 1 - pruned_tokens / original_tokens,
+    }
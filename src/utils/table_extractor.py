@@ -0,0 +1,95 @@
+import re
+from typing import List, Optional, Tuple
+from ..core.models import ExtractedTable
+
+# A cell is a run of words separated by single spaces; 2+ spaces separate cells
+CELL = re.compile(r"\S+(?: \S+)*")
+DIGIT = re.compile(r"\d")
+
+
+def split_cells(line: str) -> List[Tuple[int, str]]:
+    """Cells of a column-aligned line with their character offsets."""
+    return [(match.start(), match.group()) for match in CELL.finditer(line)]
+
+
+def _assign(cells: List[Tuple[int, str]], columns: List[int]) -> Optional[List[str]]:
+    """Place cells in the nearest column by offset; None if two cells collide."""
+    row = [""] * len(columns)
+    for start, text in cells:
+        column = min(range(len(columns)), key=lambda c: abs(columns[c] - start))
+        if row[column]:
+            return None
+        row[column] = text
+    return row
+
+
+def find_tables(lines: List[str], min_rows: int = 3) -> List[Tuple[int, int, ExtractedTable]]:
+    """
+    Detect column-aligned tables in layout-preserving text.
+
+    A table is a run of lines (single blank lines allowed in between) that
+    each split into at least two cells on 2+ space gaps, whose cells line up
+    with the columns of the first line, and whose data rows contain numbers.
+    The first line becomes the header if it has no digits.
+
+    Returns:
+        (first_line, last_line, table) for each table, in order
+    """
+    tables = []
+    i = 0
+    while i < len(lines):
+        first = split_cells(lines[i])
+        if len(first) < 2:
+            i += 1
+            continue
+        columns = [start for start, _ in first]
+        rows = [[text for _, text in first]]
+        last = j = i
+        while j + 1 < len(lines):
+            j += 1
+            if not lines[j].strip():
+                if j + 1 < len(lines) and lines[j + 1].strip():
+                    continue
+                break
+            cells = split_cells(lines[j])
+            row = _assign(cells, columns) if 2 <= len(cells) <= len(columns) else None
+            if row is None:
+                break
+            rows.append(row)
+            last = j
+
+        header = rows[0] if not any(DIGIT.search(cell) for cell in rows[0]) else []
+        body = rows[1:] if header else rows
+        if len(rows) >= min_rows and body and all(any(DIGIT.search(cell) for cell in row) for row in body):
+            tables.append((i, last, ExtractedTable(header=header, rows=body)))
+            i = last + 1
+        else:
+            i += 1
+    return tables
+
+
+def extract_tables(text: str, page: Optional[int] = None) -> Tuple[str, List[ExtractedTable]]:
+    """
+    Rewrite column-aligned tables in page text as compact CSV.
+
+    Lines outside tables have their alignment whitespace collapsed.
+
+    Args:
+        text: Layout-preserving text of one page
+        page: Page number recorded on the tables
+
+    Returns:
+        Tuple of (rewritten_text, tables)
+    """
+    lines = text.split("\n")
+    tables = []
+    output = []
+    position = 0
+    for first, last, table in find_tables(lines):
+        output.extend(" ".join(line.split()) for line in lines[position:first])
+        table.page = page
+        tables.append(table)
+        output.append(table.to_csv())
+        position = last + 1
+    output.extend(" ".join(line.split()) for line in lines[position:])
+    return "\n".join(output), tables
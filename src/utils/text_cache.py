@@ -0,0 +1,112 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class TextCache:
+    """
+    Bounded on-disk cache of loaded document text, keyed by content hash.
+
+    Each entry is a small JSON file named by its key. Hits refresh the file's
+    modification time and eviction removes the least recently used files
+    until the cache fits its size limit. Writes go through a temp file and
+    os.replace, so several processes (e.g. API workers) can share a directory.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int = 512 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        self._size = sum(path.stat().st_size for path in self._entries())
+
+    @staticmethod
+    def make_key(content: bytes, version: str, options: Optional[Dict[str, Any]] = None) -> str:
+        """Hash of the document bytes, loader version and loader options."""
+        digest = hashlib.sha256(content)
+        digest.update(b"\0" + version.encode())
+        digest.update(b"\0" + json.dumps(options or {}, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _entries(self):
+        return self.directory.glob("*.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached value for key, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self.stats["misses"] += 1
+            return None
+        with self._lock:
+            self.stats["hits"] += 1
+        return value
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a JSON-serializable value, evicting old entries if over the limit."""
+        data = json.dumps(value).encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            Path(temp_path).unlink(missing_ok=True)
+            return
+
+        with self._lock:
+            self.stats["writes"] += 1
+            self._size += len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        # Rescan: other processes may have added or removed entries
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        self._size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self._size <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            self._size -= size
+            self.stats["evictions"] += 1
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            for path in self._entries():
+                path.unlink(missing_ok=True)
+            self._size = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters plus current entry count and size."""
+        with self._lock:
+            return {
+                **self.stats,
+                "entries": sum(1 for _ in self._entries()),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+            }
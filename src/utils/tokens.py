@@ -0,0 +1,10 @@
+import math
+
+
+# Rough characters-per-token ratio for English text across current tokenizers
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token count estimate, good enough for budgets and savings reports."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
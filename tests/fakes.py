@@ -0,0 +1,53 @@
+"""Test doubles and fixtures shared by the test modules."""
+import asyncio
+from pathlib import Path
+from src.core.llm_provider import BaseLLMClient
+
+SAMPLE_INVOICE = Path(__file__).parent.parent / "sample_documents" / "sample_invoice.txt"
+
+
+class FakeClient(BaseLLMClient):
+    """Client that answers after a fixed delay."""
+
+    def __init__(self, delay: float = 0.0, text: str = '{"invoice_number": "INV-2024-001"}'):
+        self.delay = delay
+        self.text = text
+        self.calls = 0
+
+    async def generate(self, prompt, max_tokens=4096, temperature=0.0):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"text": self.text, "input_tokens": 10, "output_tokens": 5, "total_tokens": 15}
+
+    def calculate_cost(self, input_tokens, output_tokens):
+        return 0.0
+
+
+def make_pdf(path, page_texts):
+    """Write a minimal PDF with one line of Helvetica text per page ("" for a blank page)."""
+    count = len(page_texts)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % (4 + 2 * i) for i in range(count))
+        + b"] /Count %d >>" % count,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, text in enumerate(page_texts):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode() if text else b""
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (5 + 2 * i)
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    data = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(data))
+        data += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(data)
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    data += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    data += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(data)
+    return path
@@ -0,0 +1,72 @@
+from fastapi.testclient import TestClient
+import api
+
+
+def test_oversized_upload_is_rejected(monkeypatch):
+    """Test uploads past the size cap get 413 without being loaded."""
+    monkeypatch.setattr(api, "MAX_UPLOAD_BYTES", 10)
+    client = TestClient(api.app)
+
+    response = client.post(
+        "/extract-single",
+        files={"file": ("doc.txt", b"x" * 100, "text/plain")},
+        data={"strategy_id": "strategy_01"}
+    )
+
+    assert response.status_code == 413
+
+
+def test_strategy_metadata_needs_no_client(monkeypatch):
+    """Test metadata endpoints build no LLM client and answer 304 to a matching ETag."""
+    def no_client(*args, **kwargs):
+        raise AssertionError("client created")
+
+    monkeypatch.setattr(api, "create_llm_client", no_client)
+    client = TestClient(api.app)
+
+    response = client.get("/strategies")
+    assert response.status_code == 200
+    assert [s["id"] for s in response.json()][:2] == ["strategy_01", "strategy_02"]
+    etag = response.headers["etag"]
+    assert client.get("/strategies", headers={"If-None-Match": etag}).status_code == 304
+
+    prompt = client.get("/strategy/strategy_09/prompt")
+    assert prompt.json()["prompt_template"].startswith("Extract data as JSON")
+    assert client.get("/strategy/strategy_99/prompt").status_code == 404
+
+
+def test_extract_single_passes_remaining_deadline(monkeypatch):
+    """Test the strategy timeout is the deadline minus the time spent loading the document."""
+    import time
+    from types import SimpleNamespace
+    from src.core.models import ExtractionResult
+
+    timeouts = []
+
+    class RecordingStrategy:
+        metadata = SimpleNamespace(id="strategy_01", name="Recording")
+
+        async def extract(self, text, timeout=None):
+            timeouts.append(timeout)
+            return ExtractionResult(
+                strategy_name="Recording", strategy_id="strategy_01",
+                execution_time=0.0, token_count=0, cost=0.0, extracted_data={"text": text}
+            )
+
+    def slow_load(content, filename=None):
+        time.sleep(0.3)
+        return content.decode(), None
+
+    monkeypatch.setattr(api, "create_llm_client", lambda *args, **kwargs: None)
+    monkeypatch.setattr(api, "get_strategy_by_id", lambda *args, **kwargs: RecordingStrategy())
+    monkeypatch.setattr(api.DocumentLoader, "load", staticmethod(slow_load))
+    client = TestClient(api.app)
+
+    response = client.post(
+        "/extract-single",
+        files={"file": ("doc.txt", b"Invoice INV-1", "text/plain")},
+        data={"strategy_id": "strategy_01", "deadline": "2.0"}
+    )
+
+    assert response.status_code == 200
+    assert 0 < timeouts[0] <= 1.7
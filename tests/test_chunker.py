@@ -0,0 +1,30 @@
+from src.utils.chunker import DocumentChunker, split_sections
+from src.utils.document_loader import PAGE_BREAK
+
+
+def test_split_sections_on_pages_and_headings():
+    """Test sections break at page breaks and heading lines."""
+    text = f"INVOICE\nNumber: 1\n{PAGE_BREAK}\nTERMS AND CONDITIONS\nNet 30\n1. Late Fees\n2% monthly"
+    assert split_sections(text) == [
+        "INVOICE\nNumber: 1",
+        "TERMS AND CONDITIONS\nNet 30",
+        "1. Late Fees\n2% monthly",
+    ]
+
+
+def test_chunks_respect_size_and_overlap():
+    """Test chunks stay within the size limit and overlap their predecessor."""
+    pages = [f"PAGE {i}\n" + "\n".join(f"line {i}.{j}" for j in range(20)) for i in range(10)]
+    text = f"\n{PAGE_BREAK}\n".join(pages)
+    chunker = DocumentChunker(max_chars=400, overlap_chars=50)
+
+    chunks = chunker.chunk(text)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 400 + 50 for chunk in chunks)
+    assert chunks[1].split("\n")[0] in chunks[0]
+
+
+def test_short_text_is_single_chunk():
+    """Test documents under the limit are not split."""
+    assert DocumentChunker(max_chars=1000).chunk("short") == ["short"]
@@ -0,0 +1,37 @@
+from src.utils.compactor import DocumentCompactor, CompactionConfig
+from src.utils.document_loader import PAGE_BREAK
+
+
+def test_strips_repeated_headers_and_footers():
+    """Test per-page headers and page-number footers are removed."""
+    bodies = ["Scope of services", "Payment schedule", "Termination rights", "Governing law"]
+    pages = [f"ACME CORP CONFIDENTIAL\n{body}\nDetails for {body.lower()}\nPage {i} of 4"
+             for i, body in enumerate(bodies, 1)]
+    text = f"\n{PAGE_BREAK}\n".join(pages)
+
+    compacted, stats = DocumentCompactor().compact(text)
+
+    assert "CONFIDENTIAL" not in compacted
+    assert "Page" not in compacted
+    assert "Details for termination rights" in compacted
+    assert stats["repeated_lines_removed"] == 8
+
+
+def test_collapses_tables_and_leaders():
+    """Test aligned columns, rule lines and dotted leaders shrink."""
+    text = "Item          Qty    Total\n--------------------------\nWidget        2      $10.00\nTotal ........ $10.00"
+
+    compacted, stats = DocumentCompactor().compact(text)
+
+    assert compacted == "Item | Qty | Total\nWidget | 2 | $10.00\nTotal $10.00"
+    assert stats["compacted_tokens"] < stats["original_tokens"]
+
+
+def test_dedupes_boilerplate_and_normalizes_unicode():
+    """Test repeated long paragraphs are dropped and typography is normalized."""
+    boilerplate = "This invoice is subject to the standard terms and conditions of sale available online."
+    text = f"“Quoted” ﬁle​\n{boilerplate}\nMiddle\n{boilerplate}"
+
+    compacted, _ = DocumentCompactor(CompactionConfig(collapse_table_whitespace=False)).compact(text)
+
+    assert compacted == f'"Quoted" file\n{boilerplate}\nMiddle'
@@ -0,0 +1,77 @@
+import asyncio
+from src.core.consensus import ConsensusEngine
+from src.core.extraction_engine import ExtractionEngine
+from src.core.models import ExtractionResult
+from src.core.validator import ResultValidator
+from src.strategies.strategy_01_basic import BasicExtractionStrategy
+from src.strategies.strategy_02_structured import StructuredExtractionStrategy
+from src.strategies.strategy_09_minimal import MinimalStrategy
+from src.utils.fields import flatten_fields, normalize_value
+from tests.fakes import FakeClient, SAMPLE_INVOICE
+
+
+def make_result(strategy_id: str, data: dict, error: str = None) -> ExtractionResult:
+    return ExtractionResult(
+        strategy_name=strategy_id,
+        strategy_id=strategy_id,
+        extracted_data=data,
+        execution_time=1.0,
+        token_count=10,
+        cost=0.0,
+        error=error
+    )
+
+
+def test_fields_are_flattened_and_normalized():
+    """Test nested keys are path-addressed and values canonicalized."""
+    flat = flatten_fields({"Bill To": {"Name": "Acme"}, "lineItems": [{"qty": 2}]})
+
+    assert flat == {"bill_to.name": "Acme", "line_items[0].qty": 2}
+    assert normalize_value("$2,500.00") == normalize_value(2500.0) == "2500"
+    assert normalize_value("  Net   30 ") == "net 30"
+
+
+def test_consensus_record_and_agreement():
+    """Test majority values win and strategies are scored against them."""
+    consensus = ConsensusEngine.from_results([
+        make_result("a", {"total": "$100.00", "vendor": "Acme"}),
+        make_result("b", {"Total": 100, "vendor": "ACME"}),
+        make_result("c", {"total": 90, "vendor": "Other"}),
+        make_result("d", {}, error="failed"),
+    ])
+
+    assert consensus.num_results == 3
+    assert consensus.consensus_record() == {"total": "$100.00", "vendor": "Acme"}
+    assert consensus.agreement_scores() == {"a": 1.0, "b": 1.0, "c": 0.0}
+    assert consensus.is_settled(2, ["total", "vendor"])
+    assert not consensus.is_settled(3, ["total"])
+
+
+def test_validator_uses_consensus_without_ground_truth():
+    """Test consistency reflects cross-strategy agreement when there is no ground truth."""
+    metrics = ResultValidator.compare_results([
+        make_result("a", {"total": 100}),
+        make_result("b", {"total": 100}),
+        make_result("c", {"total": 90}),
+    ])
+
+    assert metrics["a"].consistency == 1.0
+    assert metrics["c"].consistency == 0.0
+
+
+def test_engine_stops_when_strategies_agree():
+    """Test remaining strategies are cancelled once enough agree."""
+    slow_client = FakeClient(delay=5.0)
+    engine = ExtractionEngine([
+        BasicExtractionStrategy(FakeClient()),
+        StructuredExtractionStrategy(FakeClient(delay=0.05)),
+        MinimalStrategy(slow_client),
+    ], request_delay=0.0)
+
+    results = asyncio.run(engine.extract_with_all_strategies(
+        SAMPLE_INVOICE, schema={"invoice_number": "string"}, stop_when_agreed=2
+    ))
+
+    assert results[0].success and results[1].success
+    assert results[2].error.startswith("Cancelled") and not results[2].timed_out
+    assert engine.last_consensus.consensus_record() == {"invoice_number": "INV-2024-001"}
@@ -0,0 +1,80 @@
+import numpy as np
+from src.core.corpus_evaluation import CorpusEvaluation
+from src.core.models import ExtractionResult
+from src.core.validator import ResultValidator
+
+
+def make_result(strategy_id: str, data: dict, cost: float = 0.0, error: str = None) -> ExtractionResult:
+    return ExtractionResult(
+        strategy_name=strategy_id,
+        strategy_id=strategy_id,
+        extracted_data=data,
+        execution_time=1.0,
+        token_count=10,
+        cost=cost,
+        error=error
+    )
+
+
+CORPUS = {
+    "a.txt": [
+        make_result("cheap", {"vendor": "Acme Corp", "total": 10}, cost=0.001),
+        make_result("good", {"vendor": "Acme Corp", "total": 100}, cost=0.01),
+        make_result("bad", {"vendor": "Other"}, cost=0.02),
+    ],
+    "b.txt": [
+        make_result("cheap", {}, cost=0.001, error="failed"),
+        make_result("good", {"vendor": "Globex", "date": "2024-01-01"}, cost=0.01),
+        make_result("bad", {"vendor": "Globex."}, cost=0.02),
+    ],
+    "c.txt": [make_result("good", {"vendor": "Nobody"})],
+}
+GROUND_TRUTHS = {
+    "a.txt": {"vendor": "Acme Corp", "total": 100},
+    "b.txt": {"vendor": "Globex", "date": "2024-01-01"},
+}
+
+
+def test_arrays_match_validator_metrics():
+    """Test the packed arrays reproduce per-document validator accuracy."""
+    evaluation = CorpusEvaluation.from_results(CORPUS, GROUND_TRUTHS)
+
+    assert evaluation.documents == ["a.txt", "b.txt"]
+    assert evaluation.strategies == ["cheap", "good", "bad"]
+    assert evaluation.fields == ["vendor", "total", "date"]
+    assert evaluation.scores.shape == (2, 3, 3)
+    assert np.isnan(evaluation.scores[0, :, 2]).all()
+
+    accuracy = evaluation.document_accuracy()
+    for d, doc in enumerate(evaluation.documents):
+        metrics = ResultValidator.compare_results(CORPUS[doc], GROUND_TRUTHS[doc])
+        for s, strategy_id in enumerate(evaluation.strategies):
+            assert accuracy[d, s] == metrics[strategy_id].accuracy
+
+
+def test_summary_aggregates_and_pareto_front():
+    """Test per-strategy and per-field aggregates, intervals and the Pareto front."""
+    summary = CorpusEvaluation.from_results(CORPUS, GROUND_TRUTHS).summary(n_resamples=500)
+    strategies = summary["strategies"]
+
+    assert summary["documents"] == 2
+    assert strategies["good"]["accuracy"] == 1.0
+    assert strategies["cheap"]["accuracy"] == 0.25
+    assert strategies["cheap"]["failure_rate"] == 0.5
+    assert strategies["bad"]["field_accuracy"] == {"vendor": 0.5, "total": 0.0, "date": 0.0}
+    for row in strategies.values():
+        low, high = row["accuracy_ci"]
+        assert low <= row["accuracy"] <= high
+    # "bad" costs more than "good" and is less accurate
+    assert summary["pareto_front"] == ["cheap", "good"]
+
+
+def test_bootstrap_is_seeded_and_batched():
+    """Test bootstrap intervals do not depend on the resample batch size."""
+    evaluation = CorpusEvaluation.from_results(CORPUS, GROUND_TRUTHS)
+    values = np.random.default_rng(1).random((50, 3))
+
+    first = evaluation.bootstrap_ci(values, n_resamples=300, batch_size=300)
+    second = evaluation.bootstrap_ci(values, n_resamples=300, batch_size=64)
+    assert np.array_equal(first[0], second[0])
+    assert (first[0] < values.mean(axis=0)).all() and (values.mean(axis=0) < first[1]).all()
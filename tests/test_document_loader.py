@@ -1,7 +1,10 @@
+import io
 import pytest
 from pathlib import Path
-from src.utils.document_loader import DocumentLoader
+from src.utils.chunker import DocumentChunker
+from src.utils.document_loader import DocumentLoader, PdfPageRenderer, PAGE_BREAK, sniff_document_type
 from src.core.models import DocumentType
+from tests.fakes import make_pdf
 
 
 def test_detect_document_type():
@@ -24,3 +27,103 @@ def test_preprocess_truncate():
     processed = DocumentLoader.preprocess_text(text, max_length=100)
     assert len(processed) <= 120  # 100 + truncation message
     assert "[... truncated]" in processed
+
+
+def test_iter_pdf_pages_is_lazy_and_ranged(tmp_path):
+    """Test page iteration honours page ranges and max_pages."""
+    pdf = make_pdf(tmp_path / "doc.pdf", [f"Page {i}" for i in range(1, 6)])
+
+    assert [n for n, _ in DocumentLoader.iter_pdf_pages(pdf)] == [1, 2, 3, 4, 5]
+    assert list(DocumentLoader.iter_pdf_pages(pdf, pages=range(2, 9), max_pages=2)) == [
+        (2, "Page 2"), (3, "Page 3")
+    ]
+
+
+def test_parallel_load_keeps_page_order(tmp_path):
+    """Test process-pool extraction reassembles pages in order."""
+    pdf = make_pdf(tmp_path / "doc.pdf", [f"Page {i}" for i in range(1, 8)])
+
+    assert DocumentLoader.load_pdf_pages_parallel(pdf, workers=3) == [f"Page {i}" for i in range(1, 8)]
+
+
+def test_blank_pages_keep_page_numbers(tmp_path):
+    """Test blank pages still count, so chunk page numbers match the PDF."""
+    pdf = make_pdf(tmp_path / "doc.pdf", ["Page 1", "", "Page 3"])
+
+    text = DocumentLoader.preprocess_text(DocumentLoader.load_pdf(pdf))
+    assert text.count(PAGE_BREAK) == 2
+
+    spans = DocumentChunker(max_chars=10, overlap_chars=0).chunk_pages(text)
+    assert [(chunk, first) for chunk, first, _ in spans] == [("Page 1", 1), ("Page 3", 3)]
+
+
+def test_only_pages_without_text_layer_are_ocred(tmp_path, monkeypatch):
+    """Test born-digital pages skip OCR while scanned pages are filled in."""
+    ocred = []
+    monkeypatch.setattr(PdfPageRenderer, "images", lambda self, number: [number])
+    monkeypatch.setattr(DocumentLoader, "ocr_image", staticmethod(lambda image: ocred.append(image) or f"Scanned {image}"))
+    pdf = make_pdf(tmp_path / "doc.pdf", ["Born digital invoice text", "", "More born digital text"])
+
+    pages = DocumentLoader.load_pdf(pdf).split(f"\n{PAGE_BREAK}\n")
+
+    assert pages == ["Born digital invoice text", "Scanned 2", "More born digital text"]
+    assert ocred == [2]
+
+
+def test_load_from_bytes_and_streams_sniffs_type(tmp_path):
+    """Test in-memory content is loaded with its type detected from magic bytes."""
+    pdf_bytes = make_pdf(tmp_path / "doc.pdf", ["Invoice INV-2024-001 total due"]).read_bytes()
+
+    assert DocumentLoader.load(pdf_bytes) == ("Invoice INV-2024-001 total due", DocumentType.PDF)
+    assert DocumentLoader.load(io.BytesIO(b"plain text")) == ("plain text", DocumentType.TEXT)
+    with pytest.raises(ValueError):
+        DocumentLoader.load(b"\x00\x01binary")
+
+
+def test_text_starting_with_bm_is_not_a_bitmap():
+    """Test only a real BMP header, not any upload starting with "BM", is sniffed as an image."""
+    from PIL import Image
+
+    bitmap = io.BytesIO()
+    Image.new("RGB", (4, 4)).save(bitmap, "BMP")
+
+    assert sniff_document_type(bitmap.getvalue()) == DocumentType.IMAGE
+    assert DocumentLoader.load(b"BMW invoice 2024\nTotal: 300 EUR", filename="bmw.txt") == (
+        "BMW invoice 2024\nTotal: 300 EUR", DocumentType.TEXT
+    )
+
+
+def test_scanned_pages_render_inside_ocr_workers(tmp_path, monkeypatch):
+    """Test the PDF is opened once and pages are rendered by the OCR workers, a few at a time."""
+    import threading
+    import time
+    opened, in_flight, peak = [], [0], [0]
+    lock = threading.Lock()
+    original_init = PdfPageRenderer.__init__
+
+    def init(self, path):
+        opened.append(path)
+        original_init(self, path)
+
+    def render(self, number):
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        return [(number, threading.current_thread() is threading.main_thread())]
+
+    def ocr(image):
+        time.sleep(0.01)
+        with lock:
+            in_flight[0] -= 1
+        return "main thread" if image[1] else f"Scanned {image[0]}"
+
+    monkeypatch.setattr(PdfPageRenderer, "__init__", init)
+    monkeypatch.setattr(PdfPageRenderer, "images", render)
+    monkeypatch.setattr(DocumentLoader, "ocr_image", staticmethod(ocr))
+    pdf = make_pdf(tmp_path / "doc.pdf", [""] * 12)
+
+    pages = DocumentLoader.ocr_scanned_pages(pdf, [""] * 12, workers=3)
+
+    assert pages == [f"Scanned {n}" for n in range(1, 13)]
+    assert len(opened) == 1
+    assert peak[0] <= 3
@@ -0,0 +1,176 @@
+import asyncio
+import time
+from src.core.extraction_engine import ExtractionEngine
+from src.core.models import ExtractionResult
+from src.core.repair import build_repair_prompt
+from src.core.schema_validator import validate_result
+from src.strategies.strategy_01_basic import BasicExtractionStrategy
+from src.strategies.strategy_09_minimal import MinimalStrategy
+from tests.fakes import FakeClient, SAMPLE_INVOICE
+
+
+def test_strategy_timeout_marks_result():
+    """Test a hung strategy is cut off and marked as timed out."""
+    fast = BasicExtractionStrategy(FakeClient())
+    slow = MinimalStrategy(FakeClient(delay=5.0))
+    engine = ExtractionEngine([fast, slow], request_delay=0.0)
+
+    results = asyncio.run(engine.extract_with_all_strategies(SAMPLE_INVOICE, strategy_timeout=0.1))
+
+    assert [r.strategy_id for r in results] == ["strategy_01", "strategy_09"]
+    assert results[0].success and not results[0].timed_out
+    assert results[1].timed_out and not results[1].success
+
+
+def test_run_deadline_returns_partial_results():
+    """Test the run deadline returns finished results and cancels the rest."""
+    fast = BasicExtractionStrategy(FakeClient())
+    slow = MinimalStrategy(FakeClient(delay=5.0))
+    engine = ExtractionEngine([fast, slow], request_delay=0.0)
+
+    results = asyncio.run(engine.extract_with_all_strategies(SAMPLE_INVOICE, deadline=0.2))
+
+    assert results[0].extracted_data == {"invoice_number": "INV-2024-001"}
+    assert results[1].timed_out
+
+
+def test_engine_emits_progress_events():
+    """Test the engine reports progress through its event bus."""
+    engine = ExtractionEngine([BasicExtractionStrategy(FakeClient())], request_delay=0.0)
+    events = []
+    engine.events.subscribe(events.append)
+
+    asyncio.run(engine.extract_with_all_strategies(SAMPLE_INVOICE, run_id="run-1"))
+
+    assert [e.type.value for e in events] == ["run_started", "started", "completed", "run_completed"]
+    assert all(e.run_id == "run-1" for e in events)
+    assert events[2].strategy_id == "strategy_01"
+
+
+def test_scheduler_alone_limits_concurrency_and_delay_holds_no_slot():
+    """Test a shared scheduler's slots are the only limit and request_delay is not counted as run time."""
+    from src.core.scheduler import ExtractionScheduler, Priority
+
+    clients = [FakeClient(delay=0.1) for _ in range(4)]
+    scheduler = ExtractionScheduler(max_concurrent=4)
+    engine = ExtractionEngine(
+        [BasicExtractionStrategy(client) for client in clients],
+        max_concurrent=1, request_delay=0.05, scheduler=scheduler
+    )
+
+    start = time.monotonic()
+    asyncio.run(engine.extract_with_all_strategies(SAMPLE_INVOICE))
+
+    # Four 0.1s calls dispatched 0.05s apart overlap; the delays are not run time
+    assert time.monotonic() - start < 0.45
+    assert scheduler.stats["dispatched"] == 4
+    assert scheduler.expected_runtime(Priority.BATCH) < 0.14
+
+
+class FakeStreamingClient(FakeClient):
+    """Client that streams its answer in small chunks."""
+
+    def __init__(self, text: str, chunk_size: int = 8):
+        super().__init__(text=text)
+        self.chunk_size = chunk_size
+        self.chunks_sent = 0
+
+    async def stream(self, prompt, max_tokens=4096, temperature=0.0):
+        for i in range(0, len(self.text), self.chunk_size):
+            self.chunks_sent += 1
+            await asyncio.sleep(0)
+            yield {"text": self.text[i:i + self.chunk_size]}
+        yield {"text": "", "input_tokens": 10, "output_tokens": 500, "total_tokens": 510}
+
+
+def test_streaming_stops_once_schema_fields_are_complete():
+    """Test streamed extraction emits fields and stops generating after the schema fields."""
+    answer = '{"invoice_number": "INV-2024-001", "total": 2500, "notes": "' + "x" * 400 + '"}'
+    client = FakeStreamingClient(answer)
+    engine = ExtractionEngine([BasicExtractionStrategy(client)], request_delay=0.0)
+    events = []
+    engine.events.subscribe(events.append)
+
+    results = asyncio.run(engine.extract_with_all_strategies(
+        SAMPLE_INVOICE, schema={"invoice_number": "string", "total": "number"}, stream_fields=True
+    ))
+
+    assert results[0].extracted_data == {"invoice_number": "INV-2024-001", "total": 2500}
+    assert results[0].stopped_early
+    assert client.chunks_sent < len(answer) // client.chunk_size // 2
+    fields = [e.data["field"] for e in events if e.type.value == "field"]
+    assert fields == ["invoice_number", "total"]
+    assert all(e.strategy_id == "strategy_01" for e in events if e.type.value == "field")
+
+
+class ScriptedClient(FakeClient):
+    """Client that returns one answer per call, recording the prompts."""
+
+    def __init__(self, answers):
+        super().__init__()
+        self.answers = list(answers)
+        self.prompts = []
+
+    async def generate(self, prompt, max_tokens=4096, temperature=0.0):
+        self.prompts.append(prompt)
+        tokens = 10 * len(self.prompts)
+        return {"text": self.answers.pop(0), "input_tokens": tokens, "output_tokens": 5, "total_tokens": tokens + 5}
+
+    def calculate_cost(self, input_tokens, output_tokens):
+        return (input_tokens + output_tokens) / 1000
+
+
+def test_repair_requests_only_missing_fields():
+    """Test missing schema fields are fetched by a small repair call and merged."""
+    client = ScriptedClient(['{"invoice_number": "INV-2024-001"}', '{"total": "$1,250.00", "extra": 1}'])
+    engine = ExtractionEngine([BasicExtractionStrategy(client)], request_delay=0.0)
+    events = []
+    engine.events.subscribe(events.append)
+
+    result = asyncio.run(engine.extract_with_all_strategies(
+        SAMPLE_INVOICE, schema={"invoice_number": "string", "total": "currency"}, repair=True
+    ))[0]
+
+    assert result.extracted_data == {"invoice_number": "INV-2024-001", "total": 1250}
+    assert result.schema_check.valid
+    assert result.repaired and result.repair_tokens == 25 and result.repair_cost == 0.025
+    assert result.token_count == 40
+    repair_prompt = client.prompts[1]
+    assert "- total: currency" in repair_prompt and "invoice_number" not in repair_prompt
+    assert "repaired" in [e.type.value for e in events]
+
+
+def test_repair_prompt_reads_json_schema_fields():
+    """Test repair prompts name JSON Schema fields and descriptions, not its keywords."""
+    schema = {
+        "type": "object",
+        "properties": {
+            "invoice_number": {"type": "string"},
+            "total": {"type": "number", "description": "Amount due including tax"},
+        },
+    }
+    result = validate_result(ExtractionResult(
+        strategy_name="Test", strategy_id="t", execution_time=0.0, token_count=0, cost=0.0,
+        extracted_data={"invoice_number": "INV-2024-001"},
+    ), schema)
+
+    text = "Invoice INV-2024-001\n\nTotal due: $1,250.00"
+    prompt = build_repair_prompt(result, text, schema)
+    assert "- total: Amount due including tax" in prompt and "properties" not in prompt
+
+    unparsable = result.model_copy(update={"extracted_data": {"raw_response": "total 1250"}})
+    assert "these fields: invoice_number, total" in build_repair_prompt(unparsable, text, schema)
+
+
+def test_repair_rewrites_unparsable_output():
+    """Test an unparsable response alone is sent back to be rewritten as JSON."""
+    client = ScriptedClient(["Invoice number is INV-7", '{"invoice_number": "INV-7"}'])
+    result = asyncio.run(BasicExtractionStrategy(client).extract("Invoice INV-7", repair=True))
+
+    assert result.extracted_data == {"invoice_number": "INV-7"}
+    assert "Invoice number is INV-7" in client.prompts[1]
+    assert "Invoice INV-7\n" not in client.prompts[1]
+
+    client = ScriptedClient(['{"invoice_number": "INV-7"}'])
+    result = asyncio.run(BasicExtractionStrategy(client).extract("Invoice INV-7", repair=True))
+    assert not result.repaired and len(client.prompts) == 1
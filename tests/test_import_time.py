@@ -0,0 +1,14 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+
+from import_time import BUDGET_MS, ENTRY_POINTS, check
+
+
+def test_entry_points_defer_heavy_imports():
+    """Test importing the CLI and API does not load parsers or provider SDKs and stays within budget."""
+    for module in ENTRY_POINTS:
+        result = check(module)
+        assert result["eager"] == [], module
+        assert result["total_ms"] <= BUDGET_MS, (module, result["total_ms"], result["slowest"])
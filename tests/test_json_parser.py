@@ -0,0 +1,141 @@
+import json
+import random
+from src.core.json_parser import IncrementalJSONParser, extract_json, repair_json
+from src.core.models import ExtractionResult
+from src.strategies.strategy_01_basic import BasicExtractionStrategy
+
+
+def random_value(rng: random.Random, depth: int = 0):
+    roll = rng.random()
+    if depth < 3 and roll < 0.15:
+        return {f"field_{i}": random_value(rng, depth + 1) for i in range(rng.randint(1, 4))}
+    if depth < 3 and roll < 0.25:
+        return [random_value(rng, depth + 1) for _ in range(rng.randint(1, 4))]
+    if roll < 0.5:
+        return rng.choice(["INV-001", "Acme, Inc.", "say \"hi\"", "a}b]c", "it's", "line\nbreak", "C:\\temp", ""])
+    if roll < 0.7:
+        return rng.choice([0, 7, -3, 2500.5, 1e-3])
+    return rng.choice([True, False, None])
+
+
+def render(value, rng: random.Random, sloppy: bool) -> str:
+    """JSON as a model might write it: single quotes, unquoted keys, comments, trailing commas."""
+    if isinstance(value, dict):
+        members = []
+        for key, item in value.items():
+            name = key if sloppy and rng.random() < 0.3 else json.dumps(key)
+            members.append(f"{name}: {render(item, rng, sloppy)}")
+            if sloppy and rng.random() < 0.1:
+                members[-1] += " // note\n"
+        return "{" + ", ".join(members) + ("," if sloppy and rng.random() < 0.3 else "") + "\n}"
+    if isinstance(value, list):
+        return "[" + ", ".join(render(item, rng, sloppy) for item in value) + ("," if sloppy and rng.random() < 0.3 else "") + "]"
+    if sloppy and isinstance(value, bool):
+        return "True" if value else "False"
+    if sloppy and value is None:
+        return "None"
+    if sloppy and isinstance(value, str) and rng.random() < 0.3:
+        return "'" + value.replace("\\", "\\\\").replace("'", "\\'").replace("\n", "\\n") + "'"
+    return json.dumps(value)
+
+
+def is_prefix(partial, full) -> bool:
+    """Whether partial is full with some trailing members missing."""
+    if isinstance(full, dict):
+        return isinstance(partial, dict) and all(
+            key in full and is_prefix(value, full[key]) for key, value in partial.items()
+        )
+    if isinstance(full, list):
+        return isinstance(partial, list) and len(partial) <= len(full) and all(
+            is_prefix(a, b) for a, b in zip(partial, full)
+        )
+    return partial == full
+
+
+def random_object(rng: random.Random) -> dict:
+    return {f"key_{i}": random_value(rng) for i in range(rng.randint(1, 6))}
+
+
+def test_fuzz_wrapped_and_sloppy_json_round_trips():
+    """Test prose, fences and model syntax defects around random objects parse exactly."""
+    rng = random.Random(7)
+    for _ in range(500):
+        value = random_object(rng)
+        body = render(value, rng, sloppy=rng.random() < 0.5)
+        wrapper = rng.choice([
+            "BODY", "```json\nBODY\n```", "Here is the data {as requested}:\nBODY\nLet me know if you need more }",
+            "Example: {\"key_0\": 1}\n\nAnswer:\nBODY",
+        ])
+        assert extract_json(wrapper.replace("BODY", body)) == value
+
+
+def test_fuzz_truncated_json_never_invents_values():
+    """Test output cut at any point parses to a prefix of the original object."""
+    rng = random.Random(11)
+    for _ in range(300):
+        value = random_object(rng)
+        body = render(value, rng, sloppy=rng.random() < 0.5)
+        cut = rng.randrange(1, len(body))
+        parsed = extract_json("Result:\n" + body[:cut])
+        assert parsed is not None and is_prefix(parsed, value)
+
+
+def test_repair_reports_completeness():
+    """Test repair fixes defects and flags truncated input."""
+    assert repair_json("{'a': True, b: [1, 2,], /* c */}") == ('{"a":true,"b":[1,2]}', 32, True)
+    assert repair_json('{"a": 1, "b": "unfinish') == ('{"a":1}', 23, False)
+
+
+def test_parse_response_keeps_raw_fallback():
+    """Test strategies still fall back to the raw response without any JSON."""
+    strategy = BasicExtractionStrategy(None)
+
+    assert strategy.parse_response("I could not find an invoice.") == {"raw_response": "I could not find an invoice."}
+    assert strategy.parse_response('Sure! {"total": 30,}') == {"total": 30}
+
+
+def test_parse_response_unwraps_top_level_arrays():
+    """Test a response that is a JSON array yields its best object, never a list."""
+    strategy = BasicExtractionStrategy(None)
+
+    assert strategy.parse_response('[{"invoice_number": "INV-1", "total": 30}]') == {"invoice_number": "INV-1", "total": 30}
+    assert strategy.parse_response('```json\n[{"total": 30}, {"invoice_number": "INV-1", "total": 30}]\n```') == {
+        "invoice_number": "INV-1", "total": 30
+    }
+    assert strategy.parse_response("[1, 2, 3]") == {"raw_response": "[1, 2, 3]"}
+    assert extract_json('[1, 2] {"total": 30}') == {"total": 30}
+
+    result = ExtractionResult(
+        strategy_name="Test", strategy_id="t", execution_time=0.0, token_count=0, cost=0.0,
+        extracted_data=strategy.parse_response('[{"total": 30}]'),
+    )
+    assert result.extracted_data == {"total": 30}
+
+
+def test_incremental_parser_emits_fields_as_they_close():
+    """Test streamed chunks surface each top-level field once its value is complete."""
+    rng = random.Random(3)
+    for _ in range(200):
+        value = random_object(rng)
+        body = "```json\n" + json.dumps(value, indent=rng.choice([None, 2])) + "\n```"
+        parser = IncrementalJSONParser()
+        emitted = []
+        pos = 0
+        while pos < len(body):
+            size = rng.randint(1, 12)
+            emitted.extend(parser.feed(body[pos:pos + size]))
+            pos += size
+
+        assert parser.complete
+        assert parser.fields == value
+        assert emitted == list(value)
+
+
+def test_incremental_parser_waits_for_value_end():
+    """Test a field is not emitted before its value is known to be complete."""
+    parser = IncrementalJSONParser()
+
+    assert parser.feed('{"total": 12') == {}
+    assert parser.feed('50, "vendor": "Acme') == {"total": 1250}
+    assert parser.feed(' Corp"') == {"vendor": "Acme Corp"}
+    assert not parser.complete
@@ -0,0 +1,42 @@
+from PIL import Image, ImageDraw
+from src.utils.document_loader import DocumentLoader, PAGE_BREAK
+from src.utils.ocr_preprocessing import OCRPreprocessConfig, estimate_skew, preprocess_image
+
+
+def make_text_image(width=800, height=600, angle=0.0) -> Image.Image:
+    """Gray page with dark horizontal text-like bars, optionally rotated."""
+    image = Image.new("L", (width, height), 230)
+    draw = ImageDraw.Draw(image)
+    for y in range(60, height - 60, 40):
+        draw.rectangle([60, y, width - 60, y + 12], fill=30)
+    return image.rotate(angle, resample=Image.BICUBIC, fillcolor=230)
+
+
+def test_oversized_scans_are_downscaled_and_binarized():
+    """Test high-dpi scans are scaled to the target dpi and reduced to black and white."""
+    image = make_text_image(1600, 1200).convert("RGB")
+    image.info["dpi"] = (600, 600)
+
+    processed = preprocess_image(image, OCRPreprocessConfig(deskew=False))
+
+    assert processed.size == (800, 600)
+    assert processed.mode == "L"
+    assert set(processed.tobytes()) <= {0, 255}
+
+
+def test_deskew_recovers_rotation():
+    """Test skew estimation finds the angle that levels the text lines."""
+    assert abs(estimate_skew(make_text_image(angle=3.0)) + 3.0) <= 0.5
+    assert estimate_skew(make_text_image()) == 0.0
+
+
+def test_multi_frame_tiff_pages_are_ocred_in_order(tmp_path, monkeypatch):
+    """Test each TIFF frame is OCR'd and joined as a page."""
+    frames = [Image.new("L", (20, 20), shade) for shade in (10, 20, 30)]
+    path = tmp_path / "scan.tiff"
+    frames[0].save(path, save_all=True, append_images=frames[1:])
+    monkeypatch.setattr(DocumentLoader, "ocr_image", staticmethod(lambda image: f"shade {image.getpixel((0, 0))}"))
+
+    text = DocumentLoader.load_image(path)
+
+    assert text.split(f"\n{PAGE_BREAK}\n") == ["shade 10", "shade 20", "shade 30"]
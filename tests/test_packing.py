@@ -0,0 +1,60 @@
+import asyncio
+import json
+from src.core.extraction_engine import ExtractionEngine
+from src.core.packing import pack_documents, split_packed_response, extract_packed
+from src.strategies.strategy_01_basic import BasicExtractionStrategy
+from tests.fakes import FakeClient
+
+
+def test_pack_documents_respects_budget():
+    """Test documents are grouped greedily under the token budget."""
+    documents = [("doc_1", "a" * 400), ("doc_2", "b" * 400), ("doc_3", "c" * 400)]
+    batches = pack_documents(documents, token_budget=250)
+    assert [[doc_id for doc_id, _ in batch] for batch in batches] == [["doc_1", "doc_2"], ["doc_3"]]
+
+
+def test_split_packed_response_accepts_wrapper_key():
+    """Test keyed responses are split per document, with or without a wrapper."""
+    data = {"documents": {"doc_1": {"total": 1}, "doc_2": "not an object"}}
+    assert split_packed_response(data, ["doc_1", "doc_2"]) == {"doc_1": {"total": 1}}
+
+
+def test_extract_packed_apportions_usage():
+    """Test one packed call yields a result per document with apportioned cost."""
+    response = json.dumps({"doc_1": {"invoice_number": "A"}, "doc_2": {"invoice_number": "B"}})
+    strategy = BasicExtractionStrategy(FakeClient(text=response))
+
+    results = asyncio.run(extract_packed(strategy, [("doc_1", "x" * 100), ("doc_2", "y" * 300)]))
+
+    assert results["doc_1"].extracted_data == {"invoice_number": "A"}
+    assert results["doc_2"].extracted_data == {"invoice_number": "B"}
+    assert strategy.client.calls == 1
+    assert results["doc_1"].token_count < results["doc_2"].token_count
+
+
+def test_extract_packed_charges_uncovered_documents():
+    """Test documents the packed output misses keep their share of the call's usage."""
+    strategy = BasicExtractionStrategy(FakeClient(text=json.dumps({"doc_1": {"invoice_number": "A"}})))
+
+    results = asyncio.run(extract_packed(strategy, [("doc_1", "x" * 100), ("doc_2", "y" * 300)]))
+
+    assert results["doc_1"].success and not results["doc_2"].success
+    assert results["doc_2"].token_count == round(10 * 300 / 400)
+    assert sum(r.token_count for r in results.values()) == 15
+
+
+def test_corpus_fallback_is_charged_for_failed_packed_call(tmp_path):
+    """Test an unparsable packed call's usage is added to the single-document fallbacks."""
+    paths = []
+    for i in range(2):
+        path = tmp_path / f"invoice_{i}.txt"
+        path.write_text(f"Invoice INV-{i}")
+        paths.append(path)
+    client = FakeClient(text="no json here")
+    engine = ExtractionEngine([BasicExtractionStrategy(client)], request_delay=0.0)
+
+    corpus = asyncio.run(engine.extract_corpus(paths, pack_token_budget=1000))
+
+    assert client.calls == 3
+    # 15 tokens for each single call plus the packed call's 15 split between them
+    assert sum(results[0].token_count for results in corpus.values()) == 45
@@ -0,0 +1,19 @@
+from src.core.result_merger import merge_extracted_data
+
+
+def test_merge_resolves_conflicts_by_vote():
+    """Test scalar conflicts go to the majority and lists are deduplicated."""
+    partials = [
+        {"invoice_number": "INV-1", "total": None, "items": [{"sku": "A"}]},
+        {"invoice_number": "inv-1 ", "total": 3780.0, "items": [{"sku": "A"}, {"sku": "B"}]},
+        {"invoice_number": "INV-7", "vendor": {"name": "Acme"}},
+    ]
+
+    merged = merge_extracted_data(partials)
+
+    assert merged == {
+        "invoice_number": "INV-1",
+        "total": 3780.0,
+        "items": [{"sku": "A"}, {"sku": "B"}],
+        "vendor": {"name": "Acme"},
+    }
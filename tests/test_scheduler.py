@@ -0,0 +1,77 @@
+import asyncio
+import time
+import pytest
+from src.core.scheduler import ExtractionScheduler, Priority, DeadlineExceeded
+
+
+def test_interactive_overtakes_batch():
+    """Test queued interactive work is dispatched before queued batch work."""
+    async def scenario():
+        scheduler = ExtractionScheduler(max_concurrent=1)
+        order = []
+        release = asyncio.Event()
+
+        async def blocker():
+            await release.wait()
+
+        async def work(name):
+            order.append(name)
+
+        first = asyncio.create_task(scheduler.run(blocker))
+        await asyncio.sleep(0)
+        batch = asyncio.create_task(scheduler.run(lambda: work("batch"), Priority.BATCH))
+        interactive = asyncio.create_task(
+            scheduler.run(lambda: work("interactive"), Priority.INTERACTIVE)
+        )
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(first, batch, interactive)
+        return order
+
+    assert asyncio.run(scenario()) == ["interactive", "batch"]
+
+
+def test_earliest_deadline_first():
+    """Test work in the same priority class is dispatched by deadline."""
+    async def scenario():
+        scheduler = ExtractionScheduler(max_concurrent=1)
+        order = []
+        release = asyncio.Event()
+
+        async def blocker():
+            await release.wait()
+
+        async def work(name):
+            order.append(name)
+
+        now = time.monotonic()
+        first = asyncio.create_task(scheduler.run(blocker))
+        await asyncio.sleep(0)
+        late = asyncio.create_task(scheduler.run(lambda: work("late"), deadline=now + 60))
+        early = asyncio.create_task(scheduler.run(lambda: work("early"), deadline=now + 30))
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(first, late, early)
+        return order
+
+    assert asyncio.run(scenario()) == ["early", "late"]
+
+
+def test_expired_work_is_shed():
+    """Test queued work is shed once its deadline passes."""
+    async def scenario():
+        scheduler = ExtractionScheduler(max_concurrent=1)
+
+        async def slow():
+            await asyncio.sleep(0.2)
+
+        blocker = asyncio.create_task(scheduler.run(slow))
+        await asyncio.sleep(0)
+        with pytest.raises(DeadlineExceeded):
+            await scheduler.run(slow, deadline=time.monotonic() + 0.05)
+        await blocker
+        return scheduler
+
+    scheduler = asyncio.run(scenario())
+    assert scheduler.stats["shed"] == 1
+    assert scheduler.active == 0
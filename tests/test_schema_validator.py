@@ -0,0 +1,106 @@
+import time
+from src.core.models import ExtractionResult
+from src.core.schema_validator import compile_schema, validate_result
+from src.utils.fields import normalize_value
+
+SCHEMA = {
+    "invoice_number": "string",
+    "invoice_date": "date",
+    "total": "currency",
+    "paid": "boolean",
+    "bill_to": {"name": "string", "city": "string"},
+    "line_items": [{"description": "string", "quantity": "integer", "amount": "number"}],
+    "notes": "Anything else worth keeping",
+}
+
+
+def test_values_are_coerced_to_schema_types():
+    """Test amounts, dates, booleans and key spellings are normalized to the schema."""
+    data, check = compile_schema(SCHEMA).validate({
+        "InvoiceNumber": "INV-1",
+        "Invoice Date": "Jan 15, 2024",
+        "total": "$2,500.00",
+        "paid": "yes",
+        "billTo": {"name": "Acme Corp", "city": "Prague"},
+        "lineItems": [{"description": "Widget", "quantity": "2", "amount": "10.50"}],
+        "notes": {"free": "form"},
+    })
+
+    assert data == {
+        "invoice_number": "INV-1",
+        "invoice_date": "2024-01-15",
+        "total": 2500,
+        "paid": True,
+        "bill_to": {"name": "Acme Corp", "city": "Prague"},
+        "line_items": [{"description": "Widget", "quantity": 2, "amount": 10.5}],
+        "notes": {"free": "form"},
+    }
+    assert check.valid
+    assert check.completeness == 1.0
+
+
+def test_missing_extra_and_invalid_fields_are_reported():
+    """Test nested missing leaves, extra keys and uncoercible values are reported."""
+    data, check = compile_schema(SCHEMA).validate({
+        "invoice_number": "INV-1",
+        "invoice_date": "sometime",
+        "total": None,
+        "bill_to": {"name": "Acme Corp", "vat": "CZ1"},
+        "line_items": [{"description": "Widget", "quantity": "two"}],
+        "currency": "EUR",
+    })
+
+    assert check.missing_fields == ["total", "paid", "bill_to.city", "line_items[0].amount", "notes"]
+    assert check.extra_fields == ["currency", "bill_to.vat"]
+    assert check.invalid_fields == {
+        "invoice_date": "expected a date",
+        "line_items[0].quantity": "expected an integer",
+    }
+    # 4 of the 8 counted leaves are missing; missing array contents count once
+    assert check.completeness == 4 / 8
+    assert data["invoice_date"] == "sometime"
+    assert data["currency"] == "EUR"
+
+
+def test_json_schema_form():
+    """Test JSON Schema properties, formats and required are honored."""
+    schema = {
+        "type": "object",
+        "properties": {
+            "invoice_number": {"type": "string"},
+            "due": {"type": "string", "format": "date"},
+            "total": {"type": ["number", "null"]},
+        },
+        "required": ["invoice_number", "total"],
+    }
+    validator = compile_schema(schema)
+    data, check = validator.validate({"invoice_number": "INV-1", "total": "1,200"})
+
+    assert validator.fields == ["invoice_number", "due", "total"]
+    assert data == {"invoice_number": "INV-1", "total": 1200}
+    assert check.missing_fields == []
+    assert compile_schema(schema).validate({"due": "15.01.2024"})[0] == {"due": "2024-01-15"}
+
+
+def test_compiled_once_and_cheap():
+    """Test validators are cached per schema and validation stays in the microsecond range."""
+    assert compile_schema(dict(SCHEMA)) is compile_schema(SCHEMA)
+
+    result = ExtractionResult(
+        strategy_name="Test", strategy_id="t", execution_time=0.0, token_count=0, cost=0.0,
+        extracted_data={"invoice_number": "INV-1", "total": "$30", "invoice_date": "2024-01-15"},
+    )
+    start = time.perf_counter()
+    for _ in range(1000):
+        checked = validate_result(result, SCHEMA)
+    assert time.perf_counter() - start < 1.0
+    assert checked.extracted_data["total"] == 30
+    assert checked.schema_check.missing_fields == ["paid", "bill_to.name", "bill_to.city", "line_items", "notes"]
+    assert result.schema_check is None
+
+
+def test_dates_normalize_across_formats():
+    """Test dates written differently compare equal."""
+    assert normalize_value("Jan 15, 2024") == normalize_value("2024-01-15") == normalize_value("15th January 2024")
+    assert normalize_value("01/15/2024") == "2024-01-15"
+    assert normalize_value("Invoice 15") == "invoice 15"
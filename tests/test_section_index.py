@@ -0,0 +1,51 @@
+from src.core.schema_validator import compile_schema
+from src.utils.section_index import SectionIndex, field_query, select_relevant_sections
+
+
+def test_field_query_splits_names():
+    """Test field names become query terms and type names are ignored."""
+    assert field_query("invoice_number", "string") == ["invoice", "number"]
+    assert field_query("dueDate", "payment due date") == ["due", "date", "payment", "due", "date"]
+
+
+def test_search_ranks_matching_section_first():
+    """Test BM25 ranks the section mentioning the field highest."""
+    index = SectionIndex([
+        "TERMS AND CONDITIONS\nGoverning law applies.",
+        "INVOICE\nInvoice Number: INV-2024-001",
+        "NOTES\nThank you for your business.",
+    ])
+    assert index.search(["invoice", "number"], top_k=1)[0][0] == 1
+
+
+def test_select_relevant_sections_prunes_long_documents():
+    """Test pruning keeps relevant sections and reports the reduction."""
+    filler = "\n".join(f"APPENDIX {i}\n" + "Boilerplate legal text. " * 40 for i in range(20))
+    text = "INVOICE\nInvoice Number: INV-2024-001\n" + filler + "\nTOTALS\nTotal: $3,780.00"
+
+    pruned, stats = select_relevant_sections(text, {"invoice_number": "string", "total": "number"},
+                                             top_k=4, token_budget=500)
+
+    assert "INV-2024-001" in pruned
+    assert "$3,780.00" in pruned
+    assert stats["reduction"] > 0.8
+
+
+def test_select_relevant_sections_reads_json_schema_fields():
+    """Test a JSON Schema is queried by its property names and descriptions."""
+    filler = "\n".join(f"APPENDIX {i}\n" + "Boilerplate legal text of this type. " * 40 for i in range(20))
+    text = "INVOICE\nInvoice Number: INV-2024-001\n" + filler + "\nPAYMENT\nDue by March 1"
+    schema = {
+        "type": "object",
+        "properties": {
+            "invoice_number": {"type": "string"},
+            "deadline": {"type": "string", "description": "payment due"},
+        },
+        "required": ["invoice_number"],
+    }
+
+    pruned, _ = select_relevant_sections(text, compile_schema(schema).descriptions, top_k=2, token_budget=500)
+
+    assert "INV-2024-001" in pruned
+    assert "Due by March 1" in pruned
+    assert "APPENDIX" not in pruned
@@ -0,0 +1,66 @@
+import asyncio
+from src.core.extraction_engine import ExtractionEngine
+from src.core.sequential_evaluation import SequentialComparison, evaluate_sequentially
+from src.strategies.strategy_01_basic import BasicExtractionStrategy
+from src.strategies.strategy_09_minimal import MinimalStrategy
+from tests.fakes import FakeClient
+
+
+def test_clear_winner_settles_early():
+    """Test a consistently better strategy is settled long before the corpus ends."""
+    comparison = SequentialComparison(["good", "bad"], confidence=0.95)
+
+    documents = 0
+    while not comparison.done and documents < 1000:
+        comparison.update({"good": 1.0, "bad": 0.0})
+        documents += 1
+
+    assert documents < 50
+    assert comparison.stopped == {"good": "settled", "bad": "worse than good"}
+    assert comparison.outcome("good", "bad") == "good"
+
+
+def test_equal_strategies_only_settle_with_margin():
+    """Test identical strategies stay unsettled unless a tie margin is given."""
+    strict = SequentialComparison(["a", "b"])
+    tolerant = SequentialComparison(["a", "b"], margin=0.3)
+    for i in range(500):
+        score = i % 2
+        strict.update({"a": score, "b": 1 - score})
+        tolerant.update({"a": score, "b": 1 - score})
+
+    assert strict.active == ["a", "b"]
+    assert tolerant.done and tolerant.outcome("a", "b") == "tie"
+
+
+def test_interval_holds_for_noisy_differences():
+    """Test the interval covers the true difference and narrows with documents."""
+    comparison = SequentialComparison(["a", "b", "c"])
+    for i in range(400):
+        comparison.update({"a": 0.6 if i % 5 else 0.0, "b": 0.5, "c": 0.5})
+
+    low, high = comparison.interval("a", "b")
+    assert low <= 0.48 - 0.5 <= high
+    assert high - low < 2 * comparison.radius(100)
+    assert comparison.interval("b", "a") == (-high, -low)
+
+
+def test_evaluation_loop_runs_only_active_strategies(tmp_path):
+    """Test the loop stops extracting with strategies once they are settled."""
+    good = BasicExtractionStrategy(FakeClient(text='{"invoice_number": "INV-1"}'))
+    bad_client = FakeClient(text='{"invoice_number": "wrong"}')
+    bad = MinimalStrategy(bad_client)
+    engine = ExtractionEngine([good, bad], request_delay=0.0)
+    paths = []
+    for i in range(200):
+        path = tmp_path / f"doc{i}.txt"
+        path.write_text("Invoice INV-1")
+        paths.append(path)
+    truths = {str(path): {"invoice_number": "INV-1"} for path in paths}
+
+    results, comparison = asyncio.run(evaluate_sequentially(engine, paths, truths, confidence=0.95))
+
+    assert comparison.done
+    assert len(results) < 50
+    assert bad_client.calls == len(results)
+    assert comparison.summary()["strategies"]["strategy_01"]["accuracy"] == 1.0
@@ -0,0 +1,41 @@
+import random
+from difflib import SequenceMatcher
+from src.core import similarity
+from src.core.validator import ResultValidator
+
+
+def test_ratio_is_difflib_ratio():
+    """Test scores equal difflib's exactly, including long strings where it ignores popular characters."""
+    rng = random.Random(7)
+    for _ in range(300):
+        a = "".join(rng.choice("abc 12") for _ in range(rng.randint(0, 40)))
+        b = "".join(rng.choice("abc 12") for _ in range(rng.randint(0, 40)))
+        assert similarity.ratio(a, b) == SequenceMatcher(None, a, b).ratio()
+    long = "ab" * 150 + "c"
+    assert similarity.ratio(long, long[1:]) == SequenceMatcher(None, long, long[1:]).ratio()
+    assert similarity.batch_ratio(long, [long, long[1:]]) == [SequenceMatcher(None, long, c).ratio() for c in (long, long[1:])]
+    assert similarity.ratio("", "") == 1.0
+
+
+def test_scores_and_batch():
+    """Test batches score each candidate as ratio does, singly."""
+    assert similarity.ratio("acme corp", "acme corp") == 1.0
+    assert similarity.ratio("abcd", "abce") == 0.75
+    candidates = ["acme corporation", "acme corp.", "globex", "acme corp", "acme corp.", ""]
+    assert similarity.batch_ratio("acme corp", candidates) == [similarity.ratio("acme corp", c) for c in candidates]
+
+
+def test_threshold_agrees_with_difflib_on_field_values():
+    """Test the 0.8 cutoff decides typical field values the same way difflib did."""
+    pairs = [
+        ("Acme Corporation", "ACME Corporation"),
+        ("Acme Corporation", "Acme Corp"),
+        ("INV-2024-001", "INV-2024-0001"),
+        ("INV-2024-001", "INV-2023-117"),
+        ("March 15, 2024", "2024-03-15"),
+        ("123 Business Street", "123 Business St."),
+        ("Net 30", "Net 30 days"),
+    ]
+    for truth, value in pairs:
+        expected = SequenceMatcher(None, truth.lower(), value.lower()).ratio()
+        assert ResultValidator.calculate_similarity(truth, value) == expected, (truth, value)
@@ -0,0 +1,61 @@
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional
+import pytest
+from src.core.base_strategy import BaseExtractionStrategy
+from src.core.models import StrategyMetadata
+from src.strategies import strategy_registry
+from src.strategies.strategy_registry import StrategyRegistry
+
+ROOT = Path(__file__).parent.parent
+
+
+class CustomStrategy(BaseExtractionStrategy):
+    """Third-party strategy exposed through an entry point."""
+
+    def get_metadata(self) -> StrategyMetadata:
+        return StrategyMetadata(
+            id="custom_01", name="Custom", description="Plugin strategy", category="plugin",
+            expected_cost_per_call=0.001, use_cases=["Testing"]
+        )
+
+    def build_prompt(self, document_text: str, schema: Optional[Dict[str, Any]] = None) -> str:
+        return document_text
+
+
+class FakeEntryPoint:
+    def __init__(self, name: str, target: Any):
+        self.name = name
+        self.target = target
+
+    def load(self) -> Any:
+        return self.target
+
+
+def test_lookup_imports_only_the_requested_strategy():
+    """Test getting one strategy by ID imports only its module."""
+    code = (
+        "import sys\n"
+        "from src.strategies.strategy_registry import get_strategy_by_id\n"
+        "strategy = get_strategy_by_id('strategy_09')\n"
+        "print(strategy.client, sorted(m for m in sys.modules if m.startswith('src.strategies.strategy_')))"
+    )
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "None ['src.strategies.strategy_09_minimal', 'src.strategies.strategy_registry']"
+
+
+def test_plugins_are_discovered_from_entry_points(monkeypatch):
+    """Test entry point strategies are listed after the built-ins and broken plugins are skipped."""
+    plugins = [FakeEntryPoint("custom", CustomStrategy), FakeEntryPoint("broken", object)]
+    monkeypatch.setattr(strategy_registry, "entry_points", lambda group: plugins)
+    registry = StrategyRegistry()
+
+    with pytest.warns(UserWarning, match="broken"):
+        ids = registry.ids()
+
+    assert ids[:2] == ["strategy_01", "strategy_02"] and ids[-1] == "custom_01"
+    assert registry.metadata("custom_01").category == "plugin"
+    assert isinstance(registry.create("custom_01"), CustomStrategy)
+    with pytest.raises(ValueError):
+        registry.get_class("strategy_99")
@@ -0,0 +1,141 @@
+import random
+import time
+from difflib import SequenceMatcher
+from itertools import permutations
+import numpy as np
+import pytest
+from src.core import structure_matching
+from src.core.structure_matching import _assign, match_fields
+from src.core.validator import ResultValidator
+from src.strategies.strategy_12_xml_format import XMLFormatStrategy
+
+INVOICE = {
+    "invoice_number": "INV-1",
+    "total": 30,
+    "bill_to": {"name": "Acme Corp", "city": "Prague"},
+    "line_items": [
+        {"description": "Widget", "quantity": 2, "amount": 10},
+        {"description": "Gadget", "quantity": 1, "amount": 20},
+    ],
+}
+
+
+def test_nested_fields_are_scored_per_leaf():
+    """Test nested dicts and reordered line items match leaf by leaf."""
+    extracted = {
+        "InvoiceNumber": "INV-1",
+        "total": "$30.00",
+        "billTo": {"name": "ACME Corp"},
+        "lineItems": [
+            {"description": "Gadget", "quantity": "1", "amount": "20.00"},
+            {"description": "Widget", "quantity": 2, "amount": 10},
+        ],
+    }
+
+    metrics = ResultValidator.validate_against_ground_truth(extracted, INVOICE)
+
+    assert metrics.field_match_rate["line_items[1].description"] == 1.0
+    assert metrics.field_match_rate["bill_to.name"] == 1.0
+    assert metrics.missing_fields == ["bill_to.city"]
+    assert metrics.accuracy == 9 / 10
+    assert metrics.completeness == 9 / 10
+
+
+def test_xml_strategy_output_scores():
+    """Test strategy_12's XML output, with repeated item tags, validates against nested truth."""
+    strategy = XMLFormatStrategy(None)
+    data = strategy.parse_response(
+        "<invoice><InvoiceNumber>INV-1</InvoiceNumber><Total>30</Total>"
+        "<BillTo><Name>Acme Corp</Name><City>Prague</City></BillTo>"
+        "<LineItems><Item><Description>Widget</Description><Quantity>2</Quantity><Amount>10</Amount></Item>"
+        "<Item><Description>Gadget</Description><Quantity>1</Quantity><Amount>20</Amount></Item></LineItems>"
+        "</invoice>"
+    )
+
+    metrics = ResultValidator.validate_against_ground_truth(data, INVOICE)
+
+    assert metrics.accuracy == 1.0
+
+
+def test_assignment_is_optimal():
+    """Test the NumPy Hungarian fallback finds the minimum-cost assignment."""
+    rng = np.random.default_rng(0)
+    for shape in [(4, 4), (3, 5), (5, 6)]:
+        cost = rng.random(shape)
+        columns = _assign(cost)
+        best = min(
+            sum(cost[i, j] for i, j in enumerate(perm))
+            for perm in permutations(range(shape[1]), shape[0])
+        )
+        assert len(set(columns)) == shape[0]
+        assert np.isclose(cost[np.arange(shape[0]), columns].sum(), best)
+
+
+@pytest.fixture(params=[False, True], ids=["numpy", "rapidfuzz"])
+def backend(request, monkeypatch):
+    if request.param and not structure_matching.RAPIDFUZZ_AVAILABLE:
+        pytest.skip("rapidfuzz not installed")
+    monkeypatch.setattr(structure_matching, "RAPIDFUZZ_AVAILABLE", request.param)
+
+
+def dp_lcs(a: str, b: str) -> int:
+    previous = [0] * (len(b) + 1)
+    for x in a:
+        current = [0]
+        for j, y in enumerate(b):
+            current.append(previous[j] + 1 if x == y else max(previous[j + 1], current[j]))
+        previous = current
+    return previous[-1]
+
+
+def test_vectorized_lcs_matches_dynamic_programming():
+    """Test the multi-word bit-parallel LCS against the textbook table, across 64-character words."""
+    rng = random.Random(7)
+    truths = ["".join(rng.choice("abc 12") for _ in range(rng.randint(0, 150))) for _ in range(20)]
+    candidates = ["".join(rng.choice("abc 13") for _ in range(rng.randint(0, 150))) for _ in range(15)]
+    truths += ["a" * 64, "b" * 64 + "a"]
+    candidates += ["a" * 70, ""]
+
+    lengths = structure_matching._lcs_lengths(truths, candidates)
+
+    assert lengths.tolist() == [[dp_lcs(t, c) for c in candidates] for t in truths]
+
+
+def test_string_similarity_backends_agree(backend):
+    """Test both backends give the indel similarity, which never falls below difflib's ratio."""
+    truths = ["acme corporation", "professional services (march)", ""]
+    candidates = ["ACME Corp".lower(), "services, professional", "", "acme corporation"]
+
+    similarity = structure_matching._string_similarity(truths, candidates)
+
+    for i, truth in enumerate(truths):
+        for j, candidate in enumerate(candidates):
+            total = len(truth) + len(candidate)
+            expected = 2 * dp_lcs(truth, candidate) / total if total else 1.0
+            assert similarity[i, j] == pytest.approx(expected)
+            assert similarity[i, j] >= SequenceMatcher(None, truth, candidate).ratio() - 1e-12
+
+
+def test_large_line_item_lists_match_quickly(backend):
+    """Test hundreds of shuffled, realistically long line items are paired correctly in well under a second."""
+    rng = np.random.default_rng(1)
+    words = ["professional", "services", "consulting", "hours", "software", "license", "annual",
+             "support", "maintenance", "hardware", "installation", "cloud", "hosting", "storage"]
+    items = [
+        {
+            "sku": f"SKU-{i:05d}",
+            "description": " ".join(rng.choice(words, 6)) + f" (ref {i})",
+            "quantity": i % 7,
+            "unit_price": f"${(i * 37) % 900}.00",
+        }
+        for i in range(300)
+    ]
+    shuffled = [items[i] for i in rng.permutation(len(items))]
+
+    start = time.perf_counter()
+    scores = match_fields(items, shuffled, "items")
+    elapsed = time.perf_counter() - start
+
+    assert all(score == 1.0 for score in scores.values())
+    assert len(scores) == 1200
+    assert elapsed < 1.0
@@ -0,0 +1,71 @@
+from src.utils.document_loader import DocumentLoader
+from src.utils.table_extractor import extract_tables
+from tests.fakes import make_pdf
+
+LAYOUT_PAGE = """INVOICE INV-2024-001
+
+Description                 Qty        Unit Price      Amount
+Professional Services       40         $150.00         $6,000.00
+
+Software License            1          $2,500.00       $2,500.00
+Support                                $100.00         $1,200.00
+
+Payment   is due within thirty days."""
+
+
+def test_aligned_table_becomes_csv():
+    """Test column-aligned rows are detected and rewritten with the header once."""
+    text, tables = extract_tables(LAYOUT_PAGE, page=2)
+
+    assert len(tables) == 1
+    assert tables[0].page == 2
+    assert tables[0].header == ["Description", "Qty", "Unit Price", "Amount"]
+    assert tables[0].rows[2] == ["Support", "", "$100.00", "$1,200.00"]
+    assert text.split("\n") == [
+        "INVOICE INV-2024-001",
+        "",
+        "Description,Qty,Unit Price,Amount",
+        'Professional Services,40,$150.00,"$6,000.00"',
+        'Software License,1,"$2,500.00","$2,500.00"',
+        'Support,,$100.00,"$1,200.00"',
+        "",
+        "Payment is due within thirty days.",
+    ]
+
+
+def test_docx_tables_are_structured(tmp_path):
+    """Test DOCX tables are returned as data and emitted as CSV."""
+    from docx import Document
+
+    doc = Document()
+    doc.add_paragraph("Invoice INV-2024-001")
+    table = doc.add_table(rows=3, cols=2)
+    for row, values in zip(table.rows, [("Item", "Amount"), ("Hosting", "$100"), ("Support", "$50")]):
+        for cell, value in zip(row.cells, values):
+            cell.text = value
+    path = tmp_path / "invoice.docx"
+    doc.save(path)
+
+    document = DocumentLoader.load_document(path)
+
+    assert document.tables[0].header == ["Item", "Amount"]
+    assert document.tables[0].rows == [["Hosting", "$100"], ["Support", "$50"]]
+    assert document.text == "Invoice INV-2024-001\nItem,Amount\nHosting,$100\nSupport,$50"
+
+
+def test_pdf_tables_are_opt_in(tmp_path, monkeypatch):
+    """Test PDFs are read in plain mode unless table extraction is turned on."""
+    layouts = []
+    original = DocumentLoader.load_pdf_pages
+
+    def record(file_path, workers=None, ocr=None, layout=False):
+        layouts.append(layout)
+        return original(file_path, workers, ocr, layout)
+
+    monkeypatch.setattr(DocumentLoader, "load_pdf_pages", staticmethod(record))
+    pdf = make_pdf(tmp_path / "invoice.pdf", ["Invoice INV-2024-001"])
+
+    assert DocumentLoader.load_document(pdf).text == "Invoice INV-2024-001"
+    monkeypatch.setattr(DocumentLoader, "extract_tables", True)
+    DocumentLoader.load_document(pdf)
+    assert layouts == [False, True]
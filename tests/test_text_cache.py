@@ -0,0 +1,40 @@
+import os
+from src.utils.document_loader import DocumentLoader
+from src.utils.text_cache import TextCache
+
+
+def test_repeat_loads_skip_parsing(tmp_path, monkeypatch):
+    """Test identical bytes are parsed once, even under another file name."""
+    calls = []
+
+    def fake_load_pdf_pages(file_path, *args, **kwargs):
+        calls.append(file_path)
+        return ["parsed text"]
+
+    monkeypatch.setattr(DocumentLoader, "load_pdf_pages", staticmethod(fake_load_pdf_pages))
+    monkeypatch.setattr(DocumentLoader, "cache", None)
+    cache = DocumentLoader.configure_cache(tmp_path / "cache")
+    first = tmp_path / "a.pdf"
+    second = tmp_path / "b.pdf"
+    first.write_bytes(b"%PDF-1.4 same bytes")
+    second.write_bytes(b"%PDF-1.4 same bytes")
+
+    assert DocumentLoader.load(first)[0] == "parsed text"
+    assert DocumentLoader.load(second)[0] == "parsed text"
+    assert len(calls) == 1
+    assert cache.snapshot()["hits"] == 1
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    """Test the cache stays under its size limit by evicting the oldest entries."""
+    cache = TextCache(tmp_path, max_bytes=250)
+    for i, key in enumerate(["a", "b"]):
+        cache.put(key, {"text": "x" * 100})
+        os.utime(tmp_path / f"{key}.json", (i, i))
+    cache.get("a")
+
+    cache.put("c", {"text": "x" * 100})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.snapshot()["evictions"] == 1
@@ -0,0 +1,104 @@
+import asyncio
+import time
+from src.core.llm_provider import BaseLLMClient
+from src.core.models import ExtractionResult
+from src.core.work_queue import WorkQueue
+from src.core.worker import QueueWorker
+from src.strategies.strategy_01_basic import BasicExtractionStrategy
+from src.strategies.strategy_09_minimal import MinimalStrategy
+
+
+def make_result(strategy_id: str) -> ExtractionResult:
+    return ExtractionResult(
+        strategy_name=strategy_id,
+        strategy_id=strategy_id,
+        extracted_data={"total": 3780.0},
+        execution_time=0.1,
+        token_count=15,
+        cost=0.0
+    )
+
+
+def test_lease_and_complete(tmp_path):
+    """Test tasks are leased once each and results are written back."""
+    queue = WorkQueue(tmp_path / "queue.db")
+    document_id = queue.enqueue_document("invoice.txt", "Invoice text", ["strategy_01", "strategy_02"])
+
+    first = queue.lease("worker-a")
+    second = queue.lease("worker-b")
+    assert {first.strategy_id, second.strategy_id} == {"strategy_01", "strategy_02"}
+    assert queue.lease("worker-c") is None
+
+    assert queue.complete(first.task_id, "worker-a", make_result(first.strategy_id))
+    assert queue.complete(second.task_id, "worker-b", make_result(second.strategy_id))
+    assert queue.is_drained()
+    assert [r.strategy_id for r in queue.results(document_id)] == ["strategy_01", "strategy_02"]
+
+
+def test_expired_lease_is_requeued(tmp_path):
+    """Test a task whose worker died is leased again after the visibility timeout."""
+    queue = WorkQueue(tmp_path / "queue.db")
+    queue.enqueue_document("invoice.txt", "Invoice text", ["strategy_01"])
+
+    dead = queue.lease("worker-a", visibility_timeout=0.01)
+    time.sleep(0.02)
+    retried = queue.lease("worker-b")
+
+    assert retried.task_id == dead.task_id
+    assert retried.attempts == 2
+    # The dead worker's late result is discarded
+    assert not queue.complete(dead.task_id, "worker-a", make_result("strategy_01"))
+    assert queue.complete(retried.task_id, "worker-b", make_result("strategy_01"))
+
+
+class FlakyClient(BaseLLMClient):
+    """Client that fails a given number of calls before answering."""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+
+    async def generate(self, prompt, max_tokens=4096, temperature=0.0):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("provider unavailable")
+        return {"text": '{"total": 3780.0}', "input_tokens": 10, "output_tokens": 5, "total_tokens": 15}
+
+    def calculate_cost(self, input_tokens, output_tokens):
+        return 0.0
+
+
+def test_worker_retries_provider_errors(tmp_path):
+    """Test a strategy error releases the task for another attempt instead of completing it."""
+    queue = WorkQueue(tmp_path / "queue.db", max_attempts=3)
+    document_id = queue.enqueue_document("invoice.txt", "Invoice text", ["strategy_01", "strategy_09"])
+    strategies = {
+        "strategy_01": BasicExtractionStrategy(FlakyClient(failures=1)),
+        "strategy_09": MinimalStrategy(FlakyClient(failures=5)),
+    }
+    worker = QueueWorker(queue, strategies, worker_id="worker-a", poll_interval=0.01)
+
+    processed = asyncio.run(worker.run())
+
+    assert processed == 1
+    first, second = queue.results(document_id)
+    assert first.success and first.extracted_data == {"total": 3780.0}
+    assert second.error == "provider unavailable"
+    assert queue.counts()["failed"] == 1
+
+
+def test_worker_process_can_disable_wal(tmp_path, monkeypatch):
+    """Test workers open the queue with rollback journaling when WAL is turned off."""
+    import sqlite3
+    from src.core import worker
+    from src.strategies import strategy_registry
+
+    path = tmp_path / "queue.db"
+    queue = WorkQueue(path, wal=False)
+    queue.enqueue_document("invoice.txt", "Invoice text", ["strategy_01"])
+    queue.close()
+    monkeypatch.setattr(worker, "create_llm_client", lambda *args, **kwargs: FlakyClient(failures=0))
+    monkeypatch.setattr(strategy_registry, "get_all_strategies", lambda client: [BasicExtractionStrategy(client)])
+
+    assert worker.run_worker_process(str(path), wal=False) == 1
+    assert sqlite3.connect(path).execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    assert not (tmp_path / "queue.db-wal").exists()